@@ -1,18 +1,72 @@
-import logging
+import json
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge, ServiceUnavailable
 
-from src.grid_neighbors.neighbor_searches import BreadthFirstSearch
-from src.grid_neighbors.Logger import set_global_log_level
+from src.grid_neighbors.neighbor_searches import (
+    BreadthFirstSearch, DijkstraSearch, DistanceTransformSearch, SparseSearch
+)
+from src.grid_neighbors.Logger import create_logger
 from src.grid_neighbors import Grid, BruteForceSearch
+from src.grid_neighbors import binary_format
+from src.grid_neighbors.batch import VALID_ALGORITHMS, WEIGHTED_ALGORITHMS, run_batch, search
+from src.grid_neighbors.metrics import Metrics, Timings
+from src.grid_neighbors.neighbor_searches import ALGORITHMS, SearchBase
+from src.grid_neighbors.planner import choose_algorithm
+from src.grid_neighbors.result_cache import FileStore, ResultCache, make_key
 
 app = Flask(__name__)
 CORS(app)
 
-# usually log level is defined in environment
-set_global_log_level(logging.DEBUG)
+# level comes from LOG_LEVEL (INFO by default). records are written by a background thread, so logging doesn't block
+# request threads
+logger = create_logger('app')
 
+# request limits. larger requests get a 413, and searches that are over the limit or can't be started get a 503
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 64 * 1024 * 1024))
+MAX_GRID_CELLS = int(os.environ.get('MAX_GRID_CELLS', 16_000_000))
+SEARCH_TIMEOUT = float(os.environ.get('SEARCH_TIMEOUT', 30))
+MAX_PENDING_SEARCHES = int(os.environ.get('MAX_PENDING_SEARCHES', 32))
+
+# process-wide counters and timings, served at /metrics. set METRICS_ENABLED=0 to turn them off
+metrics = Metrics(enabled=os.environ.get('METRICS_ENABLED', '1') == '1')
+metrics.describe('requests', 'counter', 'Requests by endpoint and status code')
+metrics.describe('step_seconds', 'summary', 'Seconds spent in each step of /calculate, by algorithm')
+metrics.describe('cells_visited', 'summary', 'Cells visited by the search engine, by algorithm')
+metrics.describe('queue_peak', 'summary', 'Largest queue/heap size during the search, by algorithm')
+metrics.describe('result_size', 'summary', 'Neighbors in the result, by algorithm')
+
+# serialized responses keyed by the request body. set RESULT_CACHE_DIR to keep results across worker restarts, up to
+# RESULT_CACHE_DIR_MAX_BYTES on disk
+result_cache = ResultCache(
+    max_entries=int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 256)),
+    max_bytes=int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+    store=FileStore(
+        os.environ['RESULT_CACHE_DIR'], int(os.environ.get('RESULT_CACHE_DIR_MAX_BYTES', 1024 * 1024 * 1024))
+    ) if os.environ.get('RESULT_CACHE_DIR') else None,
+)
+
+
+def run_engine(engine_class, grid: Grid, distance_threshold: int):
+    """
+    Search with the engine.
+
+    The result is only the neighborhood, the engine's `stats`, and the seconds spent searching (`timings`), which are
+    cheap to send back from a worker process. The response is created from them by the caller.
+
+    Returns:
+        Neighborhood, stats, timings
+    """
+    timings = Timings()
+    engine = engine_class(grid, distance_threshold, grid.wrap_rows, grid.wrap_cols)
+    with timings.time('search'):
+        neighbors = engine.find_neighbors()
+    return neighbors, engine.stats, timings.seconds
 
 def calculate_neighbors_bfs(grid: Grid, distance_threshold: int):
     """
@@ -25,10 +79,9 @@ def calculate_neighbors_bfs(grid: Grid, distance_threshold: int):
         distance_threshold: Maximum distance (N) based on the grid's distance type
 
     Returns:
-        Dictionary with count and detailed neighbor information
+        Neighborhood, engine stats, and search timings (see `run_engine`)
     """
-    neighbors = BreadthFirstSearch(grid, distance_threshold, grid.wrap_rows, grid.wrap_cols).find_neighbors()
-    return BreadthFirstSearch.create_result(neighbors)
+    return run_engine(BreadthFirstSearch, grid, distance_threshold)
 
 def calculate_neighbors_brute_force(grid: Grid, distance_threshold: int):
     """
@@ -40,10 +93,53 @@ def calculate_neighbors_brute_force(grid: Grid, distance_threshold: int):
         distance_threshold: Maximum distance (N) based on the grid's distance type
 
     Returns:
-        Dictionary with count and detailed neighbor information
+        Neighborhood, engine stats, and search timings (see `run_engine`)
     """
-    neighbors = BruteForceSearch(grid, distance_threshold, grid.wrap_rows, grid.wrap_cols).find_neighbors()
-    return BruteForceSearch.create_result(neighbors)
+    return run_engine(BruteForceSearch, grid, distance_threshold)
+
+def calculate_neighbors_distance_transform(grid: Grid, distance_threshold: int):
+    """
+    VECTORIZED DISTANCE TRANSFORM - O(R×C) time complexity (NumPy array operations)
+    Calculate the distance from every cell to the nearest positive cell for the whole grid at once.
+
+    Args:
+        grid: Grid object with data, wrapping, and distance type configuration
+        distance_threshold: Maximum distance (N) based on the grid's distance type
+
+    Returns:
+        Neighborhood, engine stats, and search timings (see `run_engine`)
+    """
+    return run_engine(DistanceTransformSearch, grid, distance_threshold)
+
+def calculate_neighbors_dijkstra(grid: Grid, distance_threshold: int):
+    """
+    MULTI-SOURCE DIJKSTRA ALGORITHM - O(R×C×log(R×C)) time complexity
+    Use a priority queue starting from all positive cells simultaneously. Moving into a cell costs its value
+    in the grid's cost matrix (1 if not specified).
+
+    Args:
+        grid: Grid object with data, wrapping, distance type, and cost configuration
+        distance_threshold: Maximum total cost (N) to reach a cell
+
+    Returns:
+        Neighborhood, engine stats, and search timings (see `run_engine`)
+    """
+    return run_engine(DijkstraSearch, grid, distance_threshold)
+
+def calculate_neighbors_sparse(grid: Grid, distance_threshold: int):
+    """
+    SPARSE FOOTPRINT ALGORITHM - O(P×N²) time complexity
+    Stamp the footprint of every cell within N steps onto each positive cell and keep the closest distance.
+    Best when there are only a few positive cells in a large grid.
+
+    Args:
+        grid: Grid object with data, wrapping, and distance type configuration
+        distance_threshold: Maximum distance (N) based on the grid's distance type
+
+    Returns:
+        Neighborhood, engine stats, and search timings (see `run_engine`)
+    """
+    return run_engine(SparseSearch, grid, distance_threshold)
 
 def calculate_neighbors(grid, distance_threshold, algorithm='bfs'):
     """
@@ -52,32 +148,241 @@ def calculate_neighbors(grid, distance_threshold, algorithm='bfs'):
     Args:
         grid: Grid object with data, wrapping, and distance type configuration
         distance_threshold: Maximum distance (N) based on the grid's distance type
-        algorithm: 'brute_force', 'bfs', or 'dijkstra'
+        algorithm: 'brute_force', 'bfs', 'distance_transform', 'sparse', 'dijkstra', or any other name in ALGORITHMS
     
     Returns:
-        Dictionary with count and detailed neighbor information
+        Neighborhood, engine stats, and search timings (see `run_engine`)
     """
     if algorithm == 'brute_force':
         return calculate_neighbors_brute_force(grid, distance_threshold)
     elif algorithm == 'bfs':
         return calculate_neighbors_bfs(grid, distance_threshold)
+    elif algorithm == 'distance_transform':
+        return calculate_neighbors_distance_transform(grid, distance_threshold)
+    elif algorithm == 'sparse':
+        return calculate_neighbors_sparse(grid, distance_threshold)
+    elif algorithm == 'dijkstra':
+        return calculate_neighbors_dijkstra(grid, distance_threshold)
+    elif algorithm in ALGORITHMS:
+        return run_engine(ALGORITHMS[algorithm], grid, distance_threshold)
     else:
-        return {"count": 0, "neighbors": [], "positive_cells": []}
+        # callers validate the name first, so this is a bug rather than a bad request
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+_search_executor = None
+_search_executor_lock = threading.Lock()
+_pending_searches = threading.BoundedSemaphore(MAX_PENDING_SEARCHES)
+
+def get_search_executor():
+    """
+    Process pool for searches and batch jobs, created on first use and shared by all requests.
+
+    SEARCH_WORKERS sets the number of processes (default: one per CPU). When it's 0 there's no pool and searches run
+    on the request thread.
+    """
+    global _search_executor
+    workers = int(os.environ.get('SEARCH_WORKERS', os.cpu_count() or 1))
+    if workers <= 0:
+        return None
+    if _search_executor is None:
+        # request threads can get here at the same time, and only one of them should start the processes
+        with _search_executor_lock:
+            if _search_executor is None:
+                _search_executor = ProcessPoolExecutor(workers)
+    return _search_executor
+
+def discard_search_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    Stop using a pool that's broken (a worker was killed, e.g. out of memory), so the next search creates a new one.
+    Nothing happens if the pool was already replaced.
+    """
+    global _search_executor
+    with _search_executor_lock:
+        if _search_executor is not executor:
+            return
+        _search_executor = None
+    logger.warning("Search process pool is broken, a new one will be created")
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def worker_grid(grid: Grid) -> Grid:
+    """
+    The grid to pass to `run_search`. Nested lists are pickled one object per cell, so when there's a process pool a
+    list grid is sent as an array-backed copy, which is pickled as a single buffer.
+    """
+    if grid.array_backed or get_search_executor() is None:
+        return grid
+    copy = Grid.from_array(grid.to_numpy(), None, grid.wrap_rows, grid.wrap_cols, grid.distance_type)
+    if grid.costs is not None:
+        copy.costs = Grid.from_array(grid.costs.to_numpy())
+    return copy
+
+def submit_search(function, *args) -> Future:
+    """
+    Start a CPU-bound search function in the process pool, so request threads stay free to answer other requests
+    (e.g. `/health`) while it runs. Without a pool, it runs on the calling thread and the future is already done.
+
+    The search counts as pending until it's done, even if nobody waits for it anymore. If a worker dies, the pool is
+    discarded and the future fails with `BrokenProcessPool`.
+
+    Raises:
+        ServiceUnavailable: Too many searches are already pending, or the pool is broken
+    """
+    if not _pending_searches.acquire(blocking=False):
+        raise ServiceUnavailable('Too many searches in progress, try again later')
+    executor = get_search_executor()
+    if executor is None:
+        future = Future()
+        try:
+            future.set_result(function(*args))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            _pending_searches.release()
+        return future
+    try:
+        future = executor.submit(function, *args)
+    except BrokenProcessPool:
+        _pending_searches.release()
+        discard_search_executor(executor)
+        raise ServiceUnavailable('Search workers are restarting, try again later')
+    except BaseException:
+        _pending_searches.release()
+        raise
+
+    def search_done(future: Future) -> None:
+        _pending_searches.release()
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            discard_search_executor(executor)
+
+    future.add_done_callback(search_done)
+    return future
+
+def run_search(function, *args):
+    """
+    Run a search with `submit_search` and wait for the result.
+
+    Raises:
+        ServiceUnavailable: Too many searches are already pending, the search took longer than SEARCH_TIMEOUT
+            seconds, or its worker died. A search that times out keeps its worker busy until it's done and still
+            counts as pending.
+    """
+    future = submit_search(function, *args)
+    try:
+        return future.result(timeout=SEARCH_TIMEOUT)
+    except FutureTimeoutError:
+        future.cancel()
+        raise ServiceUnavailable(f'Search took longer than {SEARCH_TIMEOUT:g} seconds')
+    except BrokenProcessPool:
+        raise ServiceUnavailable('Search worker stopped unexpectedly, try again later')
+
+class SearchExecutor(Executor):
+    """Executor for `run_batch` that submits each search with `submit_search`, so batches have the same limits"""
+    def submit(self, fn, /, *args) -> Future:
+        return submit_search(fn, *args)
+
+@app.errorhandler(HTTPException)
+def http_error(e: HTTPException):
+    """JSON errors (e.g. 413 for requests over MAX_CONTENT_LENGTH) like the rest of the API"""
+    return jsonify({'error': e.description}), e.code
+
+def record_search(algorithm: str, timings: Timings, stats: dict, result_size: int):
+    """Add a search's step timings, engine stats, and result size to the metrics"""
+    metrics.observe_timings(timings, algorithm=algorithm)
+    metrics.observe('cells_visited', stats.get('cells_visited'), algorithm=algorithm)
+    metrics.observe('queue_peak', stats.get('queue_peak'), algorithm=algorithm)
+    metrics.observe('result_size', result_size, algorithm=algorithm)
+
+@app.after_request
+def count_request(response):
+    metrics.inc('requests', endpoint=request.endpoint or 'unknown', status=response.status_code)
+    return response
+
+def stream_neighbors(neighbors, summary: dict, rows_per_chunk: int):
+    """
+    Yield the result as newline-delimited JSON.
+
+    Each line before the last has the `neighbors` and `positive_cells` for a band of rows, in row-major order. The
+    last line is the summary (`count`, `grid_size`, etc.). Only one band is serialized at a time, so memory stays
+    flat no matter how many neighbors there are.
+    """
+    for chunk in neighbors.row_chunks(rows_per_chunk):
+        result = SearchBase.create_result(chunk)
+        yield json.dumps({'neighbors': result['neighbors'], 'positive_cells': result['positive_cells']}) + '\n'
+    yield json.dumps({'count': len(neighbors), **summary}) + '\n'
+
+def distance_raster(grid: Grid, distance_threshold: int, algorithm: str):
+    """
+    Distance to the nearest positive cell for every cell, -1 where it's beyond the threshold.
+
+    The distance transform produces the raster directly, other engines fill it in from their neighbors.
+
+    Returns:
+        Raster, engine stats
+    """
+    engine = ALGORITHMS[algorithm](grid, distance_threshold, grid.wrap_rows, grid.wrap_cols)
+    if algorithm == 'distance_transform':
+        return engine.distance_field(), engine.stats
+    return engine.find_neighbors().to_raster(grid.shape), engine.stats
 
 @app.route('/calculate', methods=['POST'])
 def calculate_endpoint():
     try:
-        data = request.get_json()
+        # the body (plus query parameters for binary grids) contains the grid and every parameter, so identical
+        # requests can skip parsing, searching, and serializing entirely
+        response_type = request.accept_mimetypes.best_match(
+            ['application/json', 'application/x-ndjson', binary_format.MIMETYPE]
+        ) or 'application/json'
+        wants_stream = response_type == 'application/x-ndjson'
+        cache_key = make_key(request.get_data(), request.query_string, response_type)
+        cached = result_cache.get(cache_key, response_type)
+        if cached is not None:
+            headers = {'X-Cache': 'HIT'}
+            if response_type == binary_format.MIMETYPE:
+                # binary results are cached with their algorithm in front, since it's only in a header
+                algorithm, cached = cached.split(b'\n', 1)
+                headers['X-Algorithm-Used'] = algorithm.decode()
+            return app.response_class(cached, mimetype=response_type, headers=headers)
+
+        # a handful of timers per request, so they're always on. they're only reported when enabled/requested
+        timings = Timings()
+        grid = None
+        if request.mimetype == binary_format.MIMETYPE:
+            # the grid is the body (and has its own wrap and distance type settings), the rest are query parameters
+            try:
+                with timings.time('parse'):
+                    grid = binary_format.decode_grid(request.get_data())
+            except (RuntimeError, ValueError) as e:
+                return jsonify({'error': str(e)}), 400
+            data = {
+                'grid': grid,
+                'distance': request.args.get('distance', type=int),
+                'algorithm': request.args.get('algorithm', 'auto'),
+                'distance_type': grid.distance_type,
+                'wrap_rows': grid.wrap_rows,
+                'wrap_cols': grid.wrap_cols,
+                'stream': request.args.get('stream', 'false').lower() == 'true',
+                'rows_per_chunk': request.args.get('rows_per_chunk', 64, type=int),
+                'timings': request.args.get('timings', 'false').lower() == 'true',
+            }
+        else:
+            with timings.time('parse'):
+                data = request.get_json()
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
         grid_data = data.get('grid')
         distance = data.get('distance')
-        algorithm = data.get('algorithm', 'brute_force')  # Default to brute force
+        algorithm = data.get('algorithm', 'auto')  # Default to the planner's choice
         distance_type = data.get('distance_type', 'manhattan')  # Default to manhattan
         wrap_rows = data.get('wrap_rows', False)
         wrap_cols = data.get('wrap_cols', False)
+        costs = data.get('costs')  # Optional traversal costs for dijkstra
+        # Optional newline-delimited JSON response, in bands of rows (also enabled by `Accept: application/x-ndjson`)
+        stream = data.get('stream', False) or wants_stream
+        rows_per_chunk = data.get('rows_per_chunk', 64)
+        # Optional `timings` block (seconds per step) in the response, and a `Server-Timing` header
+        show_timings = data.get('timings', False)
         
         if grid_data is None:
             return jsonify({'error': 'Grid data is required'}), 400
@@ -89,39 +394,142 @@ def calculate_endpoint():
             return jsonify({'error': 'Distance must be a non-negative integer'}), 400
         
         # Validate algorithm parameter
-        valid_algorithms = ['brute_force', 'bfs', 'dijkstra']
+        valid_algorithms = VALID_ALGORITHMS
         if algorithm not in valid_algorithms:
             return jsonify({'error': f'Algorithm must be one of: {valid_algorithms}'}), 400
+        if costs is not None and algorithm not in WEIGHTED_ALGORITHMS:
+            return jsonify({'error': f'Costs are only supported by the algorithms: {WEIGHTED_ALGORITHMS}'}), 400
         
         # Validate distance_type parameter
         valid_distance_types = ['manhattan', 'chebyshev']
         if distance_type not in valid_distance_types:
             return jsonify({'error': f'Distance type must be one of: {valid_distance_types}'}), 400
         
-        try:
-            # data is validated inside the Grid init
-            grid = Grid(grid_data, wrap_rows, wrap_cols, distance_type)
-        except RuntimeError as re:
-            return jsonify({'error': str(re)}), 400
+        if grid is None:
+            try:
+                # data is validated inside the Grid init
+                with timings.time('grid'):
+                    grid = Grid(grid_data, wrap_rows, wrap_cols, distance_type, costs)
+            except RuntimeError as re:
+                return jsonify({'error': str(re)}), 400
+        if grid.num_cells > MAX_GRID_CELLS:
+            raise RequestEntityTooLarge(f'Grid must have at most {MAX_GRID_CELLS} cells')
+
+        if algorithm == 'auto':
+            with timings.time('plan'):
+                algorithm = choose_algorithm(grid, distance)
+
+        if stream:
+            if not isinstance(rows_per_chunk, int) or rows_per_chunk < 1:
+                return jsonify({'error': 'Rows per chunk must be a positive integer'}), 400
+            with timings.time('search'):
+                _, neighbors, stats = run_search(search, worker_grid(grid), distance, algorithm)
+            record_search(algorithm, timings, stats, len(neighbors))
+            summary = {
+                'grid_size': f"{grid.num_rows}x{grid.num_cols}",
+                'distance_threshold': distance,
+                'algorithm_used': algorithm,
+                'distance_type': distance_type,
+                'wrap_rows': wrap_rows,
+                'wrap_cols': wrap_cols
+            }
+            # streamed responses aren't cached because they're never held in memory
+            return Response(stream_neighbors(neighbors, summary, rows_per_chunk), mimetype='application/x-ndjson')
 
-        # Calculate the result using the specified algorithm
-        result = calculate_neighbors(grid, distance, algorithm)
+        if response_type == binary_format.MIMETYPE:
+            with timings.time('search'):
+                raster, stats = run_search(distance_raster, worker_grid(grid), distance, algorithm)
+            with timings.time('serialize'):
+                body = binary_format.encode(raster, wrap_rows, wrap_cols, distance_type)
+            record_search(algorithm, timings, stats, int((raster >= 0).sum()))
+            response = app.response_class(
+                body, mimetype=binary_format.MIMETYPE, headers={'X-Algorithm-Used': algorithm}
+            )
+            if show_timings:
+                response.headers['Server-Timing'] = timings.server_timing()
+            else:
+                result_cache.set(cache_key, algorithm.encode() + b'\n' + body, response_type)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+
+        # Calculate the result using the specified algorithm. the search is timed by the worker
+        neighbors, stats, search_timings = run_search(calculate_neighbors, worker_grid(grid), distance, algorithm)
+        timings.update(search_timings)
+        with timings.time('create_result'):
+            result = SearchBase.create_result(neighbors)
         
-        return jsonify({
+        payload = {
             'count': result['count'],
             'neighbors': result['neighbors'],
             'positive_cells': result['positive_cells'],
-            'grid_size': f"{len(grid_data)}x{len(grid_data[0])}",
+            'grid_size': f"{grid.num_rows}x{grid.num_cols}",
             'distance_threshold': distance,
             'algorithm_used': algorithm,
             'distance_type': distance_type,
             'wrap_rows': wrap_rows,
             'wrap_cols': wrap_cols
-        })
+        }
+        if show_timings:
+            # serialization can't time itself, so it's only in the Server-Timing header
+            payload['timings'] = dict(timings.seconds)
+            payload['stats'] = stats
+        with timings.time('serialize'):
+            response = jsonify(payload)
+        record_search(algorithm, timings, stats, result['count'])
+        if show_timings:
+            # responses with timings aren't cached because the timings would be stale
+            response.headers['Server-Timing'] = timings.server_timing()
+        else:
+            result_cache.set(cache_key, response.get_data(), response_type)
+        response.headers['X-Cache'] = 'MISS'
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
+        logger.exception("Unhandled error in %s", request.path)
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+@app.route('/calculate/batch', methods=['POST'])
+def calculate_batch_endpoint():
+    """
+    Run a list of jobs in one request. Each job has the same fields as a `/calculate` request, or `distances`
+    (a list) in place of `distance`. Results come back in the same order, with an error for each job that failed.
+    """
+    try:
+        data = request.get_json()
+        jobs = data.get('jobs') if isinstance(data, dict) else None
+        if not isinstance(jobs, list):
+            return jsonify({'error': 'Jobs must be a list'}), 400
+        # checked before any grid is validated (by `run_batch`), so the rows are only counted
+        for job in jobs:
+            grid_data = job.get('grid') if isinstance(job, dict) else None
+            if not isinstance(grid_data, list):
+                continue
+            if sum(len(row) for row in grid_data if isinstance(row, list)) > MAX_GRID_CELLS:
+                raise RequestEntityTooLarge(f'Grid must have at most {MAX_GRID_CELLS} cells')
+        try:
+            results = run_batch(jobs, SearchExecutor(), SEARCH_TIMEOUT)
+        except FutureTimeoutError:
+            raise ServiceUnavailable(f'Batch took longer than {SEARCH_TIMEOUT:g} seconds')
+        except BrokenProcessPool:
+            raise ServiceUnavailable('Search worker stopped unexpectedly, try again later')
+        return jsonify({'results': results})
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Unhandled error in %s", request.path)
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
+@app.route('/cache', methods=['GET'])
+def cache_stats():
+    return jsonify(result_cache.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Counters and timings in the Prometheus text format"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4')
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy', 'message': 'Grid neighbors API is running'})
@@ -130,4 +538,5 @@ if __name__ == '__main__':
     print("Starting Grid Cell Neighborhoods API...")
     print("Open http://localhost:8000/health to check if the server is running")
     print("Frontend should be accessible by opening index.html in a web browser")
-    app.run(debug=True, host='0.0.0.0', port=8000)
\ No newline at end of file
+    print("For production, run `rye run serve` (gunicorn) instead")
+    app.run(debug=os.environ.get('FLASK_DEBUG', '1') == '1', host='0.0.0.0', port=int(os.environ.get('PORT', 8000)))
\ No newline at end of file
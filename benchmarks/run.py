@@ -0,0 +1,299 @@
+"""
+Benchmark the search engines across grid sizes, positive cell densities, distances, distance types, and wrap modes.
+
+Every engine is timed on the same generated grids (best of `--repeat` runs) and its peak memory and the number of
+GridCell objects it creates per visited cell are measured in a separate run. Neighbor counts are checked against each
+other so a fast but wrong engine can't hide.
+Import time (cold start) of `--import-modules` is measured with `python -X importtime` in a fresh interpreter.
+Results are written as JSON so they can be compared between commits. Run from the project root:
+
+> python benchmarks/run.py --sizes 100,500 --output before.json
+> python benchmarks/run.py --sizes 100,500 --output after.json
+> python benchmarks/run.py compare before.json after.json
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from grid_neighbors import Grid, GridCell
+from grid_neighbors.neighbor_searches import (
+    BitmaskSearch, BreadthFirstSearch, BruteForceSearch, DijkstraSearch, DistanceTransformSearch, IncrementalSearch,
+    NativeSearch, SearchBase, SparseSearch
+)
+from grid_neighbors.tiled_search import TiledSearch
+
+ENGINES: dict[str, type[SearchBase]] = {
+    "brute_force": BruteForceSearch,
+    "bfs": BreadthFirstSearch,
+    "dijkstra": DijkstraSearch,
+    "distance_transform": DistanceTransformSearch,
+    "sparse": SparseSearch,
+    "incremental": IncrementalSearch,
+    "bitmask": BitmaskSearch,
+    # the same as bfs without Numba
+    "native": NativeSearch,
+    "tiled": TiledSearch,
+}
+# engines that need NumPy to run
+NUMPY_ENGINES = {"distance_transform", "tiled"}
+WRAPS = {
+    "none": (False, False),
+    "rows": (True, False),
+    "cols": (False, True),
+    "both": (True, True),
+}
+
+
+def generate_grid(size: int, density: float, storage: str, seed: int) -> Grid:
+    """Square grid where each cell is positive with the given probability"""
+    rng = random.Random(seed)
+    data = [[1 if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+    if storage == "array":
+        import numpy as np
+        return Grid.from_array(np.asarray(data, dtype=np.int8))
+    return Grid(data)
+
+
+def measure(run: Callable[[], tuple[int, dict]], repeat: int) -> dict:
+    """
+    Best time of the repeated runs, then peak traced memory and GridCell objects created in one more run.
+
+    The run returns the neighbor count and the engine's stats.
+    """
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count, _ = run()
+        best = min(best, time.perf_counter() - start)
+
+    cells_created = 0
+    original_init = GridCell.__init__
+
+    def counting_init(cell, *args, **kwargs):
+        nonlocal cells_created
+        cells_created += 1
+        original_init(cell, *args, **kwargs)
+
+    GridCell.__init__ = counting_init
+    tracemalloc.start()
+    try:
+        _, stats = run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        GridCell.__init__ = original_init
+    cells_visited = stats.get("cells_visited")
+    return {
+        "seconds": best,
+        "peak_bytes": peak,
+        "count": count,
+        "cells_visited": cells_visited,
+        "cells_created": cells_created,
+        "cells_created_per_visit": cells_created / cells_visited if cells_visited else None,
+    }
+
+
+def measure_import(module: str, repeat: int) -> Optional[dict]:
+    """
+    Best cumulative import time of the module (and everything it imports) in a fresh interpreter.
+
+    Returns None if the module can't be imported, e.g. `app` without Flask installed.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([os.path.join(ROOT, "src"), ROOT])}
+    best = None
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, env=env,
+            cwd=ROOT,
+        )
+        if process.returncode:
+            print(f"Failed to import {module}: {process.stderr.strip().splitlines()[-1]}", file=sys.stderr)
+            return None
+        # lines look like "import time: self [us] | cumulative [us] | module"
+        for line in process.stderr.splitlines():
+            _, _, timing = line.partition("import time:")
+            fields = [field.strip() for field in timing.split("|")]
+            if len(fields) == 3 and fields[2] == module:
+                seconds = int(fields[1]) / 1e6
+                best = seconds if best is None else min(best, seconds)
+    return {"module": module, "seconds": best}
+
+
+def run_import_benchmarks(args: argparse.Namespace) -> list[dict]:
+    results = []
+    for module in filter(None, args.import_modules.split(",")):
+        result = measure_import(module, args.repeat)
+        if result is not None:
+            results.append(result)
+            print(f"{'import':>18} {module:<40} {result['seconds']:>9.4f}s")
+    return results
+
+
+def run_benchmarks(args: argparse.Namespace) -> list[dict]:
+    engines = args.engines.split(",")
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        skipped = [name for name in engines if name in NUMPY_ENGINES]
+        if skipped:
+            print(f"NumPy isn't installed, skipping: {skipped}", file=sys.stderr)
+        engines = [name for name in engines if name not in NUMPY_ENGINES]
+
+    results = []
+    configs = itertools.product(
+        [int(s) for s in args.sizes.split(",")],
+        [float(d) for d in args.densities.split(",")],
+        [int(n) for n in args.distances.split(",")],
+        args.distance_types.split(","),
+        args.wraps.split(","),
+    )
+    for seed, (size, density, max_distance, distance_type, wrap) in enumerate(configs):
+        grid = generate_grid(size, density, args.storage, seed)
+        grid.distance_type = distance_type
+        wrap_rows, wrap_cols = WRAPS[wrap]
+        num_positive = len(grid.positive_cells)
+        counts = {}
+        for name in engines:
+            if name == "brute_force" and grid.num_cells * num_positive > args.brute_force_limit:
+                continue
+            engine = ENGINES[name]
+
+            def run() -> tuple[int, dict]:
+                search = engine(grid, max_distance, wrap_rows, wrap_cols)
+                return len(search.find_neighbors()), search.stats
+
+            result = {
+                "engine": name,
+                "size": size,
+                "density": density,
+                "positive_cells": num_positive,
+                "max_distance": max_distance,
+                "distance_type": distance_type,
+                "wrap": wrap,
+                "storage": args.storage,
+                **measure(run, args.repeat),
+            }
+            counts[name] = result["count"]
+            results.append(result)
+            per_visit = "n/a" if result["cells_created_per_visit"] is None else \
+                f"{result['cells_created_per_visit']:.2f}"
+            print(
+                f"{name:>18} {size:>5}x{size:<5} density={density:<6} N={max_distance:<3} {distance_type:<9} "
+                f"wrap={wrap:<4} {result['seconds']:>9.4f}s {result['peak_bytes'] / 2**20:>8.2f}MiB "
+                f"count={result['count']} cells/visit={per_visit}"
+            )
+        if len(set(counts.values())) > 1:
+            raise AssertionError(f"Engines disagree on neighbor count: {counts}")
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(result: dict) -> tuple:
+    return tuple(result[k] for k in (
+        "engine", "size", "density", "max_distance", "distance_type", "wrap", "storage"
+    ))
+
+
+def compare(old_path: str, new_path: str, threshold: float) -> int:
+    """Print the time ratio (new / old) of matching results and return the number of regressions"""
+    with open(old_path) as f:
+        old_results = json.load(f)
+    with open(new_path) as f:
+        new_results = json.load(f)
+    old = {result_key(r): r for r in old_results["results"]}
+    new = {result_key(r): r for r in new_results["results"]}
+    regressions = 0
+    old_imports = {r["module"]: r for r in old_results.get("imports", [])}
+    new_imports = {r["module"]: r for r in new_results.get("imports", [])}
+    for module in sorted(old_imports.keys() & new_imports.keys()):
+        ratio = new_imports[module]["seconds"] / old_imports[module]["seconds"]
+        flag = ""
+        if ratio > threshold:
+            regressions += 1
+            flag = "  <-- REGRESSION"
+        print(f"{'import ' + module:<70} time x{ratio:>6.2f}{flag}")
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key]["seconds"] / old[key]["seconds"] if old[key]["seconds"] else float("inf")
+        memory_ratio = new[key]["peak_bytes"] / old[key]["peak_bytes"] if old[key]["peak_bytes"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            regressions += 1
+            flag = "  <-- REGRESSION"
+        print(f"{' '.join(str(k) for k in key):<70} time x{ratio:>6.2f}  memory x{memory_ratio:>6.2f}{flag}")
+    return regressions
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="50,100,200", help="comma-separated grid sizes (square)")
+    parser.add_argument("--densities", default="0.001,0.01,0.1", help="comma-separated positive cell densities")
+    parser.add_argument("--distances", default="3,10", help="comma-separated max distances")
+    parser.add_argument("--distance-types", default=",".join(Grid.DISTANCE_TYPES), help="comma-separated")
+    parser.add_argument("--wraps", default="none,both", help=f"comma-separated wrap modes: {list(WRAPS)}")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="comma-separated engine names")
+    parser.add_argument("--storage", choices=["list", "array"], default="list", help="grid storage")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per engine (best is kept)")
+    parser.add_argument(
+        "--brute-force-limit", type=int, default=2_000_000,
+        help="skip brute force when cells x positive cells exceeds this"
+    )
+    parser.add_argument(
+        "--import-modules", default="grid_neighbors,app",
+        help="comma-separated modules to time importing (empty to skip)"
+    )
+    parser.add_argument("--output", help="write results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "compare":
+        parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+        parser.add_argument("old")
+        parser.add_argument("new")
+        parser.add_argument("--threshold", type=float, default=1.2, help="time ratio that counts as a regression")
+        compare_args = parser.parse_args(argv[1:])
+        return 1 if compare(compare_args.old, compare_args.new, compare_args.threshold) else 0
+
+    args = parse_args(argv)
+    results = run_benchmarks(args)
+    imports = run_import_benchmarks(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "commit": git_commit(),
+                    "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "args": vars(args),
+                },
+                "results": results,
+                "imports": imports,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
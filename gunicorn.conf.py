@@ -0,0 +1,17 @@
+"""
+Production server settings: `rye run serve` (or `gunicorn -c gunicorn.conf.py app:app`).
+
+Searches run in the app's process pool (SEARCH_WORKERS, see app.py), so the request threads only wait on them and
+stay free to answer `/health` and cached results. Every gunicorn worker has its own pool and result cache, so one
+worker with threads is usually enough. Set RESULT_CACHE_DIR to share cached results between workers.
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+# longer than SEARCH_TIMEOUT so slow searches get a 503 instead of gunicorn killing the worker
+timeout = int(float(os.environ.get('SEARCH_TIMEOUT', 30))) + 30
+graceful_timeout = 30
+accesslog = "-"
@@ -241,6 +241,8 @@ function displayNeighbors(neighbors) {
 function getAlgorithmName(algorithm) {
     const names = {
         'bfs': 'BFS (Breadth-First Search)',
+        'distance_transform': 'Distance Transform',
+        'sparse': 'Sparse Footprint',
         'dijkstra': 'Dijkstra',
         'brute_force': 'Brute Force'
     };
@@ -0,0 +1,158 @@
+import pickle
+from array import array
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Optional, Type
+
+from .Grid import Grid
+from .Neighborhood import Neighborhood
+from ._optional import import_numpy
+from .planner import has_numpy
+
+if TYPE_CHECKING:
+    from .neighbor_searches import SearchBase
+
+
+class DistanceField:
+    """
+    Distance from every cell to its closest positive cell, searched once and queried for any threshold.
+
+    Cells in range are kept sorted by distance along with the cumulative number of cells at each distance, so
+    `count_within` is O(1) and `cells_within` is O(cells returned) no matter how many thresholds are queried (e.g. a
+    coverage curve from 0 to 50). Weighted (Dijkstra) distances can be fractional, or much larger than the number of
+    cells, so their counts are a binary search over the sorted distances instead. The field only holds flat typed arrays, so it's cheap to pickle and cache.
+    """
+    UNREACHABLE = -1
+
+    def __init__(self, grid: Grid, max_distance: Optional[int] = None, engine: Optional[Type["SearchBase"]] = None):
+        """
+        Args:
+            grid: Grid to search
+            max_distance: Largest threshold that can be queried. By default, every reachable cell is included and
+                any threshold can be queried.
+            engine: Search engine that calculates the distances. By default, the distance transform when NumPy is
+                installed, otherwise BFS, or Dijkstra if the grid has traversal costs.
+        """
+        # the engines are only loaded once a field is searched, not when the package is imported
+        from .neighbor_searches import BreadthFirstSearch, DijkstraSearch, DistanceTransformSearch
+
+        if engine is None:
+            if grid.costs is not None:
+                engine = DijkstraSearch
+            else:
+                engine = DistanceTransformSearch if has_numpy() else BreadthFirstSearch
+        # larger thresholds can't add any cells to a field that has every reachable cell
+        self._complete = max_distance is None
+        if max_distance is None:
+            # no unweighted path is longer than this
+            max_distance = grid.num_rows + grid.num_cols if grid.costs is None else float("inf")
+        self.shape = grid.shape
+        self.max_distance = max_distance
+
+        search = engine(grid, max_distance, grid.wrap_rows, grid.wrap_cols)
+        if isinstance(search, DistanceTransformSearch):
+            self._from_raster(search.distance_field())
+        else:
+            self._from_neighbors(search.find_neighbors())
+
+    @property
+    def num_cells(self) -> int:
+        """Number of cells within the max distance"""
+        return len(self._order)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(arr.itemsize * len(arr) for arr in (self.distances, self._order, self._cumulative))
+
+    def distance(self, row: int, col: int):
+        """Distance from the cell to its closest positive cell, or UNREACHABLE if it's beyond the max distance"""
+        return self.distances[row * self.shape[1] + col]
+
+    def count_within(self, max_distance) -> int:
+        """Number of cells no further than the max distance"""
+        if max_distance > self.max_distance:
+            if not self._complete:
+                raise ValueError(f"Distance must be at most {self.max_distance}. Received {max_distance}")
+            max_distance = self.max_distance
+        if max_distance < 0:
+            return 0
+        if self._sorted:
+            return bisect_right(self._cumulative, max_distance)
+        return self._cumulative[int(min(max_distance, len(self._cumulative) - 1))] if self._cumulative else 0
+
+    def cells_within(self, max_distance) -> Neighborhood:
+        """Cells no further than the max distance, in order of distance"""
+        num_cols = self.shape[1]
+        neighborhood = Neighborhood(self.distances.typecode)
+        for index in self._order[:self.count_within(max_distance)]:
+            neighborhood.add(index // num_cols, index % num_cols, self.distances[index])
+        return neighborhood
+
+    def histogram(self) -> list[int]:
+        """Number of cells at each distance from 0 to the furthest cell"""
+        coverage = self.coverage()
+        return [count - prev for prev, count in zip([0, *coverage], coverage)]
+
+    def coverage(self) -> list[int]:
+        """Number of cells within each distance from 0 to the furthest cell (cumulative histogram)"""
+        if self.distances.typecode == "d":
+            raise ValueError("Histograms require integer distances")
+        if self._sorted:
+            furthest = self._cumulative[-1] if self._cumulative else -1
+            return [bisect_right(self._cumulative, dist) for dist in range(furthest + 1)]
+        return list(self._cumulative)
+
+    def to_bytes(self) -> bytes:
+        """Serialize, e.g. for a `ResultCache`"""
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DistanceField":
+        field = pickle.loads(data)
+        if not isinstance(field, cls):
+            raise TypeError(f"Expected a serialized {cls.__name__}. Received {type(field)}")
+        return field
+
+    def _from_raster(self, raster) -> None:
+        """Vectorized: sort the cells in range by distance and count the cells at each distance"""
+        np = import_numpy()
+        flat = raster.ravel()
+        in_range = np.flatnonzero(flat >= 0)
+        order = in_range[np.argsort(flat[in_range], kind="stable")]
+        cumulative = np.cumsum(np.bincount(flat[in_range])) if len(in_range) else np.empty(0)
+        self.distances = array("i", flat.astype(np.intc).tobytes())
+        self._order = array("i", order.astype(np.intc).tobytes())
+        self._cumulative = array("q", cumulative.astype(np.int64).tobytes())
+        self._sorted = False
+
+    def _from_neighbors(self, neighbors: Neighborhood) -> None:
+        num_cols = self.shape[1]
+        typecode = neighbors.distances.typecode
+        self.distances = array(typecode, [self.UNREACHABLE]) * (self.shape[0] * num_cols)
+        for row, col, dist in neighbors.items():
+            self.distances[row * num_cols + col] = dist
+
+        furthest = max(neighbors.distances) if len(neighbors) else 0
+        # unweighted distances are at most rows + cols, but a single large cost can make them arbitrarily large
+        self._sorted = typecode == "d" or furthest > len(neighbors) + self.shape[0] + num_cols
+        if self._sorted:
+            # fractional distances can't be bucketed and sparse ones would need a bucket per distance, so keep them
+            # sorted for a binary search
+            self._order = array("i", sorted(range(len(neighbors)), key=neighbors.distances.__getitem__))
+            self._cumulative = array(typecode, (neighbors.distances[i] for i in self._order))
+            self._order = array("i", (neighbors.rows[i] * num_cols + neighbors.cols[i] for i in self._order))
+            return
+
+        # counting sort by distance
+        counts = array("q", [0]) * ((furthest + 1) if len(neighbors) else 0)
+        for dist in neighbors.distances:
+            counts[dist] += 1
+        starts = array("q", [0]) * len(counts)
+        for dist in range(1, len(counts)):
+            starts[dist] = starts[dist - 1] + counts[dist - 1]
+        self._order = array("i", [0]) * len(neighbors)
+        for row, col, dist in neighbors.items():
+            self._order[starts[dist]] = row * num_cols + col
+            starts[dist] += 1
+        self._cumulative = counts
+        for dist in range(1, len(counts)):
+            self._cumulative[dist] += self._cumulative[dist - 1]
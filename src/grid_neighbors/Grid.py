@@ -1,7 +1,11 @@
+import hashlib
+import json
 from numbers import Number
-from typing import Tuple, Iterator, Sequence, TypeAlias, Optional
+from typing import Any, Tuple, Iterator, Sequence, TypeAlias, Optional
 
 from .GridCell import GridCell
+from ._optional import import_numpy
+from .neighbor_table import NeighborTable, get_neighbor_table
 
 Matrix: TypeAlias = Sequence[Sequence[Number]]
 
@@ -12,6 +16,13 @@ class Grid:
 
     The matrix is indexed as a table of rows and columns. Each dimension has the option of wrapping indices from
     back to front. Numbers are encapsulated in GridCell objects when accessed that contain the value, row, and column.
+
+    An optional matrix of traversal costs with the same shape can be attached for weighted searches. Moving into a
+    cell costs its value in the cost matrix, which must be positive. Without one, every move costs 1.
+
+    The matrix can be nested sequences (e.g. a list of lists) or an array-backed object (NumPy array or anything
+    that supports the buffer protocol, see `from_array`). Array-backed matrices are viewed without copying and
+    require NumPy.
     """
     # unit vectors for cardinal directions given row, col indices.
     NW_DIR = 1, -1
@@ -22,6 +33,9 @@ class Grid:
     S_DIR = 1, 0
     SW_DIR = -1, -1
     W_DIR = 0, -1
+    # steps to the immediate neighbors for each distance type
+    MANHATTAN_DIRECTIONS = (N_DIR, S_DIR, W_DIR, E_DIR)
+    CHEBYSHEV_DIRECTIONS = MANHATTAN_DIRECTIONS + (NW_DIR, NE_DIR, SW_DIR, SE_DIR)
 
     DISTANCE_TYPES = {
         "manhattan": "manhattan_distance",
@@ -33,16 +47,75 @@ class Grid:
         data: Matrix,
         wrap_rows: bool = False,
         wrap_cols: bool = False,
-        distance_type: Optional[str]=None
+        distance_type: Optional[str]=None,
+        costs: "Matrix | Grid | None" = None
     ):
-        # expect caller to provide consistent grid. methods assume this validation exists
-        self._validate_grid(data)
+        self._is_array = self._is_array_like(data)
+        if self._is_array:
+            data = import_numpy().asarray(data)
+            self._validate_array(data)
+        else:
+            # expect caller to provide consistent grid. methods assume this validation exists
+            self._validate_grid(data)
         # store reference instead of copying to save time and memory. this means that methods
-        # can't assume the grid remains unchanged between calls.
+        # can't assume the values remain unchanged between calls. the shape must not change though.
         self._data = data
+        self._shape = (len(data), len(data[0]))
         self.wrap_rows = wrap_rows
         self.wrap_cols = wrap_cols
         self.distance_type = distance_type or "manhattan"
+        self.costs = costs
+
+    @classmethod
+    def from_array(
+        cls,
+        data: Any,
+        shape: Optional[Tuple[int, int]] = None,
+        wrap_rows: bool = False,
+        wrap_cols: bool = False,
+        distance_type: Optional[str] = None
+    ) -> "Grid":
+        """
+        Create a grid that views an array-backed matrix without copying it.
+
+        Args:
+            data: NumPy array or any object supporting the buffer protocol (`array.array`, `memoryview`, etc.)
+            shape: Rows and columns of the matrix. Required when the data is one-dimensional (flat, row-major)
+            wrap_rows: Wrap row indices from back to front
+            wrap_cols: Wrap column indices from back to front
+            distance_type: One of `DISTANCE_TYPES`
+        """
+        np = import_numpy()
+        array = np.asarray(data)
+        if shape is not None:
+            # reshaping a contiguous array is a view, otherwise numpy has to copy
+            array = array.reshape(shape)
+        return cls(array, wrap_rows, wrap_cols, distance_type)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        wrap_rows: Optional[bool] = None,
+        wrap_cols: Optional[bool] = None,
+        distance_type: Optional[str] = None,
+    ) -> "Grid":
+        """
+        Create a grid backed by a memory-mapped file, so values are only read from disk as they're used.
+
+        The file is either in the binary format (see `binary_format`) or NumPy's `.npy` format. Settings that
+        aren't specified come from the binary format's header, or are the defaults for `.npy` files. Requires NumPy.
+        """
+        # avoid a circular import: binary_format builds grids
+        from . import binary_format
+
+        matrix, settings = binary_format.open_file(path)
+        return cls(
+            matrix,
+            settings["wrap_rows"] if wrap_rows is None else wrap_rows,
+            settings["wrap_cols"] if wrap_cols is None else wrap_cols,
+            distance_type or settings["distance_type"],
+        )
 
     def __str__(self):
         r_str = f"R" if self.wrap_rows else f"_"
@@ -58,7 +131,7 @@ class Grid:
         if not isinstance(row_col, Sequence) or len(row_col) != 2:
             raise TypeError(f"Row/Column must be a sequence (len 2). Received {type(row_col)}, {row_col}")
         row, col = self._validate_indices(*row_col)
-        return GridCell(row, col, self._data[row][col])
+        return GridCell(row, col, self._get_value(row, col))
 
     def __iter__(self) -> Iterator[GridCell]:
         """
@@ -66,15 +139,20 @@ class Grid:
 
         Grid is traversed in row-major order.
         """
+        if self._is_array:
+            # convert a single row at a time to Python numbers to limit memory
+            for row_idx in range(self.num_rows):
+                for col_idx, value in enumerate(self._data[row_idx].tolist()):
+                    yield GridCell(row_idx, col_idx, value)
+            return
         for row_idx, row in enumerate(self._data):
             for col_idx, value in enumerate(row):
                 yield self[row_idx, col_idx]
 
     @property
     def shape(self) -> Tuple[int, int]:
-        # because data isn't owned by this class and can change externally,
-        # calculate dimensions on each call (trade performance for robustness).
-        return len(self._data), len(self._data[0])
+        # dimensions are cached at init because they're needed for every index validation
+        return self._shape
 
     @property
     def num_rows(self) -> int:
@@ -88,28 +166,164 @@ class Grid:
     def num_cells(self) -> int:
         return self.num_rows * self.num_cols
 
+    @property
+    def diameter(self) -> int:
+        """Most steps between any two cells for the distance type and wrap settings"""
+        # wrapped cells are never more than half the dimension away
+        row_reach = self.num_rows // 2 if self.wrap_rows else self.num_rows - 1
+        col_reach = self.num_cols // 2 if self.wrap_cols else self.num_cols - 1
+        if self.distance_type == "chebyshev":
+            return max(row_reach, col_reach)
+        return row_reach + col_reach
+
+    @property
+    def costs(self) -> "Grid | None":
+        """Traversal costs as a grid of the same shape, or None if all moves cost 1"""
+        return self._costs
+
+    @costs.setter
+    def costs(self, costs: "Matrix | Grid | None") -> None:
+        if costs is None:
+            self._costs = None
+            self._fractional_costs = False
+            return
+        cost_grid = costs if isinstance(costs, Grid) else Grid(costs)
+        if cost_grid.shape != self.shape:
+            raise RuntimeError(f"Invalid cost shape. Expected {self.shape}, received {cost_grid.shape}")
+        # a free move would put a cell at distance 0, which is reserved for the positive cells
+        if cost_grid._is_array:
+            values = cost_grid.to_numpy()
+            non_positive = bool((values <= 0).any())
+            fractional = values.dtype.kind == "f"
+        else:
+            values = cost_grid.flat_values()
+            non_positive = any(value <= 0 for value in values)
+            fractional = any(isinstance(value, float) for value in values)
+        if non_positive:
+            raise RuntimeError("Invalid cost found. Costs must be positive")
+        self._costs = cost_grid
+        self._fractional_costs = fractional
+
+    @property
+    def fractional_costs(self) -> bool:
+        """True if the costs are floats, so weighted distances can be fractional"""
+        return self._fractional_costs
+
+    def digest(self) -> str:
+        """
+        Hash of the grid's shape, settings, values, and costs.
+
+        Array-backed values are hashed directly from their buffer. Nested sequences are hashed by their JSON encoding.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.shape}{self.wrap_rows}{self.wrap_cols}{self.distance_type}".encode())
+        if self._is_array:
+            values = self._data if self._data.flags.c_contiguous else self._data.copy()
+            digest.update(values.dtype.str.encode())
+            digest.update(memoryview(values).cast("B"))
+        else:
+            digest.update(json.dumps(self._data, separators=(",", ":")).encode())
+        if self._costs is not None:
+            digest.update(self._costs.digest().encode())
+        return digest.hexdigest()
+
+    def get_value(self, row: int, col: int):
+        """Value at the row/col without creating a GridCell. Indices are wrapped when enabled."""
+        return self._get_value(*self._validate_indices(row, col))
+
+    def get_cost(self, row: int, col: int):
+        """Cost of moving into the cell at the row/col"""
+        return 1 if self._costs is None else self._costs.get_value(row, col)
+
     @property
     def positive_cells(self) -> list[GridCell]:
+        if self._is_array:
+            np = import_numpy()
+            rows, cols = np.nonzero(self._data > 0)
+            values = self._data[rows, cols]
+            return [
+                GridCell(row, col, value)
+                for row, col, value in zip(rows.tolist(), cols.tolist(), values.tolist())
+            ]
         return [cell for cell in self if cell.value > 0]
 
+    @property
+    def positive_indices(self) -> list[int]:
+        """Flat (row-major) indices of the positive cells, without creating a GridCell for each one"""
+        if self._is_array:
+            return import_numpy().flatnonzero(self._data > 0).tolist()
+        num_cols = self.num_cols
+        return [
+            row_idx * num_cols + col_idx
+            for row_idx, row in enumerate(self._data)
+            for col_idx, value in enumerate(row)
+            if value > 0
+        ]
+
+    @property
+    def directions(self) -> Tuple[Tuple[int, int], ...]:
+        """Row/col steps from a cell to its immediate neighbors for the distance type"""
+        return self.MANHATTAN_DIRECTIONS if self.distance_type == "manhattan" else self.CHEBYSHEV_DIRECTIONS
+
+    @property
+    def neighbor_table(self) -> NeighborTable:
+        """
+        Flat-index adjacency for the grid's shape, wrap settings, and distance type.
+
+        Tables are cached by that combination, so this is cheap to call but should still be kept in a local variable
+        in hot loops. Changing a setting (e.g. `wrap_rows`) gives a different table.
+        """
+        num_rows, num_cols = self._shape
+        return get_neighbor_table(num_rows, num_cols, self.wrap_rows, self.wrap_cols, self.directions)
+
+    def flat_values(self) -> list:
+        """All values as Python numbers in row-major order, e.g. for indexing by flat index"""
+        if self._is_array:
+            return self._data.ravel().tolist()
+        return [value for row in self._data for value in row]
+
+    @property
+    def array_backed(self) -> bool:
+        """True if the values are an array (see `from_array`) instead of nested sequences"""
+        return self._is_array
+
+    @property
+    def num_positive(self) -> int:
+        """Number of positive cells, without creating a GridCell for each one"""
+        if self._is_array:
+            return int(import_numpy().count_nonzero(self._data > 0))
+        return sum(1 for row in self._data for value in row if value > 0)
+
+    @property
+    def has_positive(self) -> bool:
+        """True if there's at least one positive cell. Nested sequences are only scanned up to the first one."""
+        if self._is_array:
+            return bool((self._data > 0).any())
+        return any(value > 0 for row in self._data for value in row)
+
+    def to_numpy(self):
+        """
+        Return the grid values as a two-dimensional NumPy array.
+
+        Array-backed grids return the underlying array (no copy). Otherwise, the source matrix is copied
+        because it's stored as nested sequences. Requires NumPy.
+        """
+        if self._is_array:
+            return self._data
+        np = import_numpy()
+        return np.asarray(self._data)
+
     def get_immediate_neighbors(
         self,
         center_cell: GridCell,
     ) -> Sequence["GridCell"]:
+        """Cells next to the center cell for the distance type. Cells beyond an edge that doesn't wrap are skipped."""
+        row, col = self._validate_indices(center_cell.row, center_cell.col)
+        num_cols = self.num_cols
         neighbors = []
-        directions = [
-            self.N_DIR, self.S_DIR, self.W_DIR, self.E_DIR
-        ] if self.distance_type == "manhattan" else [
-            self.N_DIR, self.S_DIR, self.W_DIR, self.E_DIR,
-            self.NW_DIR, self.NE_DIR, self.SW_DIR, self.SE_DIR
-        ]
-        for direction in directions:
-            try:
-                # [] method is smart enough to wrap indexes when needed
-                neighbors.append(self[(center_cell + direction).coords])
-            except IndexError:
-                # neighbor is out of bounds and therefore doesn't exist
-                continue
+        for index in self.neighbor_table.neighbors(row * num_cols + col):
+            neighbor_row, neighbor_col = divmod(index, num_cols)
+            neighbors.append(GridCell(neighbor_row, neighbor_col, self._get_value(neighbor_row, neighbor_col)))
         return neighbors
 
     def _validate_grid(self, grid: Matrix) -> None:
@@ -135,14 +349,51 @@ class Grid:
                 if not isinstance(cell, Number):
                     raise RuntimeError(f"Invalid cell found: {cell}")
 
+    def _get_value(self, row: int, col: int):
+        """Value at already validated indices"""
+        if self._is_array:
+            # `item` returns a Python number instead of a numpy scalar
+            return self._data.item(row, col)
+        return self._data[row][col]
+
+    def _validate_array(self, array: Any) -> None:
+        """
+        Validate an array-backed grid.
+
+        Same requirements as `_validate_grid`, but the cell types are checked once for the whole array by its dtype.
+        """
+        if array.ndim != 2:
+            raise RuntimeError(f"Invalid grid shape. Array must be 2-D. Shape: {array.shape}")
+        if array.shape[0] == 0:
+            raise RuntimeError(f"Grid not specified or empty: {array}")
+        if array.shape[1] == 0:
+            raise RuntimeError(f"Empty row(s). Shape: {array.shape}")
+        # bool, signed int, unsigned int, float
+        if array.dtype.kind not in "biuf":
+            raise RuntimeError(f"Invalid cell type found: {array.dtype}")
+
+    @staticmethod
+    def _is_array_like(data: Any) -> bool:
+        """Nested sequences are the default. Anything else that exports a buffer is treated as an array."""
+        if data is None or isinstance(data, (list, tuple)):
+            return False
+        if hasattr(data, "__array__"):
+            return True
+        try:
+            memoryview(data).release()
+        except TypeError:
+            return False
+        return True
+
     def _validate_indices(self, row: int, col: int) -> tuple[int, int]:
         """
         Validate and modify (if necessary) the specified row/col to access
         the source data matrix.
         """
-        row_index = row % self.num_rows if self.wrap_rows else row
-        col_index = col % self.num_cols if self.wrap_cols else col
-        if row_index < 0 or row_index >= self.num_rows or col_index < 0 or col_index >= self.num_cols:
+        num_rows, num_cols = self._shape
+        row_index = row % num_rows if self.wrap_rows else row
+        col_index = col % num_cols if self.wrap_cols else col
+        if row_index < 0 or row_index >= num_rows or col_index < 0 or col_index >= num_cols:
             raise IndexError(f"Invalid row/col: ({row},{col}) for {str(self)}")
         return row_index, col_index
 
@@ -10,6 +10,9 @@ class GridCell:
     
     Provides intuitive math operators for common operations
     """
+    # no per-instance dict, so cells are smaller and faster to create
+    __slots__ = ("row", "col", "value")
+
     def __init__(self, row: int, col: int, value: Any):
 
         """
@@ -86,12 +89,12 @@ class GridCell:
 
         https://en.wikipedia.org/wiki/Taxicab_geometry
         """
-        dist = self.__get_abs_delta(other, wrap_row_at, wrap_col_at)
-        return dist.row + dist.col
+        row_dist, col_dist = self.__get_abs_delta(other, wrap_row_at, wrap_col_at)
+        return row_dist + col_dist
 
     def chebyshev_distance(self, other: 'GridCell', wrap_row_at=None, wrap_col_at=None) -> int:
-        dist = self.__get_abs_delta(other, wrap_row_at, wrap_col_at)
-        return max(dist.row, dist.col)
+        row_dist, col_dist = self.__get_abs_delta(other, wrap_row_at, wrap_col_at)
+        return max(row_dist, col_dist)
 
     def copy(self, value=None):
         # TODO: make sure to deep copy `value` in case its an object
@@ -110,10 +113,12 @@ class GridCell:
     def __get_value(self, other: "GridCell | Number") -> Number:
         return other.value if isinstance(other, GridCell) else other
 
-    def __get_abs_delta(self, other: "GridCell", wrap_row_at=None, wrap_col_at=None) -> "GridCell":
-        dist = abs(self - other)
+    def __get_abs_delta(self, other: "GridCell", wrap_row_at=None, wrap_col_at=None) -> tuple[int, int]:
+        # plain ints instead of `abs(self - other)`, which would create two cells per distance
+        row_dist = abs(self.row - other.row)
+        col_dist = abs(self.col - other.col)
         if wrap_row_at is not None:
-            dist.row = min(dist.row, wrap_row_at - dist.row)
+            row_dist = min(row_dist, wrap_row_at - row_dist)
         if wrap_col_at is not None:
-            dist.col = min(dist.col, wrap_col_at - dist.col)
-        return dist
+            col_dist = min(col_dist, wrap_col_at - col_dist)
+        return row_dist, col_dist
@@ -1,6 +1,25 @@
+"""
+Loggers that are safe to use from search loops.
+
+- Records are put on a queue by the logging thread and written to stdout by a background listener thread
+  (`QueueHandler`/`QueueListener`), so threads never block on, or serialize through, the stream.
+- The level comes from the `LOG_LEVEL` environment variable (a name like `DEBUG`/`TRACE` or a number), INFO by default.
+- Messages should be %-style with arguments (`log.debug("found %d cells", count)`), so they're only formatted when a
+  record is actually emitted. In loops, check the level once before the loop instead of on every iteration, and use
+  `trace_sampler` for per-cell tracing, which logs 1 in `LOG_TRACE_SAMPLE` calls.
+
+Nothing is set up on import. The TRACE level, queue, and listener are created with the first logger.
+"""
+import atexit
+import itertools
 import logging
+import os
+import queue
 import sys
-from typing import cast, Any
+import threading
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Optional, cast
 
 
 # DEBUG is 10 and 5 is already registered by other libs, so something in between
@@ -13,31 +32,120 @@ def _trace(self: logging.Logger, message: Any, *args, **kwargs) -> None:
 def _trace_root(message, *args, **kwargs):
     logging.log(_TRACE, message, *args, **kwargs)
 
-logging.addLevelName(_TRACE, "TRACE")
-setattr(logging, "TRACE", _TRACE)
-setattr(logging.getLoggerClass(), "trace", _trace)
-setattr(logging, "trace", _trace_root)
+_trace_installed = False
+
+def _install_trace_level() -> None:
+    """Add the TRACE level to the logging module. Done when the first logger is created instead of on import."""
+    global _trace_installed
+    if _trace_installed:
+        return
+    logging.addLevelName(_TRACE, "TRACE")
+    setattr(logging, "TRACE", _TRACE)
+    setattr(logging.getLoggerClass(), "trace", _trace)
+    setattr(logging, "trace", _trace_root)
+    _trace_installed = True
 
 
 class TraceLogger(logging.Logger):
     def trace(self, msg, *args, **kwargs):
         pass
 
+
+class _ProcessQueueHandler(QueueHandler):
+    """Queue handler that starts a listener for the current process, so forked workers get their own"""
+    def __init__(self):
+        super().__init__(None)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        _get_queue().put_nowait(record)
+
+
+_lock = threading.Lock()
+_queue: Optional[queue.SimpleQueue] = None
+_listener: Optional[QueueListener] = None
+_listener_pid: Optional[int] = None
+
+def _get_queue() -> queue.SimpleQueue:
+    global _queue, _listener, _listener_pid
+    # the lock is only taken to start the listener, so emitting a record doesn't serialize threads
+    if _listener_pid == os.getpid():
+        return _queue
+    with _lock:
+        if _listener_pid != os.getpid():
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(
+                logging.Formatter("{asctime}: {levelname:<8s}{thread!s:<15.15s} [{name:<15.15s}] {message:s}", style="{")
+            )
+            _queue = queue.SimpleQueue()
+            _listener = QueueListener(_queue, handler)
+            _listener.start()
+            _listener_pid = os.getpid()
+            # write what's left on the queue before exiting
+            atexit.register(_listener.stop)
+        return _queue
+
+
+def _reset_after_fork() -> None:
+    """
+    A forked process inherits the queue but not the listener thread, and inherits the lock as it was, which could be
+    held by a thread that doesn't exist in the child. Start over so the child starts its own listener.
+    """
+    global _lock, _queue, _listener, _listener_pid
+    _lock = threading.Lock()
+    _queue = None
+    _listener = None
+    _listener_pid = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_log_level(default: Any = logging.INFO) -> int:
+    """Level from the `LOG_LEVEL` environment variable, as a name or a number"""
+    _install_trace_level()
+    value = os.environ.get("LOG_LEVEL", "").strip()
+    if not value:
+        return default
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Invalid LOG_LEVEL: {value}")
+    return level
+
+
 def create_logger(name: Any = None, level: Any = None) -> TraceLogger:
+    """Logger that writes through the queue, at the level (by default, from `LOG_LEVEL`)"""
+    _install_trace_level()
     log = cast(TraceLogger, logging.getLogger(name or "MyLogger"))
     log.propagate = False
-    log.setLevel(level or logging.INFO)
+    log.setLevel(level or get_log_level())
     if not log.hasHandlers():
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(
-            logging.Formatter("{asctime}: {levelname:<8s}{thread!s:<15.15s} [{name:<15.15s}] {message:s}", style="{")
-        )
-        log.addHandler(handler)
+        log.addHandler(_ProcessQueueHandler())
     return log
 
-def set_global_log_level(level: int):
-    # TODO: remove when dependencies are configured correctly. for now, force same level
-    #   across all loggers to avoid missing any helpful logs
-    all_loggers = [logging.getLogger(name) for name in logging.root.manager.loggerDict]
-    for l in all_loggers:
-        l.setLevel(level)
+
+@lru_cache(maxsize=None)
+def get_logger(name: str) -> TraceLogger:
+    """Logger for a module, created on first use (e.g. the first search) instead of when the module is imported"""
+    return create_logger(name)
+
+
+def trace_sampler(log: logging.Logger, every: Optional[int] = None) -> Optional[Callable[..., None]]:
+    """
+    Trace function for a hot loop, or None if TRACE is disabled so the loop only has to check for None.
+
+    Only 1 in `every` calls is logged (by default, from the `LOG_TRACE_SAMPLE` environment variable, or every call).
+    """
+    if not log.isEnabledFor(_TRACE):
+        return None
+    every = every or int(os.environ.get("LOG_TRACE_SAMPLE", 1))
+    if every < 1:
+        raise ValueError(f"Trace sample must be positive. Received {every}")
+    calls = itertools.count()
+
+    def trace(msg: str, *args) -> None:
+        if next(calls) % every == 0:
+            log._log(_TRACE, msg, args)
+
+    return trace
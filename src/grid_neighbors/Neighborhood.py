@@ -0,0 +1,129 @@
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Iterator, Tuple
+
+from .GridCell import GridCell
+from ._optional import import_numpy
+
+
+class Neighborhood(Sequence[GridCell]):
+    """
+    Compact collection of the cells within range of a positive cell.
+
+    Rows, columns, and distances are stored in flat typed arrays (a few bytes per cell) instead of a GridCell object
+    per cell, so search engines can fill it directly. It's still a sequence of GridCell objects (value is the
+    distance) for callers that expect one, but the cells are only created when indexed or iterated.
+    """
+    # C int, 4 bytes on all supported platforms
+    INDEX_TYPECODE = "i"
+
+    def __init__(self, distance_typecode: str = INDEX_TYPECODE):
+        self.rows = array(self.INDEX_TYPECODE)
+        self.cols = array(self.INDEX_TYPECODE)
+        self.distances = array(distance_typecode)
+
+    @classmethod
+    def from_cells(cls, cells: Iterable[GridCell], distance_typecode: str = INDEX_TYPECODE) -> "Neighborhood":
+        """Create a neighborhood from cells where the value is the distance."""
+        neighborhood = cls(distance_typecode)
+        for cell in cells:
+            neighborhood.add(cell.row, cell.col, cell.value)
+        return neighborhood
+
+    @classmethod
+    def from_distance_field(cls, dists) -> "Neighborhood":
+        """
+        Create a neighborhood from a 2-D NumPy distance raster.
+
+        Negative distances mark cells that are out of range. Cells are stored in row-major order. Requires NumPy.
+        """
+        np = import_numpy()
+        rows, cols = np.nonzero(dists >= 0)
+        neighborhood = cls()
+        neighborhood.rows.frombytes(rows.astype(np.intc).tobytes())
+        neighborhood.cols.frombytes(cols.astype(np.intc).tobytes())
+        neighborhood.distances.frombytes(dists[rows, cols].astype(np.intc).tobytes())
+        return neighborhood
+
+    def __repr__(self) -> str:
+        return f"Neighborhood({len(self)} cells, {self.nbytes} bytes)"
+
+    def __len__(self) -> int:
+        return len(self.distances)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            neighborhood = type(self)(self.distances.typecode)
+            neighborhood.rows = self.rows[index]
+            neighborhood.cols = self.cols[index]
+            neighborhood.distances = self.distances[index]
+            return neighborhood
+        return GridCell(self.rows[index], self.cols[index], self.distances[index])
+
+    def __iter__(self) -> Iterator[GridCell]:
+        for row, col, dist in self.items():
+            yield GridCell(row, col, dist)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the cell arrays"""
+        return sum(arr.itemsize * len(arr) for arr in (self.rows, self.cols, self.distances))
+
+    @property
+    def positive_count(self) -> int:
+        """Positive cells are the only ones with a distance of 0"""
+        return self.distances.count(0)
+
+    def add(self, row: int, col: int, distance) -> None:
+        self.rows.append(row)
+        self.cols.append(col)
+        self.distances.append(distance)
+
+    def to_raster(self, shape: Tuple[int, int]):
+        """
+        2-D NumPy distance raster with -1 for cells that aren't in the neighborhood (the inverse of
+        `from_distance_field`). Distances have the same type as the distance array, e.g. int32, or int64/float64 for
+        weighted distances. Requires NumPy.
+        """
+        np = import_numpy()
+        dtype = np.dtype(self.distances.typecode)
+        raster = np.full(shape, -1, dtype=dtype)
+        rows = np.frombuffer(self.rows, dtype=np.intc)
+        cols = np.frombuffer(self.cols, dtype=np.intc)
+        raster[rows, cols] = np.frombuffer(self.distances, dtype=dtype)
+        return raster
+
+    def row_chunks(self, rows_per_chunk: int) -> Iterator["Neighborhood"]:
+        """
+        Split into neighborhoods that each cover a band of rows, in row-major order.
+
+        Cells are bucketed by row (counting sort) so it's O(cells) and only one band is sorted by column at a time.
+        Bands without any cells are skipped.
+        """
+        if not len(self):
+            return
+        num_rows = max(self.rows) + 1
+        # start of each row's cells in `order`
+        starts = array(self.INDEX_TYPECODE, [0]) * (num_rows + 1)
+        for row in self.rows:
+            starts[row + 1] += 1
+        for row in range(num_rows):
+            starts[row + 1] += starts[row]
+        order = array(self.INDEX_TYPECODE, [0]) * len(self)
+        positions = array(self.INDEX_TYPECODE, starts)
+        for index, row in enumerate(self.rows):
+            order[positions[row]] = index
+            positions[row] += 1
+
+        for first_row in range(0, num_rows, rows_per_chunk):
+            band = order[starts[first_row]:starts[min(first_row + rows_per_chunk, num_rows)]]
+            if not band:
+                continue
+            chunk = type(self)(self.distances.typecode)
+            for index in sorted(band, key=lambda i: (self.rows[i], self.cols[i])):
+                chunk.add(self.rows[index], self.cols[index], self.distances[index])
+            yield chunk
+
+    def items(self) -> Iterator[Tuple[int, int, int]]:
+        """Iterate (row, col, distance) tuples without creating GridCell objects"""
+        return zip(self.rows, self.cols, self.distances)
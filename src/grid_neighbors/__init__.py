@@ -3,10 +3,42 @@ Grid-Cell Neighborhoods: Count cells within Manhattan distance of positive value
 
 This package provides classes to work with 2D grids and calculate neighborhoods
 based on Manhattan distance.
+
+The search engines are imported on first access (e.g. `grid_neighbors.BreadthFirstSearch`), so importing the
+package only loads the data types.
 """
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from .neighbor_searches import BruteForceSearch
+from .DistanceField import DistanceField
 from .Grid import Grid
 from .GridCell import GridCell
+from .Neighborhood import Neighborhood
+
+if TYPE_CHECKING:
+    from .neighbor_searches import (
+        BitmaskSearch, BruteForceSearch, BreadthFirstSearch, DijkstraSearch, DistanceTransformSearch,
+        IncrementalSearch, NativeSearch, SparseSearch
+    )
+
+# engines exported from `neighbor_searches`
+_ENGINES = {
+    'BitmaskSearch', 'BruteForceSearch', 'BreadthFirstSearch', 'DijkstraSearch', 'DistanceTransformSearch',
+    'IncrementalSearch', 'NativeSearch', 'SparseSearch',
+}
+
+__all__ = ['DistanceField', 'Grid', 'GridCell', 'Neighborhood', 'BitmaskSearch', 'BruteForceSearch', 'BreadthFirstSearch',
+           'DijkstraSearch', 'DistanceTransformSearch', 'IncrementalSearch', 'NativeSearch', 'SparseSearch']
+
+
+def __getattr__(name: str):
+    if name not in _ENGINES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(".neighbor_searches", __name__), name)
+    # later lookups find it without coming back here
+    globals()[name] = value
+    return value
+
 
-__all__ = ['Grid', 'GridCell', 'BruteForceSearch']
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,16 @@
+"""Helpers for optional third-party dependencies."""
+
+
+def import_numpy():
+    """
+    Import NumPy on demand so the core package stays dependency-free.
+
+    Raises an ImportError with install instructions when NumPy isn't available.
+    """
+    try:
+        import numpy
+    except ImportError as ie:
+        raise ImportError(
+            "NumPy is required for this feature. Install it with `pip install grid-neighbors[numpy]`"
+        ) from ie
+    return numpy
@@ -0,0 +1,146 @@
+"""
+Run many neighbor searches in one call.
+
+Jobs that share the same grid and settings are grouped so the grid is validated and searched once, at the largest
+distance any of those jobs asked for. Every distance is then answered from that one distance field. Groups are
+independent, so they can run concurrently in an executor (e.g. a process pool).
+"""
+from concurrent.futures import BrokenExecutor, Executor, TimeoutError as FutureTimeoutError, wait
+from typing import Optional, Sequence
+
+from .DistanceField import DistanceField
+from .Grid import Grid
+from .Neighborhood import Neighborhood
+from .neighbor_searches import ALGORITHMS, SearchBase
+from .planner import choose_algorithm
+from .result_cache import make_key
+
+VALID_ALGORITHMS = ["auto", *ALGORITHMS]
+# the other engines don't use traversal costs
+WEIGHTED_ALGORITHMS = ["auto", "dijkstra"]
+
+
+def parse_job(job: dict) -> tuple[Grid, list[int], str]:
+    """
+    Validate a job and create its grid.
+
+    A job has the same fields as a `/calculate` request, except that `distances` (a list) can be used in place of
+    `distance` to answer several distances at once.
+
+    Returns:
+        Grid, list of distances, algorithm
+    """
+    if not isinstance(job, dict):
+        raise ValueError("Job must be an object")
+    if job.get('grid') is None:
+        raise ValueError("Grid data is required")
+    distances = job.get('distances', [job['distance']] if job.get('distance') is not None else None)
+    if not distances or not isinstance(distances, list):
+        raise ValueError("Distance parameter is required")
+    if any(not isinstance(dist, int) or dist < 0 for dist in distances):
+        raise ValueError("Distance must be a non-negative integer")
+    algorithm = job.get('algorithm', 'auto')
+    if algorithm not in VALID_ALGORITHMS:
+        raise ValueError(f"Algorithm must be one of: {VALID_ALGORITHMS}")
+    if job.get('costs') is not None and algorithm not in WEIGHTED_ALGORITHMS:
+        raise ValueError(f"Costs are only supported by the algorithms: {WEIGHTED_ALGORITHMS}")
+    distance_type = job.get('distance_type', 'manhattan')
+    if distance_type not in Grid.DISTANCE_TYPES:
+        raise ValueError(f"Distance type must be one of: {list(Grid.DISTANCE_TYPES)}")
+    # data is validated inside the Grid init
+    grid = Grid(
+        job['grid'], job.get('wrap_rows', False), job.get('wrap_cols', False), distance_type, job.get('costs')
+    )
+    return grid, distances, algorithm
+
+
+def search(grid: Grid, max_distance: int, algorithm: str) -> tuple[str, Neighborhood, dict]:
+    """
+    Run a single search. Returns the algorithm that was used (resolved if 'auto'), the neighborhood, and the
+    engine's stats.
+    """
+    if algorithm == 'auto':
+        algorithm = choose_algorithm(grid, max_distance)
+    engine = ALGORITHMS[algorithm](grid, max_distance, grid.wrap_rows, grid.wrap_cols)
+    neighbors = engine.find_neighbors()
+    return algorithm, neighbors, engine.stats
+
+
+def search_field(grid: Grid, max_distance: int, algorithm: str) -> tuple[str, DistanceField]:
+    """Like `search`, but returns a distance field that can answer any distance up to the max distance"""
+    if algorithm == 'auto':
+        algorithm = choose_algorithm(grid, max_distance)
+    return algorithm, DistanceField(grid, max_distance, ALGORITHMS[algorithm])
+
+
+def create_job_result(grid: Grid, neighbors: Neighborhood, distance: int, algorithm: str) -> dict:
+    """Same format as a `/calculate` response"""
+    return {
+        **SearchBase.create_result(neighbors),
+        'grid_size': f"{grid.num_rows}x{grid.num_cols}",
+        'distance_threshold': distance,
+        'algorithm_used': algorithm,
+        'distance_type': grid.distance_type,
+        'wrap_rows': grid.wrap_rows,
+        'wrap_cols': grid.wrap_cols,
+    }
+
+
+def run_batch(
+    jobs: Sequence[dict], executor: Optional[Executor] = None, timeout: Optional[float] = None
+) -> list[dict]:
+    """
+    Run the jobs and return a result for each one, in order.
+
+    A job with `distance` gets a result in the `/calculate` format. A job with `distances` gets `{'results': [...]}`
+    with a result for each distance. A job that fails gets `{'error': message}` without affecting the other jobs.
+
+    Args:
+        jobs: Search parameters (see `parse_job`)
+        executor: Runs the searches concurrently. By default, they run one at a time in the calling thread.
+        timeout: Seconds to wait for all of the executor's searches. By default, there's no limit.
+
+    Raises:
+        concurrent.futures.TimeoutError: The searches weren't done within the timeout. Searches that haven't started
+            are cancelled.
+        concurrent.futures.BrokenExecutor: The executor can't run searches anymore (e.g. a worker process died)
+    """
+    results: list[Optional[dict]] = [None] * len(jobs)
+    groups = {}
+    for job_index, job in enumerate(jobs):
+        try:
+            grid, distances, algorithm = parse_job(job)
+        except (RuntimeError, TypeError, ValueError) as e:
+            results[job_index] = {'error': str(e)}
+            continue
+        group = groups.setdefault(make_key(grid, algorithm), {'grid': grid, 'algorithm': algorithm, 'jobs': []})
+        group['jobs'].append((job_index, distances, 'distances' in job))
+
+    tasks = []
+    for group in groups.values():
+        max_distance = max(dist for _, distances, _ in group['jobs'] for dist in distances)
+        args = (group['grid'], max_distance, group['algorithm'])
+        tasks.append(executor.submit(search_field, *args) if executor else args)
+    if executor:
+        _, not_done = wait(tasks, timeout)
+        if not_done:
+            for task in not_done:
+                task.cancel()
+            raise FutureTimeoutError(f"Searches took longer than {timeout:g} seconds")
+
+    for group, task in zip(groups.values(), tasks):
+        try:
+            algorithm, field = task.result() if executor else search_field(*task)
+        except BrokenExecutor:
+            # the executor failed, not the job
+            raise
+        except Exception as e:
+            for job_index, _, _ in group['jobs']:
+                results[job_index] = {'error': str(e)}
+            continue
+        for job_index, distances, multiple in group['jobs']:
+            job_results = [
+                create_job_result(group['grid'], field.cells_within(dist), dist, algorithm) for dist in distances
+            ]
+            results[job_index] = {'results': job_results} if multiple else job_results[0]
+    return results
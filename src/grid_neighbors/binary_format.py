@@ -0,0 +1,162 @@
+"""
+Compact binary encoding for grids and distance rasters.
+
+A message is a fixed 16 byte header followed by the matrix as raw little-endian values in row-major order:
+
+| offset | size | field                                          |
+|--------|------|------------------------------------------------|
+| 0      | 4    | magic `b"GNB1"`                                |
+| 4      | 1    | dtype code (see `DTYPES`)                      |
+| 5      | 1    | flags: bit 0 wraps rows, bit 1 wraps columns   |
+| 6      | 1    | distance type (index into `Grid.DISTANCE_TYPES`) |
+| 7      | 1    | reserved, must be 0                            |
+| 8      | 4    | number of rows (uint32)                        |
+| 12     | 4    | number of columns (uint32)                     |
+
+Decoding doesn't copy the values: the matrix is a read-only NumPy view of the message, which can back a grid
+directly (see `Grid.from_array`). Files in the same format (or NumPy `.npy` files) are memory-mapped, so matrices
+that are larger than memory are only read as they're used. Requires NumPy.
+"""
+import struct
+from typing import Any, Tuple
+
+from .Grid import Grid
+from ._optional import import_numpy
+
+MIMETYPE = "application/x-grid-neighbors"
+MAGIC = b"GNB1"
+NPY_MAGIC = b"\x93NUMPY"
+HEADER = struct.Struct("<4sBBBBII")
+# dtype code -> little-endian NumPy dtype
+DTYPES = {
+    0: "|b1",
+    1: "|i1",
+    2: "|u1",
+    3: "<i2",
+    4: "<u2",
+    5: "<i4",
+    6: "<u4",
+    7: "<i8",
+    8: "<u8",
+    9: "<f4",
+    10: "<f8",
+}
+WRAP_ROWS = 1
+WRAP_COLS = 2
+
+
+def encode(matrix: Any, wrap_rows: bool = False, wrap_cols: bool = False, distance_type: str = "manhattan") -> bytes:
+    """
+    Encode a 2-D matrix (anything NumPy can convert) with the grid settings.
+
+    Values are converted to little-endian if needed, so the message is the same on every platform.
+    """
+    np = import_numpy()
+    array = np.asarray(matrix)
+    if array.ndim != 2:
+        raise ValueError(f"Matrix must be 2-D. Received {array.ndim} dimensions")
+    dtype = array.dtype.newbyteorder("<") if array.dtype.byteorder == ">" else array.dtype
+    header = _encode_header(dtype, array.shape, wrap_rows, wrap_cols, distance_type)
+    return header + np.ascontiguousarray(array, dtype=dtype).tobytes()
+
+
+def decode(buffer: bytes) -> Tuple[Any, dict]:
+    """
+    Decode a message.
+
+    Returns:
+        Matrix (read-only view of the buffer), settings (`wrap_rows`, `wrap_cols`, `distance_type`)
+    """
+    np = import_numpy()
+    dtype, shape, settings = _decode_header(buffer)
+    if len(buffer) != HEADER.size + shape[0] * shape[1] * dtype.itemsize:
+        raise ValueError(
+            f"Invalid binary message: expected {shape[0]}x{shape[1]} {dtype} values after the header"
+        )
+    return np.frombuffer(buffer, dtype=dtype, offset=HEADER.size).reshape(shape), settings
+
+
+def open_file(path: str, mode: str = "r") -> Tuple[Any, dict]:
+    """
+    Memory-map a matrix file in the binary format or NumPy's `.npy` format (detected from the file's contents).
+
+    `.npy` files don't have grid settings, so they're the defaults.
+
+    Args:
+        mode: `r` for read-only or `r+` to modify the file in place
+
+    Returns:
+        Matrix (memory map), settings (`wrap_rows`, `wrap_cols`, `distance_type`)
+    """
+    np = import_numpy()
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if header.startswith(NPY_MAGIC):
+        matrix = np.load(path, mmap_mode=mode)
+        if matrix.ndim != 2:
+            raise ValueError(f"Matrix must be 2-D. Received {matrix.ndim} dimensions")
+        return matrix, {"wrap_rows": False, "wrap_cols": False, "distance_type": "manhattan"}
+    dtype, shape, settings = _decode_header(header)
+    return np.memmap(path, dtype=dtype, mode=mode, offset=HEADER.size, shape=shape), settings
+
+
+def create_file(
+    path: str,
+    shape: Tuple[int, int],
+    dtype: Any,
+    wrap_rows: bool = False,
+    wrap_cols: bool = False,
+    distance_type: str = "manhattan",
+):
+    """
+    Create a matrix file in the binary format and memory-map it for writing.
+
+    The values start as zeros. The file is only as large as the header plus the values, and isn't held in memory.
+    """
+    np = import_numpy()
+    dtype = np.dtype(dtype).newbyteorder("<")
+    with open(path, "wb") as f:
+        f.write(_encode_header(dtype, shape, wrap_rows, wrap_cols, distance_type))
+        f.truncate(HEADER.size + shape[0] * shape[1] * dtype.itemsize)
+    return np.memmap(path, dtype=dtype, mode="r+", offset=HEADER.size, shape=tuple(shape))
+
+
+def _encode_header(
+    dtype: Any, shape: Tuple[int, int], wrap_rows: bool, wrap_cols: bool, distance_type: str
+) -> bytes:
+    np = import_numpy()
+    codes = {np.dtype(name): code for code, name in DTYPES.items()}
+    if dtype not in codes:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    flags = (WRAP_ROWS if wrap_rows else 0) | (WRAP_COLS if wrap_cols else 0)
+    return HEADER.pack(MAGIC, codes[dtype], flags, list(Grid.DISTANCE_TYPES).index(distance_type), 0, *shape)
+
+
+def _decode_header(buffer: bytes) -> Tuple[Any, Tuple[int, int], dict]:
+    """Dtype, shape, and settings from the header at the start of the buffer"""
+    np = import_numpy()
+    if len(buffer) < HEADER.size:
+        raise ValueError("Invalid binary message: too short for the header")
+    magic, dtype_code, flags, distance_code, reserved, num_rows, num_cols = HEADER.unpack_from(buffer)
+    if magic != MAGIC or reserved != 0:
+        raise ValueError("Invalid binary message: unknown format")
+    if dtype_code not in DTYPES:
+        raise ValueError(f"Invalid binary message: unknown dtype code {dtype_code}")
+    if distance_code >= len(Grid.DISTANCE_TYPES):
+        raise ValueError(f"Invalid binary message: unknown distance type code {distance_code}")
+    settings = {
+        "wrap_rows": bool(flags & WRAP_ROWS),
+        "wrap_cols": bool(flags & WRAP_COLS),
+        "distance_type": list(Grid.DISTANCE_TYPES)[distance_code],
+    }
+    return np.dtype(DTYPES[dtype_code]), (num_rows, num_cols), settings
+
+
+def decode_grid(buffer: bytes) -> Grid:
+    """Decode a message into an array-backed grid without copying the values"""
+    matrix, settings = decode(buffer)
+    return Grid.from_array(matrix, **settings)
+
+
+def encode_grid(grid: Grid) -> bytes:
+    return encode(grid.to_numpy(), grid.wrap_rows, grid.wrap_cols, grid.distance_type)
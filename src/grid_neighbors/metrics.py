@@ -0,0 +1,118 @@
+"""
+Lightweight instrumentation: per-request step timings and process-wide counters.
+
+`Timings` records how long each step of one request took. `Metrics` aggregates counters and summaries (count and
+sum of observed values) across requests and renders them in the Prometheus text exposition format. Both do nothing
+when disabled, so instrumented code paths only pay for a method call.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Optional
+
+
+class Timings:
+    """Seconds spent in each named step, in the order the steps ran"""
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.seconds: dict[str, float] = {}
+
+    def time(self, step: str) -> ContextManager:
+        """Time the body of a `with` block. Time is added to the step if it's timed more than once."""
+        return self._time(step) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _time(self, step: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[step] = self.seconds.get(step, 0.0) + time.perf_counter() - start
+
+    def update(self, seconds: dict[str, float]) -> None:
+        """Add timings that were recorded somewhere else (e.g. in a worker process)"""
+        if self.enabled:
+            for step, value in seconds.items():
+                self.seconds[step] = self.seconds.get(step, 0.0) + value
+
+    def server_timing(self) -> str:
+        """Value for the `Server-Timing` response header (durations in milliseconds)"""
+        return ", ".join(f"{step};dur={value * 1000:.3f}" for step, value in self.seconds.items())
+
+
+class Metrics:
+    """
+    Thread-safe counters and summaries, labeled by keyword arguments.
+
+    Metric names are prefixed with `namespace` when rendered. A summary is rendered as `<name>_count` and
+    `<name>_sum`, so averages (and rates) can be calculated by the scraper.
+    """
+    def __init__(self, namespace: str = "grid_neighbors", enabled: bool = True):
+        self.namespace = namespace
+        self.enabled = enabled
+        self._counters: dict[tuple, float] = defaultdict(float)
+        self._summaries: dict[tuple, list[float]] = {}
+        self._help: dict[str, tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, metric_type: str, help_text: str) -> None:
+        """Set the type (`counter` or `summary`) and help text that are rendered for the metric"""
+        self._help[name] = (metric_type, help_text)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name: str, value: Optional[float], **labels) -> None:
+        """Add a value to a summary. None is ignored (e.g. a stat that the engine doesn't record)."""
+        if not self.enabled or value is None:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries.setdefault(key, [0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+
+    def observe_timings(self, timings: Timings, **labels) -> None:
+        for step, seconds in timings.seconds.items():
+            self.observe("step_seconds", seconds, step=step, **labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format"""
+        with self._lock:
+            samples = defaultdict(list)
+            for (name, labels), value in self._counters.items():
+                samples[name].append(("", labels, value))
+            for (name, labels), (count, total) in self._summaries.items():
+                samples[name].append(("_count", labels, count))
+                samples[name].append(("_sum", labels, total))
+
+        lines = []
+        for name in sorted(samples):
+            full_name = f"{self.namespace}_{name}"
+            metric_type, help_text = self._help.get(name, ("untyped", ""))
+            if help_text:
+                lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            for suffix, labels, value in sorted(samples[name], key=lambda sample: (sample[1], sample[0])):
+                label_str = ",".join(f'{key}="{self._escape(val)}"' for key, val in labels)
+                sample_name = f"{full_name}{suffix}{{{label_str}}}" if label_str else f"{full_name}{suffix}"
+                lines.append(f"{sample_name} {self._format(value)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _format(value: float) -> str:
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+    @staticmethod
+    def _escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
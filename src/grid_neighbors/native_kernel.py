@@ -0,0 +1,75 @@
+"""
+Multi-source BFS over flat buffers, compiled with Numba when it's installed.
+
+The kernel is plain Python over flat (row-major) integer buffers, so the same function runs compiled by Numba or
+interpreted over `array.array` buffers (which is how its parity with the other engines is tested without Numba).
+Interpreted, it's slower than `BreadthFirstSearch`, so `NativeSearch` only uses it when it can be compiled. Numba is
+imported and the kernel compiled on first use, not on import.
+"""
+import importlib.util
+from functools import lru_cache
+from typing import Callable, Optional
+
+
+def has_numba() -> bool:
+    return importlib.util.find_spec("numba") is not None
+
+
+def bfs_kernel(sources, num_rows, num_cols, wrap_rows, wrap_cols, dir_rows, dir_cols, max_distance, distances, queue):
+    """
+    Multi-source BFS from the flat indices of the sources.
+
+    `distances` must have a -1 for every cell and `queue` must have room for every cell. The distances of the cells
+    that are reached are filled in, and their flat indices are written to the front of the queue in level (distance)
+    order.
+
+    Returns:
+        Number of cells reached
+    """
+    num_cells = num_rows * num_cols
+    tail = 0
+    for i in range(len(sources)):
+        index = sources[i]
+        if distances[index] < 0:
+            distances[index] = 0
+            queue[tail] = index
+            tail += 1
+    head = 0
+    # once every cell is queued, there's nothing left to find
+    while head < tail and tail < num_cells:
+        index = queue[head]
+        head += 1
+        dist = distances[index]
+        # the queue is in order of distance, so every remaining cell is at the max distance too
+        if dist >= max_distance:
+            break
+        row = index // num_cols
+        col = index - row * num_cols
+        for k in range(len(dir_rows)):
+            new_row = row + dir_rows[k]
+            if new_row < 0 or new_row >= num_rows:
+                if not wrap_rows:
+                    continue
+                new_row %= num_rows
+            new_col = col + dir_cols[k]
+            if new_col < 0 or new_col >= num_cols:
+                if not wrap_cols:
+                    continue
+                new_col %= num_cols
+            new_index = new_row * num_cols + new_col
+            if distances[new_index] < 0:
+                distances[new_index] = dist + 1
+                queue[tail] = new_index
+                tail += 1
+    return tail
+
+
+@lru_cache(maxsize=None)
+def compiled_bfs_kernel() -> Optional[Callable]:
+    """The kernel compiled by Numba, or None if Numba isn't installed"""
+    if not has_numba():
+        return None
+    from numba import njit
+
+    # the compiled code is cached on disk, so it's only compiled once per machine
+    return njit(cache=True, nogil=True)(bfs_kernel)
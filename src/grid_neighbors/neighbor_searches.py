@@ -1,28 +1,35 @@
 import heapq
 import logging
+import math
 from abc import ABC, abstractmethod
-from collections import deque
-from typing import Sequence
+from array import array
+from collections import defaultdict
+from typing import Iterable, Iterator, Sequence
 
 from .Grid import Grid, Matrix
 from .GridCell import GridCell
-from .Logger import create_logger, set_global_log_level
-
-logger = create_logger(__name__)
+from .Neighborhood import Neighborhood
+from .Logger import get_logger, trace_sampler
+from .native_kernel import compiled_bfs_kernel
+from ._optional import import_numpy
 
 
 class SearchBase(ABC):
     @classmethod
     def create_result(cls, neighbors: Sequence[GridCell]) -> dict:
+        # a neighborhood's arrays can be read directly without creating a GridCell per neighbor
+        items = neighbors.items() if isinstance(neighbors, Neighborhood) else (
+            (neighbor.row, neighbor.col, neighbor.value) for neighbor in neighbors
+        )
         # autogen'd FE code expects a different format
         fe_neighbors = [
             {
-                'row': neighbor.row,
-                'col': neighbor.col,
-                'distance': neighbor.value,
-                'is_positive': neighbor.value == 0
+                'row': row,
+                'col': col,
+                'distance': dist,
+                'is_positive': dist == 0
             }
-            for neighbor in neighbors
+            for row, col, dist in items
         ]
         pos_cells = [
             {
@@ -47,102 +54,725 @@ class SearchBase(ABC):
         if max_distance < 0:
             raise ValueError(f"Max distance must be non-negative. Received {max_distance}")
         self.max_distance = max_distance
+        # work done by the last search, e.g. `cells_visited` and `queue_peak` (for engines with a queue)
+        self.stats: dict[str, int] = {}
 
     @abstractmethod
-    def find_neighbors(self) -> Sequence[GridCell]:
+    def find_neighbors(self) -> Neighborhood:
+        """
+        Find all cells within the max distance of a positive cell.
+
+        The neighborhood is a sequence of GridCell objects where the value is the distance to the closest
+        positive cell. Positive cells have a distance of 0.
+        """
         pass
 
+    def iter_neighbors(self) -> Iterator[GridCell]:
+        """
+        Yield the same cells as `find_neighbors`, without holding them all in a neighborhood.
+
+        Engines that produce cells incrementally yield them as they're found, so callers can stop early (e.g. after
+        the first K cells). Otherwise, the cells come from a full search. The order depends on the engine: BFS yields
+        in level (distance) order, Dijkstra in distance order, and the distance transform and incremental search in
+        row-major order.
+        """
+        return iter(self.find_neighbors())
+
+    def count_neighbors(self) -> int:
+        """
+        Number of cells in the neighborhood. Engines that can count without creating the cells do so.
+
+        When every cell is known to be in range (see `covers_grid`), the grid isn't searched at all.
+        """
+        if self.covers_grid():
+            self.stats = {"cells_visited": 0}
+            return self.grid.num_cells
+        return self._count_neighbors()
+
+    def covers_grid(self) -> bool:
+        """
+        True if every cell is within the max distance of a positive cell, without searching.
+
+        That's the case for unweighted grids with a positive cell when the max distance is at least the grid's
+        diameter, because no cell is further than that from any other cell.
+        """
+        return self.grid.costs is None and self.max_distance >= self.grid.diameter and self.grid.has_positive
+
+    def _count_neighbors(self) -> int:
+        return sum(1 for _ in self.iter_neighbors())
+
 
 class BreadthFirstSearch(SearchBase):
     """
     Multi-source Breadth-First Search (BFS) algorithm.
 
-    Unweighted graph implemented with Python's deque data structure.
+    Unweighted graph implemented with a list of flat cell indices per level.
 
     A graph is built where all positive cells start at the root level and each subsequent level consists of all cells
     1 step further away from their parent (neighbor) cell. This guarantees that each cell in the neighborhood only
     has to be visited once while guaranteeing distance is to the closest positive cell. Once, the graph has the same number
-    of levels as the specified distance value, any remaining unvisited cells can be skipped.  Implemented with Python's
-    deque data structure.
-    """
-    def find_neighbors(self) -> Sequence[GridCell]:
-        src_cells = self.grid.positive_cells
-        if not src_cells:
-            return []
-
-        # initialize source cells as starting points with distances of 0
-        for cell in src_cells:
-            cell.value = 0
-
-        # using a set allows for constant-time lookups of presence for already visited cells.
-        # set is initialized with source cells because they're part of the neighborhood as well.
-        neighborhood = set(src_cells)
-        bfs_queue = deque(src_cells, self.grid.num_cells)
-        while bfs_queue:
-            curr_cell = bfs_queue.popleft()
-            if curr_cell.value >= self.max_distance:
-                continue
-            neighbors = self.grid.get_immediate_neighbors(curr_cell)
-            for new_neighbor in neighbors:
-                # can safely ignore neighbors that have already been visited
-                if new_neighbor not in neighborhood:
-                    # distance is set here because `value` is being overloaded and the `get_immediate_neighbors`
-                    # method doesn't know in what context its being called to set itself
-                    new_neighbor.value = curr_cell.value + 1
-                    # add to the neighborhood and queue at next level to process its own neighbors
-                    neighborhood.add(new_neighbor)
-                    bfs_queue.append(new_neighbor)
-
-        return list(neighborhood)
+    of levels as the specified distance value, any remaining unvisited cells can be skipped. Cells are flat (row-major)
+    indices and visited cells are tracked in a bytearray, so GridCell objects are only created for `iter_neighbors`.
+    """
+    def find_neighbors(self) -> Neighborhood:
+        neighborhood = Neighborhood()
+        num_cols = self.grid.num_cols
+        for dist, level in self._levels():
+            for index in level:
+                neighborhood.add(index // num_cols, index % num_cols, dist)
+        return neighborhood
+
+    def iter_neighbors(self) -> Iterator[GridCell]:
+        num_cols = self.grid.num_cols
+        for dist, level in self._levels():
+            for index in level:
+                yield GridCell(index // num_cols, index % num_cols, dist)
+
+    def _count_neighbors(self) -> int:
+        return sum(len(level) for _, level in self._levels())
 
+    def _levels(self) -> Iterator[tuple[int, list[int]]]:
+        """
+        Yield the distance and flat (row-major) indices of the cells at each level, starting with the positive cells.
+
+        Cells are plain ints, so no objects are created per visited cell besides the index itself. Each level is
+        expanded as a batch, and the search stops as soon as every cell in the grid has been visited, so a saturated
+        grid (e.g. every cell positive) is a single pass over the data.
+        """
+        num_cells = self.grid.num_cells
+        # interior cells find their neighbors at fixed offsets, border cells have them precomputed
+        table = self.grid.neighbor_table
+        offsets, border = table.offsets, table.border
+        # one byte per cell allows for constant-time lookups of presence for already visited cells.
+        # it's initialized with source cells because they're part of the neighborhood as well.
+        visited = bytearray(num_cells)
+        level = self.grid.positive_indices
+        for index in level:
+            visited[index] = 1
+        num_visited = len(level)
+        queue_peak = len(level)
+        dist = 0
+        log = get_logger(__name__)
+        # checked once instead of for every level
+        debug = log.isEnabledFor(logging.DEBUG)
+        try:
+            while level:
+                if debug:
+                    log.debug("Level %d: %d cells, %d visited", dist, len(level), num_visited)
+                yield dist, level
+                # once the graph has as many levels as the max distance, remaining cells can be skipped.
+                # once every cell is visited, expanding the last level wouldn't find anything
+                if dist >= self.max_distance or num_visited == num_cells:
+                    break
+                next_level = []
+                for index in level:
+                    neighbors = border.get(index)
+                    if neighbors is None:
+                        neighbors = [index + offset for offset in offsets]
+                    for new_index in neighbors:
+                        # can safely ignore neighbors that have already been visited
+                        if not visited[new_index]:
+                            visited[new_index] = 1
+                            next_level.append(new_index)
+                num_visited += len(next_level)
+                queue_peak = max(queue_peak, len(next_level))
+                level = next_level
+                dist += 1
+        finally:
+            # also when the caller stops early
+            self.stats = {"cells_visited": num_visited, "queue_peak": queue_peak}
+
+
+class DijkstraSearch(SearchBase):
+    """
+    Multi-source Dijkstra algorithm for weighted grids.
+
+    Moving into a cell costs the value of that cell in the grid's cost matrix (`Grid.costs`), or 1 when the grid has
+    no costs, which makes the result identical to BreadthFirstSearch. All positive cells start in the heap with a
+    distance of 0. Cells are settled in order of their distance, so the search stops as soon as the smallest
+    distance in the heap is beyond the max distance. Implemented with Python's heapq module.
+    """
+    def __init__(self, data: Matrix | Grid, max_distance: int, wrap_rows=False, wrap_cols=False, costs=None):
+        super().__init__(data, max_distance, wrap_rows, wrap_cols)
+        if costs is not None:
+            self.grid.costs = costs
+
+    def find_neighbors(self) -> Neighborhood:
+        # weighted distances are only fractional with float costs. integer costs can add up past 32 bits
+        if self.grid.costs is None:
+            neighborhood = Neighborhood()
+        else:
+            neighborhood = Neighborhood("d" if self.grid.fractional_costs else "q")
+        num_cols = self.grid.num_cols
+        for index, dist in self._settle():
+            neighborhood.add(index // num_cols, index % num_cols, dist)
+        return neighborhood
+
+    def iter_neighbors(self) -> Iterator[GridCell]:
+        num_cols = self.grid.num_cols
+        for index, dist in self._settle():
+            yield GridCell(index // num_cols, index % num_cols, dist)
+
+    def _settle(self) -> Iterator[tuple[int, int | float]]:
+        """Yield the flat index and distance of each cell within the max distance, in order of distance"""
+        sources = self.grid.positive_indices
+        if not sources:
+            return
+
+        # cost of moving into each cell by flat index, or None if every move costs 1
+        costs = None if self.grid.costs is None else self.grid.costs.flat_values()
+        table = self.grid.neighbor_table
+        offsets, border = table.offsets, table.border
+        # best known distance for each cell. a cell can be pushed more than once before it's settled
+        distances = {index: 0 for index in sources}
+        heap = [(0, index) for index in sources]
+        heapq.heapify(heap)
+        num_cells = self.grid.num_cells
+        settled = bytearray(num_cells)
+        num_settled = 0
+        queue_peak = len(heap)
+        try:
+            while heap:
+                queue_peak = max(queue_peak, len(heap))
+                dist, index = heapq.heappop(heap)
+                if dist > self.max_distance:
+                    # every remaining cell is at least this far away
+                    break
+                if settled[index]:
+                    continue
+                settled[index] = 1
+                num_settled += 1
+                yield index, dist
+                if num_settled == num_cells:
+                    # the rest of the heap can only be cells that are already settled
+                    break
+                neighbors = border.get(index)
+                if neighbors is None:
+                    neighbors = [index + offset for offset in offsets]
+                for neighbor_index in neighbors:
+                    new_dist = dist + (1 if costs is None else costs[neighbor_index])
+                    if new_dist <= self.max_distance and new_dist < distances.get(neighbor_index, math.inf):
+                        distances[neighbor_index] = new_dist
+                        heapq.heappush(heap, (new_dist, neighbor_index))
+        finally:
+            self.stats = {"cells_visited": num_settled, "queue_peak": queue_peak}
 
 class BruteForceSearch(SearchBase):
-    def find_neighbors(self) -> Sequence[GridCell]:
+    """
+    Compare every cell in the grid against every positive cell and keep the closest distance.
+
+    Cells are visited in row-major order as plain row/col ints, so no GridCell objects are created per comparison.
+    """
+    def find_neighbors(self) -> Neighborhood:
         # save locally, for perf
         num_rows, num_cols = self.grid.shape
-        src_cells = self.grid.positive_cells
-        if not src_cells:
-            return []
-
-        # unique list of cells in the neighborhood (ignoring value)
-        neighbors = set()
+        neighbors = Neighborhood()
+        sources = [divmod(index, num_cols) for index in self.grid.positive_indices]
+        if not sources:
+            return neighbors
 
+        wrap_rows, wrap_cols = self.grid.wrap_rows, self.grid.wrap_cols
+        chebyshev = self.grid.distance_type == "chebyshev"
+        log = get_logger(__name__)
+        # None unless TRACE is enabled, so the loop doesn't pay for it otherwise
+        trace = trace_sampler(log)
         # iterate every single cell in the grid against every source cell (brute force)
-        for cell in self.grid:
-            dists = []
-            for src_cell in src_cells:
-                # calculate distance to all source cells (considering possible index wrapping in
-                # both dimensions) and save the distance to the closest one
-                dist_func = src_cell.chebyshev_distance if self.grid.distance_type == "chebyshev" else src_cell.manhattan_distance
-                dists.append(
-                    dist_func(
-                        cell,
-                        wrap_row_at=num_rows if self.grid.wrap_rows else None,
-                        wrap_col_at=num_cols if self.grid.wrap_cols else None
-                    )
-                )
-            min_distance = min(dists)
-            # if closest source cell is in range, then current cell is a neighbor
-            # of at least one of the sources and should be included
-            if min_distance <= self.max_distance:
-                # copy cell to preserve relative distance to the nearest source
-                new_neighbor = cell.copy(value=min_distance)
-                curr_ct = len(neighbors)
-                neighbors.add(new_neighbor)
-                if len(neighbors) == curr_ct:
-                    logger.debug(f"\tSkipping duplicate neighbor: {new_neighbor}")
+        for row in range(num_rows):
+            for col in range(num_cols):
+                min_distance = None
+                for src_row, src_col in sources:
+                    # calculate distance to all source cells (considering possible index wrapping in
+                    # both dimensions) and save the distance to the closest one
+                    row_dist = abs(row - src_row)
+                    col_dist = abs(col - src_col)
+                    if wrap_rows:
+                        row_dist = min(row_dist, num_rows - row_dist)
+                    if wrap_cols:
+                        col_dist = min(col_dist, num_cols - col_dist)
+                    dist = max(row_dist, col_dist) if chebyshev else row_dist + col_dist
+                    if min_distance is None or dist < min_distance:
+                        min_distance = dist
+                # if closest source cell is in range, then current cell is a neighbor
+                # of at least one of the sources and should be included
+                if min_distance <= self.max_distance:
+                    neighbors.add(row, col, min_distance)
+                if trace is not None:
+                    trace("Cell (%d, %d) is %s from the closest source", row, col, min_distance)
+
+        self.stats = {"cells_visited": self.grid.num_cells}
+        log.debug("Found %d neighbors of %d sources within %d", len(neighbors), len(sources), self.max_distance)
+        return neighbors
+
+
+class DistanceTransformSearch(SearchBase):
+    """
+    Vectorized two-pass distance transform.
+
+    Instead of visiting cells one at a time, the distance to the closest positive cell is calculated for the whole
+    grid at once with NumPy array operations. Manhattan distance is separable, so it's calculated with a forward and
+    backward running minimum along each axis. Chebyshev distance starts with the same scan along the rows and then
+    makes a forward and backward chamfer pass over the rows, where each row is updated as a single vector from the
+    row before it. Wrapped dimensions are padded with the cells from the opposite edge. Padding is limited to the max
+    distance because sources any further away than that can't affect the result.
+
+    Requires NumPy.
+    """
+    def find_neighbors(self) -> Neighborhood:
+        return Neighborhood.from_distance_field(self.distance_field())
+
+    def iter_neighbors(self) -> Iterator[GridCell]:
+        np = import_numpy()
+        # cells are only created for one row at a time
+        for row, row_dists in enumerate(self.distance_field()):
+            for col in np.flatnonzero(row_dists >= 0).tolist():
+                yield GridCell(row, col, int(row_dists[col]))
+
+    def _count_neighbors(self) -> int:
+        return int((self.distance_field() >= 0).sum())
+
+    def distance_field(self):
+        """
+        Calculate the distance from every cell in the grid to its closest positive cell.
 
-        return list(neighbors)
+        Cells further away than the max distance (or every cell, if there are no positive cells) are
+        set to -1.
+        """
+        np = import_numpy()
+        positive = self.grid.to_numpy() > 0
+        num_rows, num_cols = positive.shape
+        # no cell can be further away than the grid's diameter, so cap the max distance to keep the
+        # values small. the cap is also the initial value for non-positive cells, which avoids any overflow.
+        unreachable = min(self.max_distance, num_rows + num_cols) + 1
+        row_pad = min(self.max_distance, num_rows) if self.grid.wrap_rows else 0
+        col_pad = min(self.max_distance, num_cols) if self.grid.wrap_cols else 0
+        if row_pad or col_pad:
+            positive = np.pad(positive, ((row_pad, row_pad), (col_pad, col_pad)), mode="wrap")
+        dists = np.where(positive, 0, unreachable).astype(np.int32)
+        self.stats = {"cells_visited": dists.size}
 
+        dists = self._scan_axis(dists, axis=1)
+        if self.grid.distance_type == "chebyshev":
+            self._chamfer_rows(dists)
+        else:
+            dists = self._scan_axis(dists, axis=0)
 
+        dists = dists[row_pad:row_pad + num_rows, col_pad:col_pad + num_cols]
+        dists[dists >= unreachable] = -1
+        return dists
 
+    @staticmethod
+    def _scan_axis(dists, axis: int):
+        """
+        One-dimensional distance transform along the axis.
 
+        Forward: d[i] = min(d[j] + i - j) for j <= i = i + running_min(d[j] - j)
+        Backward: d[i] = min(d[j] + j - i) for j >= i = reversed_running_min(d[j] + j) - i
+        """
+        np = import_numpy()
+        shape = [1, 1]
+        shape[axis] = dists.shape[axis]
+        idx = np.arange(dists.shape[axis], dtype=dists.dtype).reshape(shape)
+        forward = np.minimum.accumulate(dists - idx, axis=axis) + idx
+        backward = np.flip(np.minimum.accumulate(np.flip(dists + idx, axis=axis), axis=axis), axis=axis) - idx
+        return np.minimum(forward, backward)
 
+    @staticmethod
+    def _chamfer_rows(dists) -> None:
+        """
+        Update (in-place) the row distances from the rows above and below, including diagonals.
 
+        Expects the distances to already be scanned along each row. A shortest Chebyshev path can always move
+        along the source's row first and then only move diagonally or vertically, so a single pass in each
+        direction is enough.
+        """
+        np = import_numpy()
+        num_rows = dists.shape[0]
+        for step, row_order in ((1, range(1, num_rows)), (-1, range(num_rows - 2, -1, -1))):
+            for row in row_order:
+                prev = dists[row - step]
+                closest = prev.copy()
+                np.minimum(closest[1:], prev[:-1], out=closest[1:])
+                np.minimum(closest[:-1], prev[1:], out=closest[:-1])
+                np.minimum(dists[row], closest + 1, out=dists[row])
 
 
+class SparseSearch(SearchBase):
+    """
+    Footprint search for grids with only a few positive cells.
+
+    The offsets of every cell within the max distance (a diamond for Manhattan distance or a square for Chebyshev
+    distance) are calculated once as a stencil. The stencil is then stamped onto each positive cell and overlapping
+    footprints are merged by keeping the shortest distance. Cost scales with the number of sources times the size
+    of the footprint instead of the grid's area, so it's best when the footprints are small compared to the grid.
+
+    The stencil is limited to the number of distinct rows/cols in each dimension. When a dimension wraps, the offsets
+    are centered around 0 so that the offset is also the shortest distance around the torus.
+    """
+    def find_neighbors(self) -> Neighborhood:
+        neighborhood = Neighborhood()
+        num_cols = self.grid.num_cols
+        for flat_index, dist in self._stamp().items():
+            row, col = divmod(flat_index, num_cols)
+            neighborhood.add(row, col, dist)
+        return neighborhood
+
+    def _count_neighbors(self) -> int:
+        return len(self._stamp())
+
+    def _stamp(self) -> dict[int, int]:
+        """Closest distance for each cell in the neighborhood, by flat index"""
+        num_rows, num_cols = self.grid.shape
+        sources = [divmod(index, num_cols) for index in self.grid.positive_indices]
+        if not sources:
+            return {}
+
+        wrap_rows, wrap_cols = self.grid.wrap_rows, self.grid.wrap_cols
+        # closest distance for each cell in the neighborhood, by flat index
+        distances = {}
+        stencil = self.stencil()
+        for dr, dc, dist in stencil:
+            for src_row, src_col in sources:
+                row, col = src_row + dr, src_col + dc
+                if wrap_rows:
+                    row %= num_rows
+                elif row < 0 or row >= num_rows:
+                    continue
+                if wrap_cols:
+                    col %= num_cols
+                elif col < 0 or col >= num_cols:
+                    continue
+                # stencil is sorted by distance, so the first time a cell is reached is the closest
+                distances.setdefault(row * num_cols + col, dist)
+
+        # every offset is stamped onto every source, even if it's out of bounds
+        self.stats = {"cells_visited": len(stencil) * len(sources)}
+        return distances
+
+    def stencil(self) -> list[tuple[int, int, int]]:
+        """Row/col offsets and distances of the footprint around a positive cell, sorted by distance"""
+        num_rows, num_cols = self.grid.shape
+        row_offsets = self._axis_offsets(num_rows, self.grid.wrap_rows)
+        col_offsets = self._axis_offsets(num_cols, self.grid.wrap_cols)
+        chebyshev = self.grid.distance_type == "chebyshev"
+        offsets = []
+        for dr in row_offsets:
+            for dc in col_offsets:
+                dist = max(abs(dr), abs(dc)) if chebyshev else abs(dr) + abs(dc)
+                if dist <= self.max_distance:
+                    offsets.append((dr, dc, dist))
+        offsets.sort(key=lambda offset: offset[2])
+        return offsets
+
+    def _axis_offsets(self, size: int, wrap: bool) -> range:
+        if wrap:
+            # each index is reached once, in the direction that's shortest
+            return range(max(-self.max_distance, -((size - 1) // 2)), min(self.max_distance, size // 2) + 1)
+        # any further and the offset would be out of bounds from every cell
+        limit = min(self.max_distance, size - 1)
+        return range(-limit, limit + 1)
+
+
+class BitmaskSearch(SearchBase):
+    """
+    Dilate a bitmask of the positive cells, for callers that mostly need to know which cells are in range.
+
+    The whole grid is one Python int with a bit per cell in row-major order (bit `row * num_cols + col`). Each step
+    ORs the mask with copies of itself shifted by one column and one row (and, for Chebyshev distance, the diagonals
+    by shifting the column-dilated mask by a row), masking off bits that would cross the edge of a row. Wrapped
+    dimensions rotate the bits that fall off one edge back onto the other. A step is a handful of big-int operations
+    over the whole grid (one machine word per 64 cells) instead of a Python operation per cell, and the mask is 1/8
+    the size of a visited bytearray. `count_neighbors` is a popcount. Distances come from the bits added at each step.
+    """
+    def mask(self) -> int:
+        """Bit `row * num_cols + col` is set if the cell is within the max distance of a positive cell"""
+        mask = 0
+        for mask, _ in self._steps():
+            pass
+        return mask
+
+    def find_neighbors(self) -> Neighborhood:
+        neighborhood = Neighborhood()
+        num_cols = self.grid.num_cols
+        for dist, level in enumerate(level for _, level in self._steps()):
+            for index in self._set_bits(level):
+                neighborhood.add(index // num_cols, index % num_cols, dist)
+        return neighborhood
+
+    def iter_neighbors(self) -> Iterator[GridCell]:
+        num_cols = self.grid.num_cols
+        for dist, level in enumerate(level for _, level in self._steps()):
+            for index in self._set_bits(level):
+                yield GridCell(index // num_cols, index % num_cols, dist)
+
+    def _count_neighbors(self) -> int:
+        return self.mask().bit_count()
+
+    def _steps(self) -> Iterator[tuple[int, int]]:
+        """Yield the mask and the bits it added at each step, starting with the positive cells"""
+        num_rows, num_cols = self.grid.shape
+        num_cells = num_rows * num_cols
+        full = (1 << num_cells) - 1
+        # bits of the first column, by doubling the number of rows each time
+        first_col, num_set = 1, 1
+        while num_set < num_rows:
+            first_col |= first_col << (num_set * num_cols)
+            num_set *= 2
+        first_col &= full
+        last_col = first_col << (num_cols - 1)
+        row_shift, wrap_shift = num_cols, num_cells - num_cols
+        wrap_rows, wrap_cols = self.grid.wrap_rows, self.grid.wrap_cols
+        chebyshev = self.grid.distance_type == "chebyshev"
+
+        def dilate_cols(mask: int) -> int:
+            if num_cols == 1:
+                return mask
+            east = (mask << 1) & ~first_col
+            west = (mask >> 1) & ~last_col
+            if wrap_cols:
+                east |= (mask >> (num_cols - 1)) & first_col
+                west |= (mask << (num_cols - 1)) & last_col
+            # the last cell's east neighbor would be past the end of the grid
+            return (mask | east | west) & full
+
+        def dilate_rows(mask: int) -> int:
+            dilated = mask | (mask << row_shift) | (mask >> row_shift)
+            if wrap_rows:
+                dilated |= (mask >> wrap_shift) | (mask << wrap_shift)
+            return dilated & full
+
+        mask = self._positive_mask()
+        num_steps = 0
+        try:
+            if mask:
+                yield mask, mask
+            while mask and num_steps < self.max_distance and mask != full:
+                if chebyshev:
+                    dilated = dilate_rows(dilate_cols(mask))
+                else:
+                    dilated = dilate_rows(mask) | dilate_cols(mask)
+                num_steps += 1
+                level = dilated & ~mask
+                if not level:
+                    # nothing left to reach, e.g. every other cell is beyond an edge that doesn't wrap
+                    break
+                mask = dilated
+                yield mask, level
+        finally:
+            # also when the caller stops early
+            self.stats = {"cells_visited": mask.bit_count(), "dilations": num_steps}
+
+    def _positive_mask(self) -> int:
+        bits = bytearray((self.grid.num_cells + 7) // 8)
+        for index in self.grid.positive_indices:
+            bits[index >> 3] |= 1 << (index & 7)
+        return int.from_bytes(bits, "little")
+
+    @staticmethod
+    def _set_bits(mask: int) -> Iterator[int]:
+        """Indices of the set bits in ascending order"""
+        # the binary string reversed so character i is bit i. finding the ones is a scan in C.
+        bits = bin(mask)[:1:-1]
+        index = bits.find("1")
+        while index >= 0:
+            yield index
+            index = bits.find("1", index + 1)
+
+
+class NativeSearch(SearchBase):
+    """
+    Multi-source BFS compiled with Numba (see `native_kernel`), or `BreadthFirstSearch` when Numba isn't installed.
+
+    Same neighbors as `BreadthFirstSearch`, in row-major order when compiled. The compiled kernel works on NumPy
+    buffers of flat indices and distances, so a search allocates a few bytes per cell and no Python objects. Grids with
+    traversal costs aren't supported.
+    """
+    def __init__(self, data: Matrix | Grid, max_distance: int, wrap_rows=False, wrap_cols=False):
+        super().__init__(data, max_distance, wrap_rows, wrap_cols)
+        if self.grid.costs is not None:
+            raise ValueError("Native search doesn't support grids with traversal costs")
+
+    @property
+    def compiled(self) -> bool:
+        """True if searches run the compiled kernel"""
+        return compiled_bfs_kernel() is not None
+
+    def find_neighbors(self) -> Neighborhood:
+        if not self.compiled:
+            return self._fallback("find_neighbors")
+        return Neighborhood.from_distance_field(self.distance_field())
+
+    def iter_neighbors(self) -> Iterator[GridCell]:
+        if not self.compiled:
+            return self._fallback("iter_neighbors")
+        return super().iter_neighbors()
+
+    def _count_neighbors(self) -> int:
+        if not self.compiled:
+            return self._fallback("count_neighbors")
+        self.distance_field()
+        return self.stats["cells_visited"]
+
+    def distance_field(self):
+        """Distance raster (int32) with -1 for cells beyond the max distance. Requires Numba."""
+        kernel = compiled_bfs_kernel()
+        if kernel is None:
+            raise ImportError("Numba is required for this feature. Install it with `pip install grid-neighbors[numba]`")
+        np = import_numpy()
+        num_rows, num_cols = self.grid.shape
+        distances = np.full(num_rows * num_cols, -1, dtype=np.int32)
+        queue = np.empty(num_rows * num_cols, dtype=np.int64)
+        dir_rows, dir_cols = (np.array(steps, dtype=np.int64) for steps in zip(*self.grid.directions))
+        num_reached = kernel(
+            np.flatnonzero(self.grid.to_numpy() > 0), num_rows, num_cols, self.grid.wrap_rows, self.grid.wrap_cols,
+            dir_rows, dir_cols, self.max_distance, distances, queue,
+        )
+        self.stats = {"cells_visited": int(num_reached)}
+        return distances.reshape(num_rows, num_cols)
+
+    def _fallback(self, method: str):
+        search = BreadthFirstSearch(self.grid, self.max_distance, self.grid.wrap_rows, self.grid.wrap_cols)
+        if method == "iter_neighbors":
+            return self._iter_fallback(search)
+        result = getattr(search, method)()
+        self.stats = search.stats
+        return result
+
+    def _iter_fallback(self, search: "BreadthFirstSearch") -> Iterator[GridCell]:
+        try:
+            yield from search.iter_neighbors()
+        finally:
+            # also when the caller stops early
+            self.stats = search.stats
+
+class IncrementalSearch(SearchBase):
+    """
+    Stateful search that keeps the distance field between calls and updates it as positive cells change.
+
+    The distance field starts with a regular multi-source BFS. Adding a positive cell grows out from that cell and
+    only updates cells that end up closer to it. Removing a positive cell invalidates the cells within the max
+    distance that could have been using it as their closest source, then repairs them from the valid cells around
+    the invalidated region. Either way, the cost is proportional to the area around the changed cell instead of the
+    grid. Updates don't modify the grid's data.
+    """
+    # distance of cells that are out of range
+    UNREACHABLE = -1
+
+    def __init__(self, data: Matrix | Grid, max_distance: int, wrap_rows=False, wrap_cols=False):
+        super().__init__(data, max_distance, wrap_rows, wrap_cols)
+        self._neighbor_table = self.grid.neighbor_table
+        # flat (row-major) arrays so state is a few bytes per cell
+        self._sources = bytearray(self.grid.num_cells)
+        self._distances = array("i", [self.UNREACHABLE]) * self.grid.num_cells
+        seeds = []
+        for index in self.grid.positive_indices:
+            self._sources[index] = 1
+            self._distances[index] = 0
+            seeds.append(index)
+        self._propagate(seeds)
+
+    def find_neighbors(self) -> Neighborhood:
+        neighborhood = Neighborhood()
+        num_cols = self.grid.num_cols
+        for index, dist in enumerate(self._distances):
+            if dist != self.UNREACHABLE:
+                neighborhood.add(index // num_cols, index % num_cols, dist)
+        self.stats = {"cells_visited": len(self._distances)}
+        return neighborhood
+
+    def iter_neighbors(self) -> Iterator[GridCell]:
+        num_cols = self.grid.num_cols
+        for index, dist in enumerate(self._distances):
+            if dist != self.UNREACHABLE:
+                yield GridCell(index // num_cols, index % num_cols, dist)
+
+    def _count_neighbors(self) -> int:
+        return len(self._distances) - self._distances.count(self.UNREACHABLE)
+
+    def covers_grid(self) -> bool:
+        # the positive cells are tracked here, not in the grid
+        return self.max_distance >= self.grid.diameter and 1 in self._sources
+
+    def distance(self, row: int, col: int) -> int:
+        """Distance from the cell to its closest positive cell, or UNREACHABLE if it's out of range"""
+        return self._distances[self._flat_index(row, col)]
+
+    def set_positive(self, row: int, col: int) -> None:
+        index = self._flat_index(row, col)
+        if self._sources[index]:
+            return
+        self._sources[index] = 1
+        self._distances[index] = 0
+        self._propagate([index])
+
+    def clear_positive(self, row: int, col: int) -> None:
+        index = self._flat_index(row, col)
+        if not self._sources[index]:
+            return
+        self._sources[index] = 0
+
+        # any cell that's as far from the removed source as its current distance may have been using it as
+        # its closest source. cells that are closer to another source aren't affected.
+        invalidated = []
+        footprint = {index}
+        frontier = [index]
+        for dist in range(self.max_distance + 1):
+            next_frontier = []
+            for curr_index in frontier:
+                if self._distances[curr_index] == dist:
+                    invalidated.append(curr_index)
+                if dist == self.max_distance:
+                    continue
+                for neighbor_index in self._neighbor_indices(curr_index):
+                    if neighbor_index not in footprint:
+                        footprint.add(neighbor_index)
+                        next_frontier.append(neighbor_index)
+            frontier = next_frontier
+        for invalid_index in invalidated:
+            self._distances[invalid_index] = self.UNREACHABLE
+
+        # cells bordering the invalidated region still have valid distances, so they can repair it
+        seeds = {
+            neighbor_index
+            for invalid_index in invalidated
+            for neighbor_index in self._neighbor_indices(invalid_index)
+            if self._distances[neighbor_index] != self.UNREACHABLE
+        }
+        self._propagate(seeds)
 
+    def _propagate(self, seeds: Iterable[int]) -> None:
+        """Relax distances outward from the seed cells, in order of distance (bucketed BFS)"""
+        buckets = defaultdict(list)
+        for index in seeds:
+            buckets[self._distances[index]].append(index)
+        dist = min(buckets, default=0)
+        while buckets:
+            frontier = buckets.pop(dist, [])
+            for index in frontier:
+                # skip stale entries for cells that have already been reached by a shorter path
+                if self._distances[index] != dist or dist >= self.max_distance:
+                    continue
+                for neighbor_index in self._neighbor_indices(index):
+                    neighbor_dist = self._distances[neighbor_index]
+                    if neighbor_dist == self.UNREACHABLE or neighbor_dist > dist + 1:
+                        self._distances[neighbor_index] = dist + 1
+                        buckets[dist + 1].append(neighbor_index)
+            dist += 1
 
+    def _flat_index(self, row: int, col: int) -> int:
+        row, col = self.grid._validate_indices(row, col)
+        return row * self.grid.num_cols + col
 
+    def _neighbor_indices(self, index: int) -> tuple[int, ...]:
+        return self._neighbor_table.neighbors(index)
 
 
+# engines by the algorithm names used in requests
+ALGORITHMS = {
+    "brute_force": BruteForceSearch,
+    "bfs": BreadthFirstSearch,
+    "distance_transform": DistanceTransformSearch,
+    "sparse": SparseSearch,
+    "dijkstra": DijkstraSearch,
+    "bitmask": BitmaskSearch,
+    "native": NativeSearch,
+}
@@ -0,0 +1,67 @@
+"""
+Flat-index adjacency for grids.
+
+Cells are addressed by their flat (row-major) index. Interior cells (not in the first/last row or column) all find
+their neighbors at the same offsets from their own index, so only the offsets are stored. Bounds checks and
+wrapping are only needed at the border, so they're applied once when the table is built and the border cells' neighbors
+are stored explicitly. Lookups never raise or check bounds, and a table is O(rows + cols) memory.
+
+Tables only depend on the shape, wrap settings, and directions, so they're cached and shared by every grid (and
+search) with the same combination.
+"""
+from functools import lru_cache
+from typing import Iterator, Sequence
+
+
+class NeighborTable:
+    def __init__(
+        self, num_rows: int, num_cols: int, wrap_rows: bool, wrap_cols: bool, directions: Sequence[tuple[int, int]]
+    ):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        # flat offsets of the neighbors of an interior cell, in the same order as the directions
+        self.offsets = tuple(dr * num_cols + dc for dr, dc in directions)
+        # neighbors of each border cell by its flat index, in the same order as the directions
+        self.border: dict[int, tuple[int, ...]] = {}
+        for row, col in self._border_cells():
+            neighbors = []
+            for dr, dc in directions:
+                new_row, new_col = row + dr, col + dc
+                if wrap_rows:
+                    new_row %= num_rows
+                elif new_row < 0 or new_row >= num_rows:
+                    continue
+                if wrap_cols:
+                    new_col %= num_cols
+                elif new_col < 0 or new_col >= num_cols:
+                    continue
+                neighbors.append(new_row * num_cols + new_col)
+            self.border[row * num_cols + col] = tuple(neighbors)
+
+    def __repr__(self) -> str:
+        return f"NeighborTable({self.num_rows}x{self.num_cols}, {len(self.offsets)} directions)"
+
+    def neighbors(self, index: int) -> tuple[int, ...]:
+        """Flat indices of the cell's immediate neighbors"""
+        border_neighbors = self.border.get(index)
+        if border_neighbors is not None:
+            return border_neighbors
+        return tuple(index + offset for offset in self.offsets)
+
+    def _border_cells(self) -> Iterator[tuple[int, int]]:
+        last_row, last_col = self.num_rows - 1, self.num_cols - 1
+        for row in range(self.num_rows):
+            if row == 0 or row == last_row:
+                yield from ((row, col) for col in range(self.num_cols))
+            else:
+                yield row, 0
+                if last_col > 0:
+                    yield row, last_col
+
+
+@lru_cache(maxsize=64)
+def get_neighbor_table(
+    num_rows: int, num_cols: int, wrap_rows: bool, wrap_cols: bool, directions: tuple[tuple[int, int], ...]
+) -> NeighborTable:
+    """Cached table for the combination. Directions must be a tuple so they can be part of the key."""
+    return NeighborTable(num_rows, num_cols, wrap_rows, wrap_cols, directions)
@@ -0,0 +1,114 @@
+"""
+Pick a search engine from cheap statistics about the grid.
+
+Each candidate engine has a cost model in (approximate) seconds built from the grid's area, number of positive
+cells, the size of the footprint around each positive cell, and the expected number of neighbors. The per-unit
+costs were calibrated from `python benchmarks/run.py` results and only need to be right relative to each other.
+Re-calibrate them when an engine's performance changes.
+"""
+import importlib.util
+
+from .Grid import Grid
+from .native_kernel import has_numba
+
+# seconds per unit of work
+COSTS = {
+    # finding the flat indices of the positive cells in nested sequences
+    "list_scan_per_cell": 3e-8,
+    # finding the flat indices of the positive cells in an array (vectorized)
+    "array_scan_per_cell": 5e-9,
+    "array_scan_per_positive": 5e-8,
+    # BFS visits every neighbor and checks each of their neighbors
+    "bfs_per_edge": 3e-7,
+    # sparse search stamps the footprint onto every positive cell
+    "sparse_per_stamp": 7e-7,
+    # distance transform has a fixed overhead of array operations, plus a pass per row for Chebyshev distance
+    "distance_transform_fixed": 1e-3,
+    "distance_transform_per_cell": 4e-8,
+    "distance_transform_per_row": 1e-5,
+    # compiled BFS allocates and scans flat buffers for every cell, then checks each neighbor's neighbors. estimated
+    # relative to the distance transform, re-calibrate with benchmarks on a machine with Numba
+    "native_fixed": 2e-4,
+    "native_per_cell": 1e-8,
+    "native_per_edge": 5e-9,
+    # converting nested sequences to an array
+    "list_to_array_per_cell": 6e-8,
+}
+
+
+def has_numpy() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def footprint_size(grid: Grid, max_distance: int) -> int:
+    """Number of cells within the max distance of a single cell, limited to the size of the grid"""
+    num_rows, num_cols = grid.shape
+    # distance along each dimension can't be more than the dimension allows
+    row_reach = min(max_distance, num_rows // 2 if grid.wrap_rows else num_rows - 1)
+    col_reach = min(max_distance, num_cols // 2 if grid.wrap_cols else num_cols - 1)
+    if grid.distance_type == "chebyshev":
+        size = (2 * row_reach + 1) * (2 * col_reach + 1)
+    else:
+        # diamond, clipped by the reach in each dimension
+        size = sum(
+            2 * min(col_reach, max_distance - abs(dr)) + 1
+            for dr in range(-row_reach, row_reach + 1)
+        )
+    return min(size, grid.num_cells)
+
+
+def grid_stats(grid: Grid, max_distance: int) -> dict:
+    num_positive = grid.num_positive
+    footprint = footprint_size(grid, max_distance)
+    return {
+        "num_rows": grid.num_rows,
+        "num_cols": grid.num_cols,
+        "num_cells": grid.num_cells,
+        "num_positive": num_positive,
+        "footprint": footprint,
+        # upper bound, because footprints can overlap
+        "expected_neighbors": min(grid.num_cells, num_positive * footprint),
+        "has_costs": grid.costs is not None,
+    }
+
+
+def estimate_costs(grid: Grid, max_distance: int, stats: dict = None) -> dict[str, float]:
+    """Estimated seconds for each engine that can search the grid"""
+    stats = stats or grid_stats(grid, max_distance)
+    if grid.array_backed:
+        scan = COSTS["array_scan_per_cell"] * stats["num_cells"] + \
+            COSTS["array_scan_per_positive"] * stats["num_positive"]
+    else:
+        scan = COSTS["list_scan_per_cell"] * stats["num_cells"]
+    num_directions = 8 if grid.distance_type == "chebyshev" else 4
+
+    estimates = {
+        "bfs": scan + COSTS["bfs_per_edge"] * num_directions * stats["expected_neighbors"],
+        "sparse": scan + COSTS["sparse_per_stamp"] * stats["num_positive"] * stats["footprint"],
+    }
+    if has_numpy():
+        row_passes = stats["num_rows"] if grid.distance_type == "chebyshev" else 0
+        per_cell = COSTS["distance_transform_per_cell"]
+        if not grid.array_backed:
+            per_cell += COSTS["list_to_array_per_cell"]
+        estimates["distance_transform"] = COSTS["distance_transform_fixed"] + per_cell * stats["num_cells"] + \
+            COSTS["distance_transform_per_row"] * row_passes
+        if has_numba():
+            per_cell = COSTS["native_per_cell"]
+            if not grid.array_backed:
+                per_cell += COSTS["list_to_array_per_cell"]
+            estimates["native"] = COSTS["native_fixed"] + per_cell * stats["num_cells"] + \
+                COSTS["native_per_edge"] * num_directions * stats["expected_neighbors"]
+    return estimates
+
+
+def choose_algorithm(grid: Grid, max_distance: int) -> str:
+    """
+    Name of the engine (as used by the `/calculate` endpoint) with the lowest estimated cost.
+
+    Grids with traversal costs always need Dijkstra because it's the only weighted search.
+    """
+    if grid.costs is not None:
+        return "dijkstra"
+    estimates = estimate_costs(grid, max_distance)
+    return min(estimates, key=estimates.get)
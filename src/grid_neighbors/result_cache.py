@@ -0,0 +1,202 @@
+import hashlib
+import json
+import mimetypes
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .Grid import Grid
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Digest of the parts, for use as a cache key.
+
+    Bytes are hashed as-is (e.g. a raw request body), grids are hashed by their shape, settings, and values, and
+    anything else is hashed by its JSON encoding.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            digest.update(part)
+        elif isinstance(part, Grid):
+            digest.update(part.digest().encode())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, separators=(",", ":")).encode())
+        # keep boundaries between parts so they can't run together
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class CacheStore(ABC):
+    """
+    Backing store for cached results that can outlive the in-memory cache (e.g. across worker restarts).
+
+    The content type (e.g. `application/json`) is passed along with the key, for stores that keep it.
+    """
+    @abstractmethod
+    def get(self, key: str, content_type: Optional[str] = None) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, content_type: Optional[str] = None) -> None:
+        pass
+
+
+class FileStore(CacheStore):
+    """
+    Store each cached result as a file in a local directory, with an extension for its content type.
+
+    The directory is bounded by the total size of the files. When a write takes it over `max_bytes`, the least
+    recently used files (by modification time, which reads refresh) are deleted until it's under 90% of that. The
+    size is tracked from this process's writes and the directory is only scanned when it's over the limit, so when
+    several processes share the directory, it can go over the limit by what the others wrote since the last scan.
+    """
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._num_bytes = sum(size for _, size, _ in self._scan())
+
+    def get(self, key: str, content_type: Optional[str] = None) -> Optional[bytes]:
+        path = self._path(key, content_type)
+        try:
+            with open(path, "rb") as f:
+                value = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # deleted by another process in the meantime
+            pass
+        return value
+
+    def set(self, key: str, value: bytes, content_type: Optional[str] = None) -> None:
+        # write to a temporary file first so other workers never read a partial result
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            os.replace(tmp_path, self._path(key, content_type))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._num_bytes += len(value)
+            if self._num_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete the least recently used files until the directory is under 90% of the max bytes"""
+        entries = sorted(self._scan())
+        num_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if num_bytes <= self.max_bytes * 0.9:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            num_bytes -= size
+        self._num_bytes = num_bytes
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        """Modification time, size, and path of each stored result"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tmp") or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _path(self, key: str, content_type: Optional[str]) -> str:
+        extension = (mimetypes.guess_extension(content_type) if content_type else None) or ".bin"
+        return os.path.join(self.directory, f"{key}{extension}")
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of serialized results.
+
+    Bounded by the number of entries and the approximate number of bytes (keys and values). Results that are evicted
+    from memory can still be found in the optional backing store, which is written through on every `set` and has
+    its own bound (e.g. `FileStore.max_bytes`).
+    """
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024, store: Optional[CacheStore] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._num_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def num_bytes(self) -> int:
+        return self._num_bytes
+
+    def get(self, key: str, content_type: Optional[str] = None) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        value = self.store.get(key, content_type) if self.store else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._insert(key, value)
+        return value
+
+    def set(self, key: str, value: bytes, content_type: Optional[str] = None) -> None:
+        with self._lock:
+            self._insert(key, value)
+        if self.store:
+            self.store.set(key, value, content_type)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._num_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _insert(self, key: str, value: bytes) -> None:
+        """Add or replace an entry, then evict the least recently used ones until it's within bounds"""
+        old_value = self._entries.pop(key, None)
+        if old_value is not None:
+            self._num_bytes -= len(key) + len(old_value)
+        size = len(key) + len(value)
+        if size > self.max_bytes or self.max_entries <= 0:
+            # would evict everything else and still not fit
+            return
+        self._entries[key] = value
+        self._num_bytes += size
+        while len(self._entries) > self.max_entries or self._num_bytes > self.max_bytes:
+            old_key, old_value = self._entries.popitem(last=False)
+            self._num_bytes -= len(old_key) + len(old_value)
+            self.evictions += 1
@@ -0,0 +1,202 @@
+import os
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Type
+
+from .Grid import Grid, Matrix
+from .Neighborhood import Neighborhood
+from . import binary_format
+from .neighbor_searches import BreadthFirstSearch, DistanceTransformSearch, SearchBase
+from ._optional import import_numpy
+
+
+class TiledSearch(SearchBase):
+    """
+    Run another search engine on horizontal bands of the grid in parallel.
+
+    The grid is split into bands of rows and each band is searched in a worker process, along with a halo of extra
+    rows above and below it. A cell's closest positive cell is never more than the max distance rows away, so with
+    a halo of that many rows every band's own rows get the same distances as searching the whole grid. When rows
+    wrap, the halo of the first/last band comes from the opposite edge of the grid. The workers read the matrix from
+    shared memory, so it's only copied once no matter how many bands there are.
+
+    Requires NumPy. Grids with traversal costs aren't supported because a weighted path can leave the halo.
+    """
+    def __init__(
+        self,
+        data: Matrix | Grid,
+        max_distance: int,
+        wrap_rows=False,
+        wrap_cols=False,
+        engine: Type[SearchBase] = BreadthFirstSearch,
+        max_workers: Optional[int] = None,
+        band_rows: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            engine: Search engine used for each band
+            max_workers: Number of worker processes (and bands, unless `band_rows` is specified). Defaults to the
+                number of CPUs.
+            band_rows: Number of rows in each band, not including the halo
+            executor: Existing pool to run the bands in. By default, a new process pool is created for each search.
+        """
+        super().__init__(data, max_distance, wrap_rows, wrap_cols)
+        if self.grid.costs is not None:
+            raise ValueError("Tiled search doesn't support grids with traversal costs")
+        self.engine = engine
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.band_rows = band_rows
+        self.executor = executor
+
+    @property
+    def halo_rows(self) -> int:
+        return halo_rows(self.grid, self.max_distance)
+
+    def bands(self) -> list[tuple[int, int]]:
+        """Start (inclusive) and end (exclusive) row of each band"""
+        return split_rows(self.grid.num_rows, self.band_rows or -(-self.grid.num_rows // self.max_workers))
+
+    def find_neighbors(self) -> Neighborhood:
+        bands = self.bands()
+        if len(bands) == 1:
+            return self.engine(self.grid, self.max_distance, self.grid.wrap_rows, self.grid.wrap_cols).find_neighbors()
+
+        np = import_numpy()
+        values = np.ascontiguousarray(self.grid.to_numpy())
+        shm = SharedMemory(create=True, size=values.nbytes)
+        try:
+            np.ndarray(values.shape, values.dtype, buffer=shm.buf)[:] = values
+            band_args = [
+                (
+                    shm.name, values.shape, values.dtype.str, start, end, self.halo_rows, self.engine,
+                    self.max_distance, self.grid.wrap_rows, self.grid.wrap_cols, self.grid.distance_type,
+                )
+                for start, end in bands
+            ]
+            executor = self.executor or ProcessPoolExecutor(min(self.max_workers, len(bands)))
+            try:
+                band_results = list(executor.map(_search_band, *zip(*band_args)))
+            finally:
+                if executor is not self.executor:
+                    executor.shutdown()
+        finally:
+            shm.close()
+            shm.unlink()
+
+        # bands are in row order, so stitching is just concatenation
+        neighborhood = Neighborhood()
+        for rows, cols, distances in band_results:
+            neighborhood.rows.extend(rows)
+            neighborhood.cols.extend(cols)
+            neighborhood.distances.extend(distances)
+        return neighborhood
+
+
+def halo_rows(grid: Grid, max_distance: int) -> int:
+    """Rows above and below a band that can contain a positive cell within the max distance of the band"""
+    num_rows = grid.num_rows
+    # wrapped rows are never more than half the grid away
+    return min(max_distance, num_rows // 2 if grid.wrap_rows else num_rows - 1)
+
+
+def split_rows(num_rows: int, band_rows: int) -> list[tuple[int, int]]:
+    """Start (inclusive) and end (exclusive) row of each band"""
+    return [(start, min(start + band_rows, num_rows)) for start in range(0, num_rows, band_rows)]
+
+
+def band_view(values, start: int, end: int, halo: int, wrap_rows: bool):
+    """
+    Rows of the band plus the halo above and below it, and the grid row of its first row (negative when wrapped).
+
+    Without wrapping the band is a view, so only the rows that are used get read (e.g. from a memory-mapped file).
+    """
+    np = import_numpy()
+    if wrap_rows:
+        # halo rows at the seams come from the opposite edge. this copies the band, but only the band
+        band_start = start - halo
+        return band_start, np.take(values, range(band_start, end + halo), axis=0, mode="wrap")
+    band_start = max(0, start - halo)
+    return band_start, values[band_start:min(values.shape[0], end + halo)]
+
+
+def search_to_file(
+    grid: Grid,
+    max_distance: int,
+    path: str,
+    band_rows: int = 1024,
+    engine: Type[SearchBase] = DistanceTransformSearch,
+):
+    """
+    Out-of-core search: write the grid's distance raster to a file one band of rows at a time.
+
+    The grid is usually memory-mapped (see `Grid.from_file`), so only a band plus its halo is read into memory at once
+    and peak memory depends on `band_rows` and the number of columns instead of the size of the grid. The raster is
+    int32 with -1 for cells beyond the max distance, in the binary format (see `binary_format`), and is returned as
+    a read-only memory map. Requires NumPy. Grids with traversal costs aren't supported.
+
+    Args:
+        band_rows: Number of rows searched at once, not including the halo
+        engine: Search engine used for each band
+    """
+    np = import_numpy()
+    if grid.costs is not None:
+        raise ValueError("Out-of-core search doesn't support grids with traversal costs")
+    if band_rows < 1:
+        raise ValueError(f"Band rows must be positive. Received {band_rows}")
+    values = grid.to_numpy()
+    halo = halo_rows(grid, max_distance)
+    output = binary_format.create_file(
+        path, grid.shape, np.int32, grid.wrap_rows, grid.wrap_cols, grid.distance_type
+    )
+    try:
+        for start, end in split_rows(grid.num_rows, band_rows):
+            band_start, band_values = band_view(values, start, end, halo, grid.wrap_rows)
+            band_grid = Grid.from_array(band_values, wrap_cols=grid.wrap_cols, distance_type=grid.distance_type)
+            search = engine(band_grid, max_distance, False, grid.wrap_cols)
+            if isinstance(search, DistanceTransformSearch):
+                raster = search.distance_field()
+            else:
+                raster = search.find_neighbors().to_raster(band_grid.shape)
+            output[start:end] = raster[start - band_start:end - band_start]
+        output.flush()
+    finally:
+        del output
+    return binary_format.open_file(path)[0]
+
+
+def _search_band(
+    shm_name: str,
+    shape: tuple[int, int],
+    dtype: str,
+    start: int,
+    end: int,
+    halo: int,
+    engine: Type[SearchBase],
+    max_distance: int,
+    wrap_rows: bool,
+    wrap_cols: bool,
+    distance_type: str,
+) -> tuple[array, array, array]:
+    """Search a band of rows (plus halo) from shared memory and return the neighbors in the band's own rows"""
+    np = import_numpy()
+    shm = SharedMemory(name=shm_name)
+    try:
+        values = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+        band_start, band_values = band_view(values, start, end, halo, wrap_rows)
+        band_grid = Grid.from_array(band_values, wrap_cols=wrap_cols, distance_type=distance_type)
+        band_neighbors = engine(band_grid, max_distance, False, wrap_cols).find_neighbors()
+        # release the views of the shared memory before it's closed
+        del values, band_values, band_grid
+
+        rows, cols, distances = array("i"), array("i"), array(band_neighbors.distances.typecode)
+        for row, col, dist in band_neighbors.items():
+            row += band_start
+            if start <= row < end:
+                rows.append(row)
+                cols.append(col)
+                distances.append(dist)
+        return rows, cols, distances
+    finally:
+        shm.close()
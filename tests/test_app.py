@@ -0,0 +1,255 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("flask")
+
+import app as server
+
+
+@pytest.fixture
+def client():
+    server.result_cache.clear()
+    return server.app.test_client()
+
+
+class TestApp:
+    def test_calculate(self, client):
+        response = client.post("/calculate", json={"grid": [[0, 1], [0, 0]], "distance": 1, "algorithm": "bfs"})
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result["count"] == 3
+        assert result["positive_cells"] == [{"row": 0, "col": 1}]
+
+        for algorithm in ["bitmask", "native"]:
+            response = client.post("/calculate", json={"grid": [[0, 1], [0, 0]], "distance": 1, "algorithm": algorithm})
+            assert response.get_json()["count"] == 3
+        assert client.post("/calculate", json={"grid": [[0, 1]], "distance": 1, "algorithm": "x"}).status_code == 400
+
+    def test_off_nominal(self, client):
+        assert client.post("/calculate", json={"grid": [[0, 1]]}).status_code == 400
+        assert client.post("/calculate", json={"grid": [[0, 1]], "distance": -1}).status_code == 400
+        response = client.post("/calculate", json={"grid": [[0, "x"]], "distance": 1})
+        assert response.status_code == 400
+        assert "Invalid cell found" in response.get_json()["error"]
+
+    def test_result_cache(self, client):
+        payload = {"grid": [[0, 1], [0, 0]], "distance": 1, "algorithm": "bfs"}
+        first = client.post("/calculate", json=payload)
+        assert first.headers["X-Cache"] == "MISS"
+        second = client.post("/calculate", json=payload)
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.get_data() == first.get_data()
+        assert client.post("/calculate", json={**payload, "distance": 0}).headers["X-Cache"] == "MISS"
+        # errors aren't cached
+        client.post("/calculate", json={"grid": [[0, 1]]})
+        assert client.post("/calculate", json={"grid": [[0, 1]]}).status_code == 400
+        stats = client.get("/cache").get_json()
+        assert stats["hits"] == 1
+        assert stats["entries"] == 2
+
+    def test_auto(self, client):
+        response = client.post("/calculate", json={"grid": [[0, 1], [0, 0]], "distance": 1})
+        result = response.get_json()
+        assert result["count"] == 3
+        assert result["algorithm_used"] in {"bfs", "sparse", "distance_transform"}
+        response = client.post("/calculate", json={"grid": [[0, 1]], "distance": 1, "costs": [[2, 1]]})
+        assert response.get_json()["algorithm_used"] == "dijkstra"
+        response = client.post("/calculate", json={"grid": [[1, 0, 0]], "distance": 1, "costs": [[1, 0, 5]]})
+        assert response.status_code == 400
+
+    def test_costs(self, client):
+        # only dijkstra uses the costs, so other algorithms would silently give a different answer
+        payload = {"grid": [[1, 0, 0]], "distance": 2, "costs": [[1, 5, 1]]}
+        assert client.post("/calculate", json={**payload, "algorithm": "dijkstra"}).get_json()["count"] == 1
+        response = client.post("/calculate", json={**payload, "algorithm": "bfs"})
+        assert response.status_code == 400
+        assert "Costs are only supported" in response.get_json()["error"]
+        # native raises for weighted grids, which is a bad request rather than a server error
+        response = client.post("/calculate", json={**payload, "algorithm": "native"})
+        assert response.status_code == 400
+        assert "Costs are only supported" in response.get_json()["error"]
+
+    def test_batch(self, client):
+        jobs = [
+            {"grid": [[0, 1], [0, 0]], "distance": 1},
+            {"grid": [[0, 1], [0]], "distance": 1},
+            {"grid": [[0, 1], [0, 0]], "distances": [0, 1]},
+        ]
+        response = client.post("/calculate/batch", json={"jobs": jobs})
+        assert response.status_code == 200
+        results = response.get_json()["results"]
+        assert results[0]["count"] == 3
+        assert "Invalid grid shape" in results[1]["error"]
+        assert [r["count"] for r in results[2]["results"]] == [1, 3]
+        assert client.post("/calculate/batch", json={"jobs": "nope"}).status_code == 400
+
+    def test_batch_limits(self, client, monkeypatch):
+        jobs = [{"grid": [[0, 1]], "distance": 1}, {"grid": [[0, 1], [0, 0]], "distance": 1}]
+        monkeypatch.setattr(server, "MAX_GRID_CELLS", 3)
+        response = client.post("/calculate/batch", json={"jobs": jobs})
+        assert response.status_code == 413
+        assert "at most 3 cells" in response.get_json()["error"]
+        monkeypatch.setattr(server, "MAX_GRID_CELLS", 4)
+
+        pending = threading.BoundedSemaphore(1)
+        monkeypatch.setattr(server, "_pending_searches", pending)
+        pending.acquire()
+        response = client.post("/calculate/batch", json={"jobs": jobs})
+        assert response.status_code == 503
+        assert "Too many searches" in response.get_json()["error"]
+        pending.release()
+
+        executor = ThreadPoolExecutor(1)
+        monkeypatch.setattr(server, "get_search_executor", lambda: executor)
+        monkeypatch.setattr(server, "SEARCH_TIMEOUT", 0.01)
+        monkeypatch.setitem(server.run_batch.__globals__, "search_field", lambda *args: time.sleep(0.5))
+        response = client.post("/calculate/batch", json={"jobs": jobs[:1]})
+        assert response.status_code == 503
+        assert "longer than 0.01 seconds" in response.get_json()["error"]
+        executor.shutdown()
+
+    def test_stream(self, client):
+        payload = {"grid": [[0, 1], [0, 0], [1, 0]], "distance": 1, "algorithm": "bfs", "rows_per_chunk": 2}
+        expected = client.post("/calculate", json=payload).get_json()
+        response = client.post("/calculate", json={**payload, "stream": True})
+        assert response.mimetype == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert len(lines) == 3
+        summary = lines[-1]
+        assert summary["count"] == expected["count"]
+        assert summary["grid_size"] == "3x2"
+        assert summary["algorithm_used"] == "bfs"
+        neighbors = [n for line in lines[:-1] for n in line["neighbors"]]
+        assert neighbors == sorted(expected["neighbors"], key=lambda n: (n["row"], n["col"]))
+        # the Accept header also streams, and isn't answered from the JSON response's cache entry
+        response = client.post("/calculate", json=payload, headers={"Accept": "application/x-ndjson"})
+        assert response.mimetype == "application/x-ndjson"
+        assert client.post("/calculate", json={**payload, "stream": True, "rows_per_chunk": 0}).status_code == 400
+
+    def test_binary(self, client):
+        np = pytest.importorskip("numpy")
+        from grid_neighbors.binary_format import MIMETYPE, decode, encode
+
+        headers = {"Content-Type": MIMETYPE, "Accept": MIMETYPE}
+        body = encode(np.array([[0, 1], [0, 0]], dtype=np.uint8))
+        response = client.post("/calculate?distance=1&algorithm=bfs", data=body, headers=headers)
+        assert response.status_code == 200
+        assert response.mimetype == MIMETYPE
+        raster, _ = decode(response.get_data())
+        assert raster.tolist() == [[1, 0], [-1, 1]]
+        # a cached result has the same body and headers
+        cached = client.post("/calculate?distance=1&algorithm=bfs", data=body, headers=headers)
+        assert cached.headers["X-Cache"] == "HIT"
+        assert cached.headers["X-Algorithm-Used"] == response.headers["X-Algorithm-Used"] == "bfs"
+        assert cached.get_data() == response.get_data()
+        # binary grid, JSON result
+        response = client.post("/calculate?distance=1", data=body, headers={"Content-Type": MIMETYPE})
+        assert response.get_json()["count"] == 3
+        # JSON grid, binary result
+        payload = {"grid": [[0, 1], [0, 0]], "distance": 1}
+        response = client.post("/calculate", json=payload, headers={"Accept": MIMETYPE})
+        assert decode(response.get_data())[0].tolist() == [[1, 0], [-1, 1]]
+        assert client.post("/calculate?distance=1", data=body[:-1], headers=headers).status_code == 400
+
+    def test_limits(self, client, monkeypatch):
+        payload = {"grid": [[0, 1], [0, 0]], "distance": 1}
+        monkeypatch.setattr(server, "MAX_GRID_CELLS", 3)
+        response = client.post("/calculate", json=payload)
+        assert response.status_code == 413
+        assert "at most 3 cells" in response.get_json()["error"]
+        monkeypatch.setitem(server.app.config, "MAX_CONTENT_LENGTH", 10)
+        assert client.post("/calculate", json=payload).status_code == 413
+
+    def test_busy(self, client, monkeypatch):
+        payload = {"grid": [[0, 1], [0, 0]], "distance": 1}
+        pending = threading.BoundedSemaphore(1)
+        monkeypatch.setattr(server, "_pending_searches", pending)
+        pending.acquire()
+        response = client.post("/calculate", json=payload)
+        assert response.status_code == 503
+        assert "Too many searches" in response.get_json()["error"]
+        pending.release()
+
+        executor = ThreadPoolExecutor(1)
+        monkeypatch.setattr(server, "get_search_executor", lambda: executor)
+        monkeypatch.setattr(server, "SEARCH_TIMEOUT", 0.01)
+        monkeypatch.setattr(server, "calculate_neighbors", lambda *args: time.sleep(0.5))
+        response = client.post("/calculate", json=payload)
+        assert response.status_code == 503
+        assert "longer than 0.01 seconds" in response.get_json()["error"]
+        # still answers while the search is running
+        assert client.get("/health").status_code == 200
+        executor.shutdown()
+
+    def test_broken_pool(self, monkeypatch):
+        # a worker that dies (e.g. killed for running out of memory) breaks the pool
+        monkeypatch.setenv("SEARCH_WORKERS", "1")
+        monkeypatch.setattr(server, "_search_executor", None)
+        pool = server.get_search_executor()
+        with pytest.raises(server.ServiceUnavailable, match="stopped unexpectedly"):
+            server.run_search(os._exit, 1)
+        # the next search gets a new pool. it's discarded by a callback, which can run just after the waiter wakes up
+        deadline = time.monotonic() + 5
+        while server._search_executor is pool and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert server.get_search_executor() is not pool
+        assert server.run_search(abs, -1) == 1
+        # a pool that broke before the search was submitted is replaced too
+        pool = server.get_search_executor()
+        with pytest.raises(server.ServiceUnavailable):
+            server.run_search(os._exit, 1)
+        while server._search_executor is pool and time.monotonic() < deadline:
+            time.sleep(0.01)
+        monkeypatch.setattr(server, "_search_executor", pool)
+        with pytest.raises(server.ServiceUnavailable, match="restarting"):
+            server.run_search(abs, -1)
+        assert server.get_search_executor() is not pool
+        server.get_search_executor().shutdown()
+
+    def test_worker_grid(self, monkeypatch):
+        grid = server.Grid([[0, 1], [0, 0]], wrap_cols=True, distance_type="chebyshev", costs=[[1, 2], [1, 1]])
+        monkeypatch.setattr(server, "get_search_executor", lambda: None)
+        assert server.worker_grid(grid) is grid
+
+        monkeypatch.setattr(server, "get_search_executor", lambda: executor)
+        executor = ThreadPoolExecutor(1)
+        copy = server.worker_grid(grid)
+        executor.shutdown()
+        assert copy.array_backed and copy.costs.array_backed
+        assert (copy.wrap_rows, copy.wrap_cols, copy.distance_type) == (False, True, "chebyshev")
+        assert copy.flat_values() == grid.flat_values()
+        assert copy.costs.flat_values() == grid.costs.flat_values()
+        assert server.worker_grid(copy) is copy
+
+    def test_metrics(self, client, monkeypatch):
+        monkeypatch.setattr(server, "metrics", server.Metrics())
+        payload = {"grid": [[0, 1], [0, 0]], "distance": 1, "algorithm": "bfs", "timings": True}
+        response = client.post("/calculate", json=payload)
+        result = response.get_json()
+        assert {"parse", "grid", "search", "create_result"} <= set(result["timings"])
+        assert result["stats"]["cells_visited"] == 3
+        assert "serialize;dur=" in response.headers["Server-Timing"]
+        # not cached, since the timings would be stale
+        assert client.post("/calculate", json=payload).headers["X-Cache"] == "MISS"
+        assert "timings" not in client.post("/calculate", json={**payload, "timings": False}).get_json()
+
+        text = client.get("/metrics").get_data(as_text=True)
+        assert 'grid_neighbors_requests{endpoint="calculate_endpoint",status="200"} 3' in text
+        assert 'grid_neighbors_step_seconds_count{algorithm="bfs",step="search"} 3' in text
+        assert 'grid_neighbors_cells_visited_sum{algorithm="bfs"} 9' in text
+        assert 'grid_neighbors_result_size_sum{algorithm="bfs"} 9' in text
+
+        # streamed and binary results have the engine stats too
+        client.post("/calculate", json={**payload, "algorithm": "sparse", "stream": True}).get_data()
+        text = client.get("/metrics").get_data(as_text=True)
+        assert 'grid_neighbors_cells_visited_sum{algorithm="sparse"} 5' in text
+        pytest.importorskip("numpy")
+        headers = {"Accept": server.binary_format.MIMETYPE}
+        client.post("/calculate", json={**payload, "algorithm": "dijkstra"}, headers=headers)
+        text = client.get("/metrics").get_data(as_text=True)
+        assert 'grid_neighbors_queue_peak_count{algorithm="dijkstra"} 1' in text
@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from grid_neighbors.batch import parse_job, run_batch
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, SearchBase
+
+import pytest
+
+
+class TestBatch:
+    GRID = [
+        [0, 0, 0, 0, 0],
+        [0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0],
+    ]
+
+    def test_parse_job(self):
+        grid, distances, algorithm = parse_job({"grid": self.GRID, "distance": 3, "wrap_rows": True})
+        assert grid.wrap_rows
+        assert distances == [3]
+        assert algorithm == "auto"
+        with pytest.raises(ValueError, match="Distance parameter is required"):
+            parse_job({"grid": self.GRID})
+        with pytest.raises(ValueError, match="non-negative integer"):
+            parse_job({"grid": self.GRID, "distances": [1, -1]})
+        with pytest.raises(ValueError, match="Algorithm must be one of"):
+            parse_job({"grid": self.GRID, "distance": 1, "algorithm": "magic"})
+        with pytest.raises(ValueError, match="Costs are only supported"):
+            parse_job({"grid": [[1, 0]], "distance": 1, "algorithm": "native", "costs": [[1, 2]]})
+        with pytest.raises(RuntimeError, match="Invalid grid shape"):
+            parse_job({"grid": [[0], [0, 1]], "distance": 1})
+
+    def test_run_batch(self):
+        jobs = [
+            {"grid": self.GRID, "distance": 3, "algorithm": "bfs"},
+            {"grid": self.GRID, "distances": [0, 1, 3], "algorithm": "bfs"},
+            {"grid": [[0], [0, 1]], "distance": 1},
+            {"grid": self.GRID, "distance": 1, "wrap_cols": True},
+            "not a job",
+        ]
+        results = run_batch(jobs)
+        assert len(results) == len(jobs)
+        assert results[0]["count"] == 24
+        assert results[0]["distance_threshold"] == 3
+        assert [r["count"] for r in results[1]["results"]] == [2, 10, 24]
+        assert "Invalid grid shape" in results[2]["error"]
+        assert results[3]["count"] == 10
+        assert results[3]["wrap_cols"]
+        assert results[3]["algorithm_used"] != "auto"
+        assert "error" in results[4]
+
+        # every distance is answered from the same search
+        expected = SearchBase.create_result(BreadthFirstSearch(self.GRID, 1).find_neighbors())
+        assert results[1]["results"][1]["neighbors"] == expected["neighbors"]
+
+    def test_executor(self):
+        jobs = [{"grid": [[0, 1] * i], "distance": 1} for i in range(1, 6)]
+        with ThreadPoolExecutor(2) as executor:
+            results = run_batch(jobs, executor)
+        assert [r["count"] for r in results] == [2 * i for i in range(1, 6)]
+
+    def test_timeout(self, mocker):
+        mocker.patch("grid_neighbors.batch.search_field", side_effect=lambda *args: time.sleep(0.5))
+        with ThreadPoolExecutor(1) as executor:
+            with pytest.raises(FutureTimeoutError, match="longer than 0.01 seconds"):
+                run_batch([{"grid": [[0, 1]], "distance": 1}, {"grid": [[1]], "distance": 1}], executor, 0.01)
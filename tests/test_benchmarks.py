@@ -0,0 +1,26 @@
+import json
+
+from benchmarks import run
+
+
+class TestBenchmarks:
+    def test_run_and_compare(self, tmp_path, capsys):
+        output = tmp_path / "results.json"
+        args = [
+            "--sizes", "8", "--densities", "0.1", "--distances", "2", "--wraps", "none,both", "--repeat", "1",
+            "--engines", "brute_force,bfs,dijkstra,sparse,incremental", "--import-modules", "grid_neighbors",
+            "--output", str(output),
+        ]
+        assert run.main(args) == 0
+        report = json.loads(output.read_text())
+        results = report["results"]
+        # engines x distance types x wraps
+        assert len(results) == 5 * 2 * 2
+        assert all(r["seconds"] > 0 and r["peak_bytes"] > 0 for r in results)
+        # engines work on flat indices, so they don't create a GridCell per visited cell
+        assert all(r["cells_created"] == 0 for r in results)
+        assert [r["module"] for r in report["imports"]] == ["grid_neighbors"]
+        assert report["imports"][0]["seconds"] > 0
+
+        assert run.main(["compare", str(output), str(output)]) == 0
+        assert "REGRESSION" not in capsys.readouterr().out
@@ -58,3 +58,30 @@ class TestBFS:
             grid, n, exp = odd_shapes[i], dist[i], expected[i]
             result = BreadthFirstSearch(grid, n).find_neighbors()
             assert len(result) == exp, f"Failed on {grid=}, {n=}, {exp=}, {result=}"
+
+    def test_iter_neighbors(self, default):
+        search = BreadthFirstSearch(default, 3)
+        cells = search.iter_neighbors()
+        first = [next(cells) for _ in range(5)]
+        # level order: both sources, then cells 1 step away
+        assert [c.value for c in first] == [0, 0, 1, 1, 1]
+        cells.close()
+        assert search.stats["cells_visited"] < 24
+        assert BreadthFirstSearch(default, 3).count_neighbors() == 24
+        assert list(BreadthFirstSearch([[0, 0]], 3).iter_neighbors()) == []
+
+    def test_saturated(self, default):
+        # every cell is positive: the first level covers the grid, so nothing is expanded
+        search = BreadthFirstSearch([[1] * 4] * 3, 5)
+        assert len(search.find_neighbors()) == 12
+        assert search.stats == {"cells_visited": 12, "queue_peak": 12}
+
+        # the max distance is at least the diameter, so every cell is in range without searching
+        search = BreadthFirstSearch(default, default.diameter)
+        assert search.covers_grid()
+        assert search.count_neighbors() == default.num_cells
+        assert search.stats == {"cells_visited": 0}
+        assert len(search.find_neighbors()) == default.num_cells
+        assert not BreadthFirstSearch(default, default.diameter - 1).covers_grid()
+        assert not BreadthFirstSearch([[0, 0]], 5).covers_grid()
+        assert BreadthFirstSearch([[0, 0]], 5).count_neighbors() == 0
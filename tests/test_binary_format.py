@@ -0,0 +1,73 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grid_neighbors import Grid, Neighborhood
+from grid_neighbors.binary_format import (
+    HEADER, create_file, decode, decode_grid, encode, encode_grid, open_file
+)
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, DistanceTransformSearch
+
+
+class TestBinaryFormat:
+    def test_round_trip(self):
+        matrix = np.arange(6, dtype=">i2").reshape(2, 3)
+        message = encode(matrix, wrap_cols=True, distance_type="chebyshev")
+        assert len(message) == HEADER.size + 6 * 2
+        decoded, settings = decode(message)
+        assert decoded.dtype == np.dtype("<i2")
+        assert np.array_equal(decoded, matrix)
+        assert settings == {"wrap_rows": False, "wrap_cols": True, "distance_type": "chebyshev"}
+
+    def test_decode_grid(self, default):
+        grid = decode_grid(encode_grid(Grid(default.to_numpy().astype(np.uint8).tolist())))
+        assert grid.array_backed
+        assert grid.shape == default.shape
+        assert grid.positive_cells == default.positive_cells
+        assert len(BreadthFirstSearch(grid, 2).find_neighbors()) == len(BreadthFirstSearch(default, 2).find_neighbors())
+
+    def test_off_nominal(self):
+        message = encode(np.zeros((2, 2), dtype=np.int32))
+        with pytest.raises(ValueError, match="too short"):
+            decode(message[:4])
+        with pytest.raises(ValueError, match="unknown format"):
+            decode(b"XXXX" + message[4:])
+        with pytest.raises(ValueError, match="expected 2x2"):
+            decode(message[:-1])
+        with pytest.raises(ValueError, match="Unsupported dtype"):
+            encode(np.zeros((2, 2), dtype=np.complex64))
+        with pytest.raises(ValueError, match="2-D"):
+            encode(np.zeros(4))
+
+    def test_to_raster(self, default):
+        neighbors = BreadthFirstSearch(default, 2).find_neighbors()
+        raster = neighbors.to_raster(default.shape)
+        assert raster.dtype == np.int32
+        assert np.array_equal(raster, DistanceTransformSearch(default, 2).distance_field())
+        assert list(Neighborhood.from_distance_field(raster).items()) == sorted(neighbors.items())
+        assert (Neighborhood().to_raster((2, 2)) == -1).all()
+
+    def test_files(self, tmp_path, default):
+        path = tmp_path / "grid.gnb"
+        path.write_bytes(encode_grid(Grid.from_array(default.to_numpy(), wrap_rows=True, distance_type="chebyshev")))
+        grid = Grid.from_file(str(path))
+        assert grid.array_backed
+        assert isinstance(grid.to_numpy().base, np.memmap)
+        assert (grid.wrap_rows, grid.wrap_cols, grid.distance_type) == (True, False, "chebyshev")
+        assert grid.positive_cells == default.positive_cells
+        assert not Grid.from_file(str(path), wrap_rows=False).wrap_rows
+
+        npy_path = tmp_path / "grid.npy"
+        np.save(npy_path, default.to_numpy())
+        grid = Grid.from_file(str(npy_path), wrap_cols=True)
+        assert (grid.wrap_rows, grid.wrap_cols, grid.distance_type) == (False, True, "manhattan")
+        assert grid.positive_cells == default.positive_cells
+
+        output = create_file(str(tmp_path / "raster.gnb"), (2, 3), np.int32, wrap_cols=True)
+        output[1] = [1, 2, 3]
+        output.flush()
+        del output
+        raster, settings = open_file(str(tmp_path / "raster.gnb"))
+        assert raster.tolist() == [[0, 0, 0], [1, 2, 3]]
+        assert settings["wrap_cols"]
+        assert (tmp_path / "raster.gnb").stat().st_size == HEADER.size + 6 * 4
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from grid_neighbors import Grid
+from grid_neighbors.neighbor_searches import BitmaskSearch, BreadthFirstSearch
+
+from utils import assert_count
+
+
+class TestBitmask:
+    def test_default(self, default):
+        result = BitmaskSearch(default, 3).find_neighbors()
+        assert_count(result, default, 24, 3)
+
+        result = BitmaskSearch(default, 3, wrap_rows=True).find_neighbors()
+        assert_count(result, default, 24, 2, wrap_rows=True)
+        result = BitmaskSearch(default, 3, wrap_cols=True).find_neighbors()
+        assert_count(result, default, 25, 2, wrap_cols=True)
+        result = BitmaskSearch(default, 3, wrap_rows=True, wrap_cols=True).find_neighbors()
+        assert_count(result, default, 25, 2, wrap_rows=True, wrap_cols=True)
+
+        result = BitmaskSearch(default, 1).find_neighbors()
+        assert_count(result, default, 10, 1)
+
+    def test_edges(self, overlapping_edges):
+        assert BitmaskSearch(overlapping_edges, 2).count_neighbors() == 12
+        assert BitmaskSearch(overlapping_edges, 2, wrap_rows=True).count_neighbors() == 19
+        assert BitmaskSearch(overlapping_edges, 2, wrap_cols=True).count_neighbors() == 12
+        assert BitmaskSearch(overlapping_edges, 2, wrap_rows=True, wrap_cols=True).count_neighbors() == 19
+
+    def test_corners(self, corners):
+        assert BitmaskSearch(corners, 1).count_neighbors() == 12
+        assert BitmaskSearch(corners, 2, wrap_rows=True).count_neighbors() == 23
+        assert BitmaskSearch(corners, 2, wrap_cols=True).count_neighbors() == 22
+        assert BitmaskSearch(corners, 2, wrap_rows=True, wrap_cols=True).count_neighbors() == 23
+
+    def test_odd_shapes(self, odd_shapes):
+        for grid, n, exp in zip(odd_shapes, [2, 2, 4], [4, 3, 1]):
+            assert BitmaskSearch(grid, n).count_neighbors() == exp
+
+    def test_mask(self):
+        search = BitmaskSearch(Grid([[0, 0, 0], [0, 0, 1]]), 1, wrap_cols=True)
+        # bit row * 3 + col
+        assert search.mask() == 0b111_100
+        assert search.stats == {"cells_visited": 4, "dilations": 1}
+        assert BitmaskSearch([[0, 0]], 3).mask() == 0
+        assert list(BitmaskSearch([[0, 0]], 3).iter_neighbors()) == []
+
+    @pytest.mark.parametrize("distance_type", list(Grid.DISTANCE_TYPES))
+    def test_matches_bfs(self, distance_type):
+        rng = random.Random(21)
+        for _ in range(200):
+            num_rows, num_cols = rng.randint(1, 9), rng.randint(1, 9)
+            data = [[1 if rng.random() < 0.1 else 0 for _ in range(num_cols)] for _ in range(num_rows)]
+            max_distance = rng.randint(0, 8)
+            wrap_rows, wrap_cols = rng.random() < 0.5, rng.random() < 0.5
+            grid = Grid(data, distance_type=distance_type)
+            expected = BreadthFirstSearch(grid, max_distance, wrap_rows, wrap_cols).find_neighbors()
+            search = BitmaskSearch(grid, max_distance, wrap_rows, wrap_cols)
+            assert sorted(search.find_neighbors().items()) == sorted(expected.items()), data
+            assert search.count_neighbors() == len(expected)
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from grid_neighbors import Grid
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, DijkstraSearch
+
+from utils import assert_count
+
+
+class TestDijkstra:
+    def test_default(self, default):
+        result = DijkstraSearch(default, 3).find_neighbors()
+        assert_count(result, default, 24, 3)
+
+        result = DijkstraSearch(default, 3, wrap_rows=True).find_neighbors()
+        assert_count(result, default, 24, 3, wrap_rows=True)
+        result = DijkstraSearch(default, 3, wrap_cols=True).find_neighbors()
+        assert_count(result, default, 25, 3, wrap_cols=True)
+        result = DijkstraSearch(default, 3, wrap_rows=True, wrap_cols=True).find_neighbors()
+        assert_count(result, default, 25, 3, wrap_rows=True, wrap_cols=True)
+
+        result = DijkstraSearch(default, 1).find_neighbors()
+        assert_count(result, default, 10, 1)
+
+    def test_corners(self, corners):
+        result = DijkstraSearch(corners, 1).find_neighbors()
+        assert_count(result, corners, 12, 1)
+
+        result = DijkstraSearch(corners, 2, wrap_rows=True).find_neighbors()
+        assert_count(result, corners, 23, 2, wrap_rows=True)
+        result = DijkstraSearch(corners, 2, wrap_cols=True).find_neighbors()
+        assert_count(result, corners, 22, 2, wrap_cols=True)
+
+    @pytest.mark.parametrize("distance_type", list(Grid.DISTANCE_TYPES))
+    def test_unit_costs_match_bfs(self, distance_type):
+        rng = random.Random(4)
+        for _ in range(20):
+            num_rows, num_cols = rng.randint(1, 10), rng.randint(1, 10)
+            data = [[1 if rng.random() < 0.1 else 0 for _ in range(num_cols)] for _ in range(num_rows)]
+            max_distance = rng.randint(0, 6)
+            wrap_rows, wrap_cols = rng.random() < 0.5, rng.random() < 0.5
+            grid = Grid(data, distance_type=distance_type)
+            expected = BreadthFirstSearch(grid, max_distance, wrap_rows, wrap_cols).find_neighbors()
+            result = DijkstraSearch(grid, max_distance, wrap_rows, wrap_cols).find_neighbors()
+            assert {c.coords: c.value for c in result} == {c.coords: c.value for c in expected}, data
+
+    def test_weighted(self):
+        grid = Grid([
+            [1, 0, 0, 0],
+            [0, 0, 0, 0],
+        ], costs=[
+            [1, 5, 1, 1],
+            [1, 1, 1, 2.5],
+        ])
+        result = DijkstraSearch(grid, 4).find_neighbors()
+        # entering the expensive cell is out of range, but the cell behind it can be reached by going around
+        assert {c.coords: c.value for c in result} == {
+            (0, 0): 0, (1, 0): 1, (1, 1): 2, (1, 2): 3, (0, 2): 4,
+        }
+        # float costs give float distances, integer costs keep integer distances
+        assert result.distances.typecode == "d"
+        result = DijkstraSearch(Grid([[1, 0, 0]], costs=[[1, 2**31, 1]]), 2**40).find_neighbors()
+        assert [c.value for c in result] == [0, 2**31, 2**31 + 1]
+        assert all(isinstance(c.value, int) for c in result)
+        # costs can also be specified with the search
+        result = DijkstraSearch([[1, 0, 0, 0]], 3, wrap_cols=True, costs=[[1, 2, 2, 1]]).find_neighbors()
+        assert {c.coords: c.value for c in result} == {(0, 0): 0, (0, 1): 2, (0, 3): 1, (0, 2): 3}
+
+    def test_off_nominal(self, default):
+        with pytest.raises(RuntimeError, match=r"Invalid cost shape"):
+            DijkstraSearch(default, 1, costs=[[1, 1], [1, 1]])
+        with pytest.raises(RuntimeError, match=r"Invalid cost found"):
+            DijkstraSearch([[1, 0]], 1, costs=[[1, -1]])
+        # a free move would make the cell look like a positive one
+        with pytest.raises(RuntimeError, match=r"Costs must be positive"):
+            DijkstraSearch([[1, 0, 0]], 1, costs=[[1, 0, 5]])
+        assert len(DijkstraSearch([[0, 0]], 1).find_neighbors()) == 0
+
+    def test_iter_neighbors(self, default):
+        dists = [c.value for c in DijkstraSearch(default, 3).iter_neighbors()]
+        assert dists == sorted(dists)
+        assert DijkstraSearch(default, 3).count_neighbors() == 24
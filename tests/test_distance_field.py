@@ -0,0 +1,80 @@
+import pickle
+import random
+
+import pytest
+
+from grid_neighbors import DistanceField, Grid
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, DijkstraSearch, DistanceTransformSearch
+
+
+class TestDistanceField:
+    def test_default(self, default):
+        field = DistanceField(default, engine=BreadthFirstSearch)
+        assert field.count_within(0) == 2
+        assert field.count_within(1) == 10
+        assert field.count_within(3) == 24
+        assert field.count_within(-1) == 0
+        # the default max distance covers every reachable cell, so larger thresholds are the total
+        assert field.count_within(100) == len(field.cells_within(100)) == 25
+        assert DistanceField(Grid([[1, 0, 0]])).count_within(10) == 3
+        assert field.histogram() == [2, 8, 9, 5, 1]
+        assert field.coverage() == [2, 10, 19, 24, 25]
+        assert field.distance(1, 1) == 0
+        assert field.distance(4, 4) == 3
+
+        cells = field.cells_within(2)
+        assert len(cells) == 19
+        dists = [c.value for c in cells]
+        assert dists == sorted(dists)
+        expected = BreadthFirstSearch(default, 2).find_neighbors()
+        assert {c.coords: c.value for c in cells} == {c.coords: c.value for c in expected}
+
+    def test_max_distance(self, default):
+        field = DistanceField(default, 1, BreadthFirstSearch)
+        assert field.num_cells == 10
+        assert field.distance(4, 4) == DistanceField.UNREACHABLE
+        with pytest.raises(ValueError, match="at most 1"):
+            field.count_within(2)
+        assert DistanceField(Grid([[0, 0]]), engine=BreadthFirstSearch).coverage() == []
+
+    def test_engines(self):
+        pytest.importorskip("numpy")
+        rng = random.Random(17)
+        for distance_type in Grid.DISTANCE_TYPES:
+            data = [[1 if rng.random() < 0.05 else 0 for _ in range(15)] for _ in range(11)]
+            grid = Grid(data, wrap_cols=True, distance_type=distance_type)
+            bfs_field = DistanceField(grid, 6, BreadthFirstSearch)
+            dt_field = DistanceField(grid, 6, DistanceTransformSearch)
+            assert bfs_field.coverage() == dt_field.coverage()
+            for dist in range(7):
+                assert sorted(bfs_field.cells_within(dist).items()) == sorted(dt_field.cells_within(dist).items())
+
+    def test_weighted(self):
+        grid = Grid([[1, 0, 0, 0]], costs=[[1, 2.5, 1, 0.5]])
+        field = DistanceField(grid)
+        expected = DijkstraSearch(grid, 10).find_neighbors()
+        assert [c.value for c in field.cells_within(10)] == sorted(c.value for c in expected)
+        assert field.count_within(3) == 2
+        assert field.count_within(4) == 4
+        assert field.count_within(float("inf")) == 4
+        assert DistanceField(Grid([[1, 0, 0]], costs=[[1, 2, 3]])).count_within(float("inf")) == 3
+        with pytest.raises(ValueError, match="integer"):
+            field.histogram()
+
+    def test_large_costs(self):
+        # distances much larger than the grid aren't bucketed, so a large cost doesn't allocate a bucket per distance
+        field = DistanceField(Grid([[1, 0, 0]], costs=[[1, 10**9, 20]]), 10**10)
+        assert field.count_within(10**9 - 1) == 1
+        assert field.count_within(10**9 + 19) == 2
+        assert field.count_within(10**10) == 3
+        assert [c.value for c in field.cells_within(10**10)] == [0, 10**9, 10**9 + 20]
+        field = DistanceField(Grid([[1, 0, 0, 0]], costs=[[1, 1, 9, 1]]))
+        assert field.coverage() == [1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 3, 4]
+
+    def test_serialize(self, default):
+        field = DistanceField(default, 2, BreadthFirstSearch)
+        restored = DistanceField.from_bytes(field.to_bytes())
+        assert restored.coverage() == field.coverage()
+        assert list(restored.cells_within(2).items()) == list(field.cells_within(2).items())
+        with pytest.raises(TypeError):
+            DistanceField.from_bytes(pickle.dumps(1))
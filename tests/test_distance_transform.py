@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from grid_neighbors import Grid
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, DistanceTransformSearch
+
+from utils import assert_count
+
+pytest.importorskip("numpy")
+
+
+class TestDistanceTransform:
+    def test_default(self, default):
+        result = DistanceTransformSearch(default, 3).find_neighbors()
+        assert_count(result, default, 24, 3)
+
+        result = DistanceTransformSearch(default, 3, wrap_rows=True).find_neighbors()
+        assert_count(result, default, 24, 3, wrap_rows=True)
+        result = DistanceTransformSearch(default, 3, wrap_cols=True).find_neighbors()
+        assert_count(result, default, 25, 3, wrap_cols=True)
+        result = DistanceTransformSearch(default, 3, wrap_rows=True, wrap_cols=True).find_neighbors()
+        assert_count(result, default, 25, 3, wrap_rows=True, wrap_cols=True)
+
+        result = DistanceTransformSearch(default, 1).find_neighbors()
+        assert_count(result, default, 10, 1)
+
+    def test_edges(self, overlapping_edges):
+        result = DistanceTransformSearch(overlapping_edges, 2).find_neighbors()
+        assert_count(result, overlapping_edges, 12, 2)
+
+        result = DistanceTransformSearch(overlapping_edges, 2, wrap_rows=True).find_neighbors()
+        assert_count(result, overlapping_edges, 19, 2, wrap_rows=True)
+        result = DistanceTransformSearch(overlapping_edges, 2, wrap_cols=True).find_neighbors()
+        assert_count(result, overlapping_edges, 12, 2, wrap_cols=True)
+        result = DistanceTransformSearch(overlapping_edges, 2, wrap_rows=True, wrap_cols=True).find_neighbors()
+        assert_count(result, overlapping_edges, 19, 2, wrap_rows=True, wrap_cols=True)
+
+    def test_corners(self, corners):
+        result = DistanceTransformSearch(corners, 1).find_neighbors()
+        assert_count(result, corners, 12, 1)
+
+        result = DistanceTransformSearch(corners, 2, wrap_rows=True).find_neighbors()
+        assert_count(result, corners, 23, 2, wrap_rows=True)
+        result = DistanceTransformSearch(corners, 2, wrap_cols=True).find_neighbors()
+        assert_count(result, corners, 22, 2, wrap_cols=True)
+        result = DistanceTransformSearch(corners, 2, wrap_rows=True, wrap_cols=True).find_neighbors()
+        assert_count(result, corners, 23, 2, wrap_rows=True, wrap_cols=True)
+
+    def test_odd_shapes(self, odd_shapes):
+        dist = [2, 2, 4]
+        expected = [4, 3, 1]
+        for i in range(len(odd_shapes)):
+            grid, n, exp = odd_shapes[i], dist[i], expected[i]
+            result = DistanceTransformSearch(grid, n).find_neighbors()
+            assert len(result) == exp, f"Failed on {grid=}, {n=}, {exp=}, {result=}"
+
+    def test_no_positive_cells(self):
+        assert len(DistanceTransformSearch([[0, 0], [0, -3]], 5).find_neighbors()) == 0
+
+    @pytest.mark.parametrize("distance_type", list(Grid.DISTANCE_TYPES))
+    @pytest.mark.parametrize("wrap_rows, wrap_cols", [(False, False), (True, False), (False, True), (True, True)])
+    def test_matches_bfs(self, distance_type, wrap_rows, wrap_cols):
+        rng = random.Random(619)
+        for _ in range(20):
+            num_rows, num_cols = rng.randint(1, 12), rng.randint(1, 12)
+            data = [[1 if rng.random() < 0.08 else 0 for _ in range(num_cols)] for _ in range(num_rows)]
+            max_distance = rng.randint(0, 8)
+            expected = BreadthFirstSearch(
+                Grid(data, distance_type=distance_type), max_distance, wrap_rows, wrap_cols
+            ).find_neighbors()
+            result = DistanceTransformSearch(
+                Grid(data, distance_type=distance_type), max_distance, wrap_rows, wrap_cols
+            ).find_neighbors()
+            assert {c.coords: c.value for c in result} == {c.coords: c.value for c in expected}, data
+
+    def test_array_grid(self, corners):
+        np = pytest.importorskip("numpy")
+        array_grid = Grid.from_array(np.asarray([[c.value for c in corners][i:i + 5] for i in range(0, 25, 5)]))
+        expected = DistanceTransformSearch(corners, 2, wrap_rows=True).find_neighbors()
+        result = DistanceTransformSearch(array_grid, 2, wrap_rows=True).find_neighbors()
+        assert {c.coords: c.value for c in result} == {c.coords: c.value for c in expected}
+        result = BreadthFirstSearch(array_grid, 2, wrap_rows=True).find_neighbors()
+        assert {c.coords: c.value for c in result} == {c.coords: c.value for c in expected}
+
+    def test_iter_neighbors(self, default):
+        pytest.importorskip("numpy")
+        search = DistanceTransformSearch(default, 2, wrap_cols=True)
+        cells = list(search.iter_neighbors())
+        assert [c.coords for c in cells] == sorted(c.coords for c in cells)
+        assert {c.coords: c.value for c in cells} == {c.coords: c.value for c in search.find_neighbors()}
+        assert search.count_neighbors() == len(cells)
+        assert DistanceTransformSearch([[0, 0]], 2).count_neighbors() == 0
@@ -1,7 +1,10 @@
+import array
+
 import pytest
 from _pytest.fixtures import fixture
 
 from grid_neighbors import Grid
+from grid_neighbors.neighbor_searches import BreadthFirstSearch
 
 
 class TestGrid:
@@ -15,6 +18,19 @@ class TestGrid:
 
     def test_positive_cells(self, grid):
         assert len(grid.positive_cells) == 3
+        assert grid.num_positive == 3
+        assert grid.has_positive
+
+    def test_changed_values(self):
+        # values aren't copied, so the counts follow changes to them
+        data = [[0, 0, 0], [0, 1, 0], [0, 0, 0]]
+        grid = Grid(data)
+        assert grid.num_positive == 1
+        data[1][1] = 0
+        assert grid.num_positive == 0
+        assert not grid.has_positive
+        search = BreadthFirstSearch(grid, grid.diameter)
+        assert search.count_neighbors() == len(search.find_neighbors()) == 0
 
     def test_pretty_print(self, grid):
         print(f"STR: {str(grid)}")
@@ -55,3 +71,46 @@ class TestGrid:
                 [-1, -6, -4]
             ])
 
+    def test_from_array(self, grid):
+        np = pytest.importorskip("numpy")
+        values = np.array([[0, -1, 50], [-99, 2, 3], [-1, -6, -4]], dtype=np.int16)
+        array_grid = Grid.from_array(values)
+        assert np.shares_memory(array_grid.to_numpy(), values)
+        assert array_grid.shape == (3, 3)
+        assert array_grid[2, 1].value == -6
+        assert type(array_grid[2, 1].value) is int
+        assert [c.value for c in array_grid] == [c.value for c in grid]
+        assert {c.coords: c.value for c in array_grid.positive_cells} == {c.coords: c.value for c in grid.positive_cells}
+        assert array_grid.num_positive == grid.num_positive
+        # values aren't copied, so changes are visible through the grid
+        values[2, 1] = 7
+        assert array_grid[2, 1].value == 7
+
+        # anything supporting the buffer protocol is viewed directly
+        flat = array.array("d", [0, 1, 0, 0, 0, 2])
+        buffer_grid = Grid.from_array(flat, shape=(2, 3), wrap_rows=True)
+        assert buffer_grid.shape == (2, 3)
+        assert buffer_grid[3, 2].value == 2.0
+        flat[0] = 5
+        assert buffer_grid[0, 0].value == 5.0
+        view_grid = Grid(memoryview(flat).cast("B").cast("d", (3, 2)))
+        assert view_grid.shape == (3, 2)
+        assert len(view_grid.positive_cells) == 3
+
+    def test_from_array_off_nominal(self):
+        np = pytest.importorskip("numpy")
+        with pytest.raises(RuntimeError, match=r"Invalid cell type found"):
+            Grid.from_array(np.array([["s", "t"], ["u", "v"]]))
+        with pytest.raises(RuntimeError, match=r"Array must be 2-D"):
+            Grid.from_array(array.array("i", [0, 1, 2]))
+        with pytest.raises(RuntimeError, match=r"Grid not specified or empty"):
+            Grid.from_array(np.zeros((0, 3)))
+        with pytest.raises(RuntimeError, match=r"Empty row\(s\)"):
+            Grid.from_array(np.zeros((3, 0)))
+
+    def test_diameter(self, grid):
+        assert grid.diameter == 4
+        assert Grid([[0] * 5] * 4, wrap_rows=True).diameter == 6
+        assert Grid([[0] * 5] * 4, wrap_rows=True, wrap_cols=True).diameter == 4
+        assert Grid([[0] * 5] * 4, distance_type="chebyshev").diameter == 4
+        assert Grid([[0]]).diameter == 0
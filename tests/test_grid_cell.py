@@ -44,3 +44,9 @@ class TestGridCell:
         assert cell.col == cell_copy.col
         assert cell.value == cell_copy.value
         # TODO: add test for deep copy when value is object
+
+    def test_slots(self):
+        cell = GridCell(1, 2, 3)
+        assert not hasattr(cell, "__dict__")
+        with pytest.raises(AttributeError):
+            cell.other = 1
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import grid_neighbors
+
+
+class TestImports:
+    def test_lazy_engines(self):
+        # a fresh interpreter, since other tests have already imported the engines
+        code = (
+            "import sys, grid_neighbors; "
+            "assert 'grid_neighbors.neighbor_searches' not in sys.modules; "
+            "assert 'logging' not in sys.modules; "
+            "grid_neighbors.BreadthFirstSearch; "
+            "assert 'grid_neighbors.neighbor_searches' in sys.modules"
+        )
+        env = {**os.environ, "PYTHONPATH": os.path.dirname(grid_neighbors.__path__[0])}
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+    def test_exports(self):
+        from grid_neighbors import BreadthFirstSearch, Grid
+        from grid_neighbors.neighbor_searches import BreadthFirstSearch as engine
+
+        assert BreadthFirstSearch is engine
+        assert isinstance(Grid([[1]]), grid_neighbors.Grid)
+        assert set(grid_neighbors.__all__) <= set(dir(grid_neighbors))
+        assert all(getattr(grid_neighbors, name) for name in grid_neighbors.__all__)
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from grid_neighbors import Grid
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, IncrementalSearch
+
+from utils import assert_count
+
+
+class TestIncremental:
+    def test_default(self, default):
+        search = IncrementalSearch(default, 3)
+        assert_count(search.find_neighbors(), default, 24, 3)
+        assert search.distance(0, 0) == 2
+        search.clear_positive(1, 1)
+        assert search.distance(1, 1) == 3
+        assert search.distance(0, 0) == IncrementalSearch.UNREACHABLE
+        assert len(search.find_neighbors()) == 19
+        search.set_positive(1, 1)
+        assert_count(search.find_neighbors(), default, 24, 3)
+        # updates are idempotent and don't change the grid
+        search.set_positive(1, 1)
+        search.clear_positive(0, 0)
+        assert_count(search.find_neighbors(), default, 24, 3)
+        assert default[1, 1].value == 1
+
+    def test_wrapping(self, corners):
+        search = IncrementalSearch(corners, 1, wrap_rows=True, wrap_cols=True)
+        search.clear_positive(0, 0)
+        search.set_positive(-1, -1)
+        data = [[c.value for c in corners][i:i + 5] for i in range(0, 25, 5)]
+        data[0][0], data[4][4] = 0, 1
+        expected = BreadthFirstSearch(Grid(data), 1, wrap_rows=True, wrap_cols=True).find_neighbors()
+        assert {c.coords: c.value for c in search.find_neighbors()} == {c.coords: c.value for c in expected}
+
+    @pytest.mark.parametrize("distance_type", list(Grid.DISTANCE_TYPES))
+    def test_matches_bfs(self, distance_type):
+        rng = random.Random(7)
+        for _ in range(10):
+            num_rows, num_cols = rng.randint(1, 12), rng.randint(1, 12)
+            data = [[1 if rng.random() < 0.1 else 0 for _ in range(num_cols)] for _ in range(num_rows)]
+            max_distance = rng.randint(0, 6)
+            wrap_rows, wrap_cols = rng.random() < 0.5, rng.random() < 0.5
+            search = IncrementalSearch(Grid(data, distance_type=distance_type), max_distance, wrap_rows, wrap_cols)
+            for _ in range(15):
+                row, col = rng.randrange(num_rows), rng.randrange(num_cols)
+                if data[row][col] > 0:
+                    data[row][col] = 0
+                    search.clear_positive(row, col)
+                else:
+                    data[row][col] = 1
+                    search.set_positive(row, col)
+                expected = BreadthFirstSearch(
+                    Grid(data, distance_type=distance_type), max_distance, wrap_rows, wrap_cols
+                ).find_neighbors()
+                result = search.find_neighbors()
+                assert {c.coords: c.value for c in result} == {c.coords: c.value for c in expected}, data
+
+    def test_iter_neighbors(self, default):
+        search = IncrementalSearch(default, 1)
+        assert search.count_neighbors() == 10
+        cells = list(search.iter_neighbors())
+        assert [c.coords for c in cells] == sorted(c.coords for c in cells)
+        search.set_positive(4, 4)
+        assert search.count_neighbors() == 13
+
+    def test_saturated(self):
+        # the grid is only covered once there's a positive cell
+        search = IncrementalSearch([[0, 0], [0, 0]], 2)
+        assert not search.covers_grid()
+        assert search.count_neighbors() == 0
+        search.set_positive(0, 0)
+        assert search.covers_grid()
+        assert search.count_neighbors() == 4
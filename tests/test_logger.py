@@ -0,0 +1,85 @@
+import logging
+import os
+import time
+from logging.handlers import QueueHandler
+
+import pytest
+
+from grid_neighbors import Logger, neighbor_searches
+from grid_neighbors.Logger import create_logger, get_log_level, get_logger, trace_sampler
+from grid_neighbors.neighbor_searches import BruteForceSearch
+
+TRACE = 7
+
+
+class TestLogger:
+    def test_log_level(self, monkeypatch):
+        monkeypatch.delenv("LOG_LEVEL", raising=False)
+        assert get_log_level() == logging.INFO
+        monkeypatch.setenv("LOG_LEVEL", "debug")
+        assert get_log_level() == logging.DEBUG
+        monkeypatch.setenv("LOG_LEVEL", "TRACE")
+        assert get_log_level() == TRACE
+        assert create_logger("test_log_level").level == TRACE
+        monkeypatch.setenv("LOG_LEVEL", "25")
+        assert get_log_level() == 25
+        monkeypatch.setenv("LOG_LEVEL", "LOUD")
+        with pytest.raises(ValueError, match="Invalid LOG_LEVEL"):
+            get_log_level()
+
+    def test_queue_handler(self):
+        log = create_logger("test_queue_handler")
+        assert [type(handler).__bases__ for handler in log.handlers] == [(QueueHandler,)]
+        # creating it again doesn't add another handler
+        assert len(create_logger("test_queue_handler").handlers) == 1
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    @pytest.mark.filterwarnings("ignore::DeprecationWarning")
+    def test_fork(self):
+        log = create_logger("test_fork")
+        log.info("from the parent")
+        # e.g. another thread was starting the listener when the process forked
+        with Logger._lock:
+            pid = os.fork()
+            if pid == 0:
+                log.info("from the child")
+                os._exit(0 if Logger._listener_pid == os.getpid() else 1)
+        deadline = time.monotonic() + 10
+        while (status := os.waitpid(pid, os.WNOHANG))[0] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if status[0] == 0:
+            os.kill(pid, 9)
+            os.waitpid(pid, 0)
+            pytest.fail("Logging in the child process deadlocked")
+        assert os.waitstatus_to_exitcode(status[1]) == 0
+
+    def test_trace_sampler(self, monkeypatch):
+        log = logging.getLogger("test_trace_sampler")
+        log.setLevel(logging.DEBUG)
+        assert trace_sampler(log) is None
+        log.setLevel(TRACE)
+        with pytest.raises(ValueError, match="must be positive"):
+            trace_sampler(log, -1)
+
+    def test_search_trace(self, default, monkeypatch):
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        log = get_logger(neighbor_searches.__name__)
+        level = log.level
+        log.addHandler(handler)
+        try:
+            # disabled: nothing is formatted or queued
+            log.setLevel(logging.INFO)
+            BruteForceSearch(default, 2).find_neighbors()
+            assert records == []
+
+            # 1 in 10 of the 25 cells, plus the summary
+            monkeypatch.setenv("LOG_TRACE_SAMPLE", "10")
+            log.setLevel(TRACE)
+            BruteForceSearch(default, 2).find_neighbors()
+            assert [record.levelno for record in records] == [TRACE] * 3 + [logging.DEBUG]
+            assert records[1].getMessage() == "Cell (2, 0) is 2 from the closest source"
+        finally:
+            log.removeHandler(handler)
+            log.setLevel(level)
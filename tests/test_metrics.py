@@ -0,0 +1,63 @@
+from grid_neighbors.metrics import Metrics, Timings
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, BruteForceSearch, DijkstraSearch, SparseSearch
+
+
+class TestMetrics:
+    def test_timings(self):
+        timings = Timings()
+        with timings.time("parse"):
+            pass
+        with timings.time("search"):
+            pass
+        timings.update({"search": 1.0})
+        assert list(timings.seconds) == ["parse", "search"]
+        assert timings.seconds["search"] >= 1.0
+        assert timings.server_timing().startswith("parse;dur=")
+
+        disabled = Timings(enabled=False)
+        with disabled.time("parse"):
+            pass
+        disabled.update({"search": 1.0})
+        assert disabled.seconds == {}
+
+    def test_render(self):
+        metrics = Metrics()
+        metrics.describe("requests", "counter", "Requests")
+        metrics.inc("requests", endpoint="calculate", status=200)
+        metrics.inc("requests", endpoint="calculate", status=200)
+        metrics.observe("result_size", 3, algorithm="bfs")
+        metrics.observe("result_size", 4.5, algorithm="bfs")
+        metrics.observe("queue_peak", None, algorithm="bfs")
+        assert metrics.render().splitlines() == [
+            "# HELP grid_neighbors_requests Requests",
+            "# TYPE grid_neighbors_requests counter",
+            'grid_neighbors_requests{endpoint="calculate",status="200"} 2',
+            "# TYPE grid_neighbors_result_size untyped",
+            'grid_neighbors_result_size_count{algorithm="bfs"} 2',
+            'grid_neighbors_result_size_sum{algorithm="bfs"} 7.5',
+        ]
+        metrics.clear()
+        assert metrics.render() == "\n"
+
+    def test_disabled(self):
+        metrics = Metrics(enabled=False)
+        metrics.inc("requests")
+        metrics.observe("result_size", 3)
+        assert metrics.render() == "\n"
+
+    def test_engine_stats(self, default):
+        bfs = BreadthFirstSearch(default, 1)
+        assert bfs.stats == {}
+        neighbors = bfs.find_neighbors()
+        assert bfs.stats["cells_visited"] == len(neighbors) == 10
+        # both sources, then their 8 neighbors (minus the one popped to find them)
+        assert 2 <= bfs.stats["queue_peak"] <= 8
+        dijkstra = DijkstraSearch(default, 1)
+        dijkstra.find_neighbors()
+        assert dijkstra.stats["cells_visited"] == 10
+        brute_force = BruteForceSearch(default, 1)
+        brute_force.find_neighbors()
+        assert brute_force.stats == {"cells_visited": 25}
+        sparse = SparseSearch(default, 1)
+        sparse.find_neighbors()
+        assert sparse.stats == {"cells_visited": 2 * 5}
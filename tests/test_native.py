@@ -0,0 +1,89 @@
+import random
+from array import array
+
+import pytest
+
+from grid_neighbors import Grid
+from grid_neighbors.native_kernel import bfs_kernel, compiled_bfs_kernel
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, NativeSearch
+
+from utils import assert_count
+
+
+def random_searches(seed: int, count: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        num_rows, num_cols = rng.randint(1, 12), rng.randint(1, 12)
+        data = [[1 if rng.random() < 0.08 else 0 for _ in range(num_cols)] for _ in range(num_rows)]
+        grid = Grid(data, distance_type=rng.choice(list(Grid.DISTANCE_TYPES)))
+        yield BreadthFirstSearch(grid, rng.randint(0, 10), rng.random() < 0.5, rng.random() < 0.5)
+
+
+def run_kernel(kernel, search: BreadthFirstSearch, buffers=array):
+    """Distances by flat index from the kernel, with the buffer type it expects"""
+    grid = search.grid
+    distances = buffers("i", [-1]) * grid.num_cells
+    queue = buffers("q", [0]) * grid.num_cells
+    dir_rows, dir_cols = (buffers("q", steps) for steps in zip(*grid.directions))
+    num_reached = kernel(
+        buffers("q", grid.positive_indices), grid.num_rows, grid.num_cols, grid.wrap_rows, grid.wrap_cols,
+        dir_rows, dir_cols, search.max_distance, distances, queue,
+    )
+    assert len(set(queue[:num_reached])) == num_reached
+    return list(distances)
+
+
+def expected_distances(search: BreadthFirstSearch) -> list[int]:
+    distances = [-1] * search.grid.num_cells
+    for row, col, dist in search.find_neighbors().items():
+        distances[row * search.grid.num_cols + col] = dist
+    return distances
+
+
+class TestNative:
+    def test_default(self, default):
+        result = NativeSearch(default, 3).find_neighbors()
+        assert_count(result, default, 24, 3)
+        result = NativeSearch(default, 3, wrap_rows=True, wrap_cols=True).find_neighbors()
+        assert_count(result, default, 25, 2, wrap_rows=True, wrap_cols=True)
+        assert NativeSearch(default, 1).count_neighbors() == 10
+
+    def test_interpreted_kernel(self):
+        # the same function Numba compiles, run by the interpreter
+        for search in random_searches(23, 300):
+            assert run_kernel(bfs_kernel, search) == expected_distances(search), search.grid
+
+    def test_matches_bfs(self):
+        for search in random_searches(24, 100):
+            grid = search.grid
+            native = NativeSearch(grid, search.max_distance, grid.wrap_rows, grid.wrap_cols)
+            assert sorted(native.find_neighbors().items()) == sorted(search.find_neighbors().items()), grid
+            assert native.stats["cells_visited"] == len(search.find_neighbors())
+            assert native.count_neighbors() == search.count_neighbors()
+            assert sorted(c.coords for c in native.iter_neighbors()) == sorted(c.coords for c in search.iter_neighbors())
+
+    def test_compiled_kernel(self):
+        pytest.importorskip("numba")
+        np = pytest.importorskip("numpy")
+        assert NativeSearch([[1]], 1).compiled
+
+        def buffers(typecode, values):
+            return np.array(values, dtype={"i": np.int32, "q": np.int64}[typecode])
+
+        kernel = compiled_bfs_kernel()
+        for search in random_searches(25, 100):
+            assert run_kernel(kernel, search, buffers) == expected_distances(search), search.grid
+
+    def test_fallback(self, monkeypatch):
+        monkeypatch.setattr("grid_neighbors.neighbor_searches.compiled_bfs_kernel", lambda: None)
+        search = NativeSearch([[0, 1, 0, 0]], 1)
+        assert not search.compiled
+        assert len(search.find_neighbors()) == 3
+        assert search.stats["cells_visited"] == 3
+        assert [c.coords for c in search.iter_neighbors()] == [(0, 1), (0, 0), (0, 2)]
+        with pytest.raises(ImportError, match="Numba is required"):
+            search.distance_field()
+
+    def test_off_nominal(self):
+        with pytest.raises(ValueError, match=r"doesn't support grids with traversal costs"):
+            NativeSearch(Grid([[1, 0]], costs=[[1, 1]]), 1)
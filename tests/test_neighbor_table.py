@@ -0,0 +1,47 @@
+import itertools
+
+from grid_neighbors import Grid
+from grid_neighbors.neighbor_table import NeighborTable, get_neighbor_table
+
+
+class TestNeighborTable:
+    def test_interior(self):
+        table = NeighborTable(4, 5, False, False, Grid.MANHATTAN_DIRECTIONS)
+        # border cells are every cell except (1, 1), (1, 2), (1, 3), (2, 1), (2, 2), (2, 3)
+        assert len(table.border) == 20 - 6
+        assert 6 not in table.border
+        # N, S, W, E
+        assert table.neighbors(6) == (1, 11, 5, 7)
+        assert table.neighbors(0) == (5, 1)
+        assert table.neighbors(19) == (14, 18)
+
+    def test_wrap(self):
+        table = NeighborTable(3, 3, True, False, Grid.CHEBYSHEV_DIRECTIONS)
+        assert len(table.neighbors(4)) == 8
+        assert sorted(table.neighbors(0)) == [1, 3, 4, 6, 7]
+        table = NeighborTable(1, 3, True, True, Grid.MANHATTAN_DIRECTIONS)
+        # single row wraps onto itself
+        assert table.neighbors(0) == (0, 0, 2, 1)
+
+    def test_matches_indices(self, default, odd_shapes):
+        for source, distance_type in itertools.product([default, *odd_shapes], Grid.DISTANCE_TYPES):
+            for wrap_rows in (False, True):
+                for wrap_cols in (False, True):
+                    grid = Grid(source._data, wrap_rows, wrap_cols, distance_type)
+                    table = grid.neighbor_table
+                    num_cols = grid.num_cols
+                    for cell in grid:
+                        expected = []
+                        for dr, dc in grid.directions:
+                            try:
+                                row, col = grid._validate_indices(cell.row + dr, cell.col + dc)
+                            except IndexError:
+                                continue
+                            expected.append(row * num_cols + col)
+                        assert list(table.neighbors(cell.row * num_cols + cell.col)) == expected
+
+    def test_cached(self, default):
+        assert default.neighbor_table is default.neighbor_table
+        default.wrap_rows = True
+        assert default.neighbor_table is get_neighbor_table(5, 5, True, False, Grid.MANHATTAN_DIRECTIONS)
+        assert len(default.get_immediate_neighbors(default[0, 0])) == 3
@@ -0,0 +1,47 @@
+import pytest
+
+from grid_neighbors import GridCell, Neighborhood
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, SearchBase
+
+
+class TestNeighborhood:
+    def test_add(self):
+        neighborhood = Neighborhood()
+        neighborhood.add(1, 2, 0)
+        neighborhood.add(3, 4, 2)
+        assert len(neighborhood) == 2
+        assert neighborhood.positive_count == 1
+        assert neighborhood[1] == GridCell(3, 4, 2)
+        assert neighborhood[-1].value == 2
+        assert list(neighborhood.items()) == [(1, 2, 0), (3, 4, 2)]
+        assert [c.value for c in neighborhood] == [0, 2]
+        # a few bytes per cell instead of an object per cell
+        assert neighborhood.nbytes == 2 * 3 * 4
+
+    def test_slice(self):
+        neighborhood = Neighborhood.from_cells([GridCell(0, i, i) for i in range(5)])
+        tail = neighborhood[3:]
+        assert isinstance(tail, Neighborhood)
+        assert list(tail.items()) == [(0, 3, 3), (0, 4, 4)]
+
+    def test_from_distance_field(self):
+        np = pytest.importorskip("numpy")
+        neighborhood = Neighborhood.from_distance_field(np.array([[0, -1], [1, 2]]))
+        assert list(neighborhood.items()) == [(0, 0, 0), (1, 0, 1), (1, 1, 2)]
+
+    def test_create_result(self, default):
+        neighborhood = BreadthFirstSearch(default, 2).find_neighbors()
+        assert isinstance(neighborhood, Neighborhood)
+        assert SearchBase.create_result(neighborhood) == SearchBase.create_result(list(neighborhood))
+        result = SearchBase.create_result(neighborhood)
+        assert result["count"] == len(neighborhood)
+        assert len(result["positive_cells"]) == 2
+
+    def test_row_chunks(self, default):
+        neighborhood = BreadthFirstSearch(default, 2).find_neighbors()
+        chunks = list(neighborhood.row_chunks(2))
+        cells = [cell for chunk in chunks for cell in chunk.items()]
+        assert cells == sorted(neighborhood.items())
+        for chunk in chunks:
+            assert len({row // 2 for row in chunk.rows}) == 1
+        assert list(Neighborhood().row_chunks(2)) == []
@@ -0,0 +1,46 @@
+import pytest
+
+from grid_neighbors import Grid
+from grid_neighbors import planner
+
+
+class TestPlanner:
+    def test_footprint_size(self):
+        grid = Grid([[0] * 20] * 20)
+        assert planner.footprint_size(grid, 0) == 1
+        assert planner.footprint_size(grid, 2) == 13
+        grid.distance_type = "chebyshev"
+        assert planner.footprint_size(grid, 2) == 25
+        # limited by the grid
+        assert planner.footprint_size(Grid([[0] * 2] * 20), 2) == 11
+        assert planner.footprint_size(Grid([[0] * 20] * 20), 100) == 400
+
+    def test_grid_stats(self, default):
+        stats = planner.grid_stats(default, 1)
+        assert stats["num_cells"] == 25
+        assert stats["num_positive"] == 2
+        assert stats["expected_neighbors"] == 10
+
+    def test_choose_algorithm(self, monkeypatch):
+        # weighted grids always need dijkstra
+        assert planner.choose_algorithm(Grid([[1, 0]], costs=[[1, 2]]), 1) == "dijkstra"
+        # a couple of sources in a big grid
+        data = [[0] * 300 for _ in range(300)]
+        data[10][10] = data[200][150] = 1
+        assert planner.choose_algorithm(Grid(data), 3) in {"sparse", "distance_transform", "native"}
+        monkeypatch.setattr(planner, "has_numpy", lambda: False)
+        assert "distance_transform" not in planner.estimate_costs(Grid(data), 3)
+        assert planner.choose_algorithm(Grid(data), 3) == "sparse"
+
+    def test_choose_dense(self, monkeypatch):
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(planner, "has_numba", lambda: False)
+        data = [[(row * 7 + col) % 10 == 0 for col in range(300)] for row in range(300)]
+        assert planner.choose_algorithm(Grid(data), 20) == "distance_transform"
+
+    def test_native(self, monkeypatch):
+        grid = Grid([[0] * 20] * 20)
+        monkeypatch.setattr(planner, "has_numba", lambda: False)
+        assert "native" not in planner.estimate_costs(grid, 3)
+        monkeypatch.setattr(planner, "has_numba", lambda: True)
+        assert planner.estimate_costs(grid, 3)["native"] > 0
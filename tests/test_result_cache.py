@@ -0,0 +1,75 @@
+import os
+
+from grid_neighbors import Grid
+from grid_neighbors.result_cache import FileStore, ResultCache, make_key
+
+
+class TestResultCache:
+    def test_make_key(self):
+        grid = Grid([[0, 1], [1, 0]])
+        assert make_key(grid, 3, "bfs") == make_key(Grid([[0, 1], [1, 0]]), 3, "bfs")
+        assert make_key(grid, 3, "bfs") != make_key(grid, 4, "bfs")
+        assert make_key(grid, 3) != make_key(Grid([[0, 1], [1, 0]], wrap_rows=True), 3)
+        assert make_key(grid) != make_key(Grid([[0, 1], [1, 0]], costs=[[1, 2], [1, 1]]))
+        assert make_key(b"ab", b"c") != make_key(b"a", b"bc")
+        assert make_key({"a": 1, "b": 2}) == make_key({"b": 2, "a": 1})
+
+    def test_lru(self):
+        cache = ResultCache(max_entries=2)
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        assert cache.get("a") == b"1"
+        # "b" is the least recently used
+        cache.set("c", b"3")
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+        assert cache.stats() == {"entries": 2, "bytes": 4, "hits": 3, "misses": 1, "evictions": 1}
+
+    def test_max_bytes(self):
+        cache = ResultCache(max_bytes=10)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        assert cache.num_bytes == 10
+        cache.set("c", b"1")
+        assert len(cache) == 2
+        assert cache.get("a") is None
+        # too big to ever fit
+        cache.set("d", b"12345678901")
+        assert cache.get("d") is None
+        cache.set("b", b"1")
+        assert cache.num_bytes == 4
+
+    def test_file_store(self, tmp_path):
+        cache = ResultCache(max_entries=1, store=FileStore(str(tmp_path)))
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        # evicted from memory, but still in the store
+        assert cache.get("a") == b"1"
+        assert cache.stats()["hits"] == 1
+        # a new cache (e.g. after a restart) can use the same store
+        assert ResultCache(store=FileStore(str(tmp_path))).get("b") == b"2"
+        assert ResultCache(store=FileStore(str(tmp_path))).get("c") is None
+
+    def test_file_store_types(self, tmp_path):
+        store = FileStore(str(tmp_path))
+        store.set("a", b"{}", "application/json")
+        store.set("b", b"\0", "application/x-grid-neighbors")
+        assert sorted(os.listdir(tmp_path)) == ["a.json", "b.bin"]
+        assert store.get("a", "application/json") == b"{}"
+        assert store.get("a", "application/x-grid-neighbors") is None
+
+    def test_file_store_max_bytes(self, tmp_path):
+        store = FileStore(str(tmp_path), max_bytes=25)
+        for index, key in enumerate("ab"):
+            store.set(key, b"1234567890")
+            # distinct modification times, oldest first
+            os.utime(tmp_path / f"{key}.bin", (index, index))
+        # "a" is read, so "b" is the least recently used when "c" takes the directory over the limit
+        assert store.get("a") == b"1234567890"
+        store.set("c", b"1234567890")
+        assert sorted(os.listdir(tmp_path)) == ["a.bin", "c.bin"]
+        assert store.get("b") is None
+        # the size of what's already there counts toward the limit
+        assert FileStore(str(tmp_path), max_bytes=25)._num_bytes == 20
+
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from grid_neighbors import Grid
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, SparseSearch
+
+from utils import assert_count
+
+
+class TestSparse:
+    def test_default(self, default):
+        result = SparseSearch(default, 3).find_neighbors()
+        assert_count(result, default, 24, 3)
+
+        result = SparseSearch(default, 3, wrap_rows=True).find_neighbors()
+        assert_count(result, default, 24, 3, wrap_rows=True)
+        result = SparseSearch(default, 3, wrap_cols=True).find_neighbors()
+        assert_count(result, default, 25, 3, wrap_cols=True)
+        result = SparseSearch(default, 3, wrap_rows=True, wrap_cols=True).find_neighbors()
+        assert_count(result, default, 25, 3, wrap_rows=True, wrap_cols=True)
+
+        result = SparseSearch(default, 1).find_neighbors()
+        assert_count(result, default, 10, 1)
+
+    def test_edges(self, overlapping_edges):
+        result = SparseSearch(overlapping_edges, 2).find_neighbors()
+        assert_count(result, overlapping_edges, 12, 2)
+        result = SparseSearch(overlapping_edges, 2, wrap_rows=True).find_neighbors()
+        assert_count(result, overlapping_edges, 19, 2, wrap_rows=True)
+
+    def test_odd_shapes(self, odd_shapes):
+        dist = [2, 2, 4]
+        expected = [4, 3, 1]
+        for i in range(len(odd_shapes)):
+            grid, n, exp = odd_shapes[i], dist[i], expected[i]
+            result = SparseSearch(grid, n).find_neighbors()
+            assert len(result) == exp, f"Failed on {grid=}, {n=}, {exp=}, {result=}"
+
+    def test_stencil(self):
+        stencil = SparseSearch(Grid([[0] * 10] * 10), 2).stencil()
+        assert len(stencil) == 13
+        assert stencil[0] == (0, 0, 0)
+        stencil = SparseSearch(Grid([[0] * 10] * 10, distance_type="chebyshev"), 2).stencil()
+        assert len(stencil) == 25
+        # wrapped dimensions never revisit an index
+        stencil = SparseSearch(Grid([[0] * 4] * 3), 10, wrap_rows=True, wrap_cols=True).stencil()
+        assert sorted((dr % 3, dc % 4) for dr, dc, _ in stencil) == [(r, c) for r in range(3) for c in range(4)]
+
+    @pytest.mark.parametrize("distance_type", list(Grid.DISTANCE_TYPES))
+    @pytest.mark.parametrize("wrap_rows, wrap_cols", [(False, False), (True, False), (False, True), (True, True)])
+    def test_matches_bfs(self, distance_type, wrap_rows, wrap_cols):
+        rng = random.Random(5)
+        for _ in range(20):
+            num_rows, num_cols = rng.randint(1, 12), rng.randint(1, 12)
+            data = [[1 if rng.random() < 0.05 else 0 for _ in range(num_cols)] for _ in range(num_rows)]
+            max_distance = rng.randint(0, 14)
+            grid = Grid(data, distance_type=distance_type)
+            expected = BreadthFirstSearch(grid, max_distance, wrap_rows, wrap_cols).find_neighbors()
+            result = SparseSearch(grid, max_distance, wrap_rows, wrap_cols).find_neighbors()
+            assert {c.coords: c.value for c in result} == {c.coords: c.value for c in expected}, data
+
+    def test_count_neighbors(self, default):
+        assert SparseSearch(default, 3).count_neighbors() == 24
+        assert len(list(SparseSearch(default, 1).iter_neighbors())) == 10
+        assert SparseSearch([[0, 0]], 3).count_neighbors() == 0
@@ -0,0 +1,72 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from grid_neighbors import Grid
+from grid_neighbors.neighbor_searches import BreadthFirstSearch, DistanceTransformSearch, SparseSearch
+from grid_neighbors.binary_format import encode
+from grid_neighbors.tiled_search import TiledSearch, search_to_file
+
+from utils import assert_count
+
+pytest.importorskip("numpy")
+
+
+class TestTiledSearch:
+    def test_default(self, default):
+        result = TiledSearch(default, 3, band_rows=2, max_workers=2).find_neighbors()
+        assert_count(result, default, 24, 3)
+        result = TiledSearch(default, 3, wrap_rows=True, band_rows=1, max_workers=2).find_neighbors()
+        assert_count(result, default, 24, 3, wrap_rows=True)
+        result = TiledSearch(default, 3, wrap_cols=True, max_workers=2).find_neighbors()
+        assert_count(result, default, 25, 3, wrap_cols=True)
+
+    def test_bands(self):
+        search = TiledSearch(Grid([[0]] * 10), 3, max_workers=4)
+        assert search.bands() == [(0, 3), (3, 6), (6, 9), (9, 10)]
+        assert search.halo_rows == 3
+        search = TiledSearch(Grid([[0]] * 10), 30, wrap_rows=True, band_rows=5)
+        assert search.bands() == [(0, 5), (5, 10)]
+        assert search.halo_rows == 5
+
+    @pytest.mark.parametrize("engine", [BreadthFirstSearch, DistanceTransformSearch, SparseSearch])
+    @pytest.mark.parametrize("distance_type", list(Grid.DISTANCE_TYPES))
+    def test_matches_whole_grid(self, engine, distance_type):
+        rng = random.Random(6)
+        with ThreadPoolExecutor(4) as executor:
+            for _ in range(15):
+                num_rows, num_cols = rng.randint(1, 16), rng.randint(1, 8)
+                data = [[1 if rng.random() < 0.06 else 0 for _ in range(num_cols)] for _ in range(num_rows)]
+                max_distance = rng.randint(0, 10)
+                wrap_rows, wrap_cols = rng.random() < 0.5, rng.random() < 0.5
+                grid = Grid(data, distance_type=distance_type)
+                expected = BreadthFirstSearch(grid, max_distance, wrap_rows, wrap_cols).find_neighbors()
+                result = TiledSearch(
+                    grid, max_distance, wrap_rows, wrap_cols, engine=engine, band_rows=rng.randint(1, 4),
+                    executor=executor
+                ).find_neighbors()
+                assert len(result) == len(expected)
+                assert {c.coords: c.value for c in result} == {c.coords: c.value for c in expected}, data
+
+    def test_off_nominal(self, default):
+        with pytest.raises(ValueError, match=r"doesn't support grids with traversal costs"):
+            TiledSearch(Grid([[1, 0]], costs=[[1, 1]]), 1)
+        with pytest.raises(ValueError, match="Band rows must be positive"):
+            search_to_file(default, 1, "unused.gnb", band_rows=0)
+
+    @pytest.mark.parametrize("engine", [BreadthFirstSearch, DistanceTransformSearch])
+    def test_search_to_file(self, tmp_path, engine):
+        rng = random.Random(11)
+        for i in range(15):
+            num_rows, num_cols = rng.randint(1, 16), rng.randint(1, 8)
+            data = [[1 if rng.random() < 0.06 else 0 for _ in range(num_cols)] for _ in range(num_rows)]
+            max_distance = rng.randint(0, 10)
+            wrap_rows, wrap_cols = rng.random() < 0.5, rng.random() < 0.5
+            path = tmp_path / f"grid{i}.gnb"
+            path.write_bytes(encode(data, wrap_rows, wrap_cols, rng.choice(list(Grid.DISTANCE_TYPES))))
+            grid = Grid.from_file(str(path))
+            raster = search_to_file(grid, max_distance, str(tmp_path / f"raster{i}.gnb"), rng.randint(1, 4), engine)
+            expected = BreadthFirstSearch(grid, max_distance, wrap_rows, wrap_cols).find_neighbors()
+            assert (raster == expected.to_raster(grid.shape)).all(), data
+            assert Grid.from_file(str(tmp_path / f"raster{i}.gnb")).wrap_rows == wrap_rows